@@ -1,5 +1,9 @@
-from helfetch import helfetch
+import sys
 
-if __name__ == "__main__":
-    helfetch.main()
+from helfetch.utils.client import print_from_daemon
 
+if __name__ == "__main__":
+    # المسار السريع: لو helfetchd شغّال نطبع مخرجاته مباشرة بدون تحميل باقي البرنامج
+    if not print_from_daemon(sys.argv[1:]):
+        from helfetch import helfetch
+        helfetch.main()
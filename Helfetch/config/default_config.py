@@ -1,8 +1,93 @@
 # config/default_config.py
 
+# Every setting below can be changed in ~/.config/helfetch/config.toml
+# (see config/user_config.py).
+
 DEFAULT_COLORS = {
     "info_key_color": "light_yellow",
     "info_value_color": "white",
     "logo_color": "light_cyan",
     "quote_color": "light_green" # لون جديد للاقتباس
 }
+
+# Time budget (in seconds) for each collector. Collectors run concurrently,
+# and any collector that misses its deadline shows its fields as "N/A".
+DEFAULT_TIMEOUTS = {
+    "system": 1.0,
+    "hardware": 1.0,
+    "sensors": 1.0,
+    "desktop": 1.0,
+    "network": 2.0
+}
+
+# Default time budget (in seconds) of a plugin module by its declared COST class
+# (see core/plugins.py). Add a plugin's name to DEFAULT_TIMEOUTS to override it.
+DEFAULT_PLUGIN_COSTS = {
+    "cheap": 0.5,
+    "normal": 1.0,
+    "expensive": 3.0
+}
+
+# How long (in seconds) time-based cache entries stay valid. Other cached fields
+# are invalidated by cheap checks instead (reboot, or a file's modification time).
+DEFAULT_CACHE_TTLS = {
+    "public_ip": 600
+}
+
+# Public IP / geolocation providers, tried in order until one answers.
+# 'fields' maps each output field to a (dotted) key of the provider's JSON answer,
+# 'success' is an optional (key, value) pair that a valid answer must contain and
+# 'per_minute' is the provider's rate limit, which helfetch stays under on its own.
+DEFAULT_GEO_PROVIDERS = [
+    {
+        "name": "ip-api",
+        "url": "http://ip-api.com/json/",
+        "per_minute": 45,
+        "success": ("status", "success"),
+        "fields": {"Public IP": "query", "ISP": "isp", "City": "city", "Country": "country"},
+    },
+    {
+        "name": "ipwho.is",
+        "url": "https://ipwho.is/",
+        "per_minute": 30,
+        "success": ("success", True),
+        "fields": {"Public IP": "ip", "ISP": "connection.isp", "City": "city", "Country": "country"},
+    },
+    {
+        "name": "ipinfo",
+        "url": "https://ipinfo.io/json",
+        "per_minute": 30,
+        "success": None,
+        "fields": {"Public IP": "ip", "ISP": "org", "City": "city", "Country": "country"},
+    },
+]
+
+# Package managers whose installed packages are counted, in display order.
+# Available backends: "pacman", "dpkg", "flatpak", "pip".
+DEFAULT_PACKAGE_MANAGERS = ["pacman", "dpkg", "flatpak"]
+
+# Info modules whose fields are shown by default, in display order.
+# Remove "network" to skip the local/public IP lookups entirely.
+# The live "sensors" fields (CPU usage, load, temperature, frequency) are added
+# in watch mode; put "sensors" here to always show them.
+DEFAULT_MODULES = ["system", "hardware", "desktop", "network"]
+
+# The fields to show, in display order, instead of those of DEFAULT_MODULES
+# (empty: all fields of DEFAULT_MODULES, followed by plugin fields).
+DEFAULT_FIELDS = []
+
+# Whether the logo is shown (--no-logo hides it for one run).
+DEFAULT_LOGO = True
+
+# Whether output to a terminal is drawn progressively: the logo and a placeholder
+# for every field first, then each line as soon as its probe finishes.
+DEFAULT_PROGRESSIVE = True
+
+# How often (in seconds) helfetchd refreshes the volatile fields of its snapshot.
+DEFAULT_DAEMON_INTERVAL = 2.0
+
+# The snapshot history written by 'helfetch --record' (utils/history.py): its size
+# cap in bytes, and for how many days every record is kept before being thinned
+# to one per day.
+DEFAULT_HISTORY_MAX_BYTES = 1024 * 1024
+DEFAULT_HISTORY_FULL_DAYS = 14
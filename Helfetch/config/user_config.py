@@ -0,0 +1,261 @@
+# config/user_config.py
+
+# The user's configuration file, $XDG_CONFIG_HOME/helfetch/config.toml:
+#
+#     fields = ["OS", "Kernel", "CPU", "RAM", "Uptime"]   # shown fields, in this order
+#     modules = ["system", "hardware"]                    # or: the modules shown by default
+#     logo = false
+#     progressive = false                                 # print everything at once
+#     history_max_bytes = 1048576                         # size cap of 'helfetch --record'
+#     package_managers = ["pacman", "flatpak"]
+#
+#     [colors]
+#     info_key_color = "light_blue"
+#     logo_color = "light_magenta"
+#
+#     [timeouts]        # seconds per module (or plugin)
+#     network = 1.0
+#
+#     [cache_ttls]      # seconds
+#     public_ip = 3600
+#
+# helfetch starts on every new shell, so the file isn't parsed on every run:
+# the validated settings are compiled into a marshal snapshot in the cache
+# directory, which stores the source's mtime and size. Loading the snapshot
+# costs one stat() and one small read; the TOML file is only parsed (and
+# validated) again when it changes. Settings are applied on top of
+# config/default_config.py.
+
+import marshal
+import os
+import sys
+
+from config import default_config
+
+SNAPSHOT_VERSION = 1
+
+# Top-level list settings -> the default_config list they replace.
+LIST_SETTINGS = {
+    'fields': 'DEFAULT_FIELDS',
+    'modules': 'DEFAULT_MODULES',
+    'package_managers': 'DEFAULT_PACKAGE_MANAGERS',
+}
+# Tables -> the default_config dict they update.
+TABLE_SETTINGS = {
+    'colors': 'DEFAULT_COLORS',
+    'timeouts': 'DEFAULT_TIMEOUTS',
+    'cache_ttls': 'DEFAULT_CACHE_TTLS',
+}
+# Top-level scalar settings -> (default_config name, type).
+SCALAR_SETTINGS = {
+    'logo': ('DEFAULT_LOGO', bool),
+    'progressive': ('DEFAULT_PROGRESSIVE', bool),
+    'history_max_bytes': ('DEFAULT_HISTORY_MAX_BYTES', int),
+    'history_full_days': ('DEFAULT_HISTORY_FULL_DAYS', int),
+}
+
+_defaults = None
+_applied_key = None
+
+
+def config_path():
+    """
+    Returns the configuration file path ($XDG_CONFIG_HOME/helfetch/config.toml).
+    """
+    base = os.getenv('XDG_CONFIG_HOME') or os.path.expanduser('~/.config')
+    return os.path.join(base, 'helfetch', 'config.toml')
+
+
+def snapshot_path():
+    from utils.cache import cache_dir
+    return os.path.join(cache_dir(), 'config.marshal')
+
+
+def _source_key(path):
+    """
+    Returns what a snapshot must match to be valid: the source file's identity
+    and the interpreter version (marshal's format may change between versions).
+    """
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    return (SNAPSHOT_VERSION, sys.version_info[:2], path, st.st_mtime_ns, st.st_size)
+
+
+def validate(data):
+    """
+    Checks parsed TOML data against the known settings.
+
+    Returns:
+        tuple: (settings, warnings); invalid or unknown entries are left out of
+               'settings' and described in 'warnings'.
+    """
+    from display.ascii_art import COLORS
+    from core.fields import MODULE_PATHS
+    from core.packages import BACKENDS
+
+    settings = {}
+    warnings = []
+
+    def is_number(value):
+        return isinstance(value, (int, float)) and not isinstance(value, bool) and value >= 0
+
+    for name, value in data.items():
+        if name in LIST_SETTINGS:
+            if not isinstance(value, list) or not all(isinstance(item, str) for item in value):
+                warnings.append(f"'{name}' must be a list of strings")
+                continue
+            allowed = {'modules': MODULE_PATHS, 'package_managers': BACKENDS}.get(name)
+            unknown = [item for item in value if allowed is not None and item not in allowed]
+            if unknown:
+                warnings.append(f"'{name}': unknown value(s) {', '.join(unknown)} (available: {', '.join(allowed)})")
+            settings[name] = [item for item in value if item not in unknown]
+        elif name in TABLE_SETTINGS:
+            if not isinstance(value, dict):
+                warnings.append(f"[{name}] must be a table")
+                continue
+            table = {}
+            for key, item in value.items():
+                if name == 'colors':
+                    if key not in default_config.DEFAULT_COLORS:
+                        warnings.append(f"[colors] unknown key '{key}' (available: {', '.join(default_config.DEFAULT_COLORS)})")
+                    elif item not in COLORS:
+                        warnings.append(f"[colors] {key}: unknown color '{item}'")
+                    else:
+                        table[key] = item
+                elif name == 'cache_ttls' and key not in default_config.DEFAULT_CACHE_TTLS:
+                    warnings.append(f"[cache_ttls] unknown key '{key}' (available: {', '.join(default_config.DEFAULT_CACHE_TTLS)})")
+                elif not is_number(item):
+                    warnings.append(f"[{name}] {key}: expected a number of seconds")
+                else:
+                    table[key] = item
+            settings[name] = table
+        elif name in SCALAR_SETTINGS:
+            expected = SCALAR_SETTINGS[name][1]
+            if not isinstance(value, expected) or (expected is not bool and not is_number(value)):
+                warnings.append(f"'{name}' has the wrong type")
+                continue
+            settings[name] = value
+        else:
+            warnings.append(f"unknown setting '{name}'")
+    return settings, warnings
+
+
+def compile_config(path):
+    """
+    Parses and validates the TOML file.
+
+    Returns:
+        tuple: (settings, warnings).
+    """
+    try:
+        import tomllib
+    except ImportError:
+        try:
+            import tomli as tomllib # Python < 3.11
+        except ImportError:
+            return {}, ["reading config.toml needs Python 3.11 or the 'tomli' package"]
+    try:
+        with open(path, 'rb') as f:
+            data = tomllib.load(f)
+    except OSError as e:
+        return {}, [f"can't read the file: {e}"]
+    except tomllib.TOMLDecodeError as e:
+        return {}, [f"invalid TOML: {e}"]
+    return validate(data)
+
+
+def _write_snapshot(snapshot):
+    path = snapshot_path()
+    try:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        with open(tmp_path, 'wb') as f:
+            marshal.dump(snapshot, f)
+        os.replace(tmp_path, path)
+    except OSError:
+        pass # The cache directory isn't writable: compile again next time.
+
+
+def load():
+    """
+    Returns the user's settings, from the compiled snapshot when it is still valid.
+
+    Returns:
+        tuple: (settings, warnings, key); 'key' identifies the source file version
+               (None when there is no config file).
+    """
+    path = config_path()
+    key = _source_key(path)
+    if key is None:
+        return {}, [], None
+
+    try:
+        with open(snapshot_path(), 'rb') as f:
+            snapshot = marshal.load(f)
+        if snapshot.get('key') == key:
+            return snapshot['settings'], snapshot['warnings'], key
+    except (OSError, EOFError, ValueError, TypeError, AttributeError):
+        pass
+
+    settings, warnings = compile_config(path)
+    _write_snapshot({'key': key, 'settings': settings, 'warnings': warnings})
+    return settings, warnings, key
+
+
+def apply(settings):
+    """
+    Applies settings on top of the defaults in config/default_config.py. The
+    default containers are updated in place, so modules that imported them see
+    the new values; applying again starts over from the original defaults.
+    """
+    global _defaults
+    if _defaults is None:
+        names = list(LIST_SETTINGS.values()) + list(TABLE_SETTINGS.values())
+        _defaults = {name: getattr(default_config, name).copy() for name in names}
+        _defaults.update({name: getattr(default_config, name) for name, _ in SCALAR_SETTINGS.values()})
+
+    for setting, name in LIST_SETTINGS.items():
+        getattr(default_config, name)[:] = settings.get(setting, _defaults[name])
+    for setting, name in TABLE_SETTINGS.items():
+        table = getattr(default_config, name)
+        table.clear()
+        table.update(_defaults[name])
+        table.update(settings.get(setting, {}))
+    for setting, (name, _) in SCALAR_SETTINGS.items():
+        setattr(default_config, name, settings.get(setting, _defaults[name]))
+
+
+def load_and_apply(report=True):
+    """
+    Loads the configuration and applies it, unless this version of the file was
+    already applied.
+
+    Args:
+        report (bool): Print the file's problems to stderr.
+
+    Returns:
+        bool: True if the settings changed.
+    """
+    global _applied_key
+    settings, warnings, key = load()
+    if key == _applied_key:
+        return False
+    _applied_key = key
+    if report:
+        for warning in warnings:
+            print(f"helfetch: {config_path()}: {warning}", file=sys.stderr)
+    apply(settings)
+    return True
+
+
+# For testing this module independently
+if __name__ == "__main__":
+    import time
+    start = time.perf_counter()
+    settings, warnings, key = load()
+    print(f"Loaded {config_path()} in {(time.perf_counter() - start) * 1e6:.0f} us")
+    print(f"Settings: {settings}")
+    for warning in warnings:
+        print(f"Warning: {warning}")
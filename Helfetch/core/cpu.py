@@ -0,0 +1,262 @@
+# core/cpu.py
+
+# The CPU probe: model name, topology, frequency and caches.
+#
+# /proc/cpuinfo has one block per logical CPU (hundreds of KB on big servers),
+# so it is read line by line and never past the first block. The topology
+# comes from /sys/devices/system/cpu instead, reading one sibling list per core
+# and per socket rather than a file per logical CPU.
+
+import os
+
+from utils.helpers import host_path
+
+CPU_SYSFS_DIR = host_path('/sys/devices/system/cpu')
+
+# The board name on device-tree systems (ARM boards such as the Raspberry Pi), used
+# for ARM CPUs that aren't in ARM_PARTS.
+DEVICE_TREE_MODEL_PATHS = (host_path('/sys/firmware/devicetree/base/model'), host_path('/proc/device-tree/model'))
+
+# /proc/cpuinfo keys that name the CPU: x86 (and some arm64 kernels), MIPS, PowerPC, RISC-V.
+MODEL_KEYS = ('model name', 'cpu model', 'cpu', 'uarch')
+
+# ARM (implementer, part) IDs from /proc/cpuinfo, for CPUs without a 'model name'.
+ARM_IMPLEMENTERS = {
+    '0x41': 'ARM',
+    '0x42': 'Broadcom',
+    '0x43': 'Cavium',
+    '0x46': 'Fujitsu',
+    '0x48': 'HiSilicon',
+    '0x4e': 'NVIDIA',
+    '0x51': 'Qualcomm',
+    '0x61': 'Apple',
+    '0xc0': 'Ampere',
+}
+ARM_PARTS = {
+    ('0x41', '0xd03'): 'Cortex-A53',
+    ('0x41', '0xd04'): 'Cortex-A35',
+    ('0x41', '0xd05'): 'Cortex-A55',
+    ('0x41', '0xd07'): 'Cortex-A57',
+    ('0x41', '0xd08'): 'Cortex-A72',
+    ('0x41', '0xd09'): 'Cortex-A73',
+    ('0x41', '0xd0a'): 'Cortex-A75',
+    ('0x41', '0xd0b'): 'Cortex-A76',
+    ('0x41', '0xd0c'): 'Neoverse-N1',
+    ('0x41', '0xd0d'): 'Cortex-A77',
+    ('0x41', '0xd40'): 'Neoverse-V1',
+    ('0x41', '0xd41'): 'Cortex-A78',
+    ('0x41', '0xd44'): 'Cortex-X1',
+    ('0x41', '0xd46'): 'Cortex-A510',
+    ('0x41', '0xd47'): 'Cortex-A710',
+    ('0x41', '0xd48'): 'Cortex-X2',
+    ('0x41', '0xd49'): 'Neoverse-N2',
+    ('0x41', '0xd4f'): 'Neoverse-V2',
+    ('0xc0', '0xac3'): 'Ampere-1',
+}
+
+
+def _strip_frequency(model):
+    """
+    Splits "Intel(R) Core(TM) i7-8700K CPU @ 3.70GHz" into the name and the frequency in MHz.
+    """
+    name, sep, frequency = model.rpartition(' @ ')
+    if sep and frequency.endswith('GHz'):
+        try:
+            return name.strip(), float(frequency[:-3]) * 1000
+        except ValueError:
+            pass
+    return model, None
+
+
+def _device_tree_model():
+    for path in DEVICE_TREE_MODEL_PATHS:
+        try:
+            with open(path, 'rb') as f:
+                model = f.read().rstrip(b'\0').decode('utf-8', 'replace').strip()
+        except OSError:
+            continue
+        if model:
+            return model
+    return None
+
+
+def read_cpuinfo_model():
+    """
+    Finds the CPU name in the first processor block of /proc/cpuinfo.
+
+    Returns:
+        tuple: (model or None, MHz from cpuinfo or None).
+    """
+    model = None
+    mhz = None
+    arm_ids = {}
+    try:
+        with open(host_path('/proc/cpuinfo'), 'r') as f:
+            for line in f:
+                key, sep, value = line.partition(':')
+                if not sep:
+                    if model or arm_ids:
+                        break # The first block has everything; the rest repeat it per CPU
+                    continue
+                key = key.strip()
+                value = value.strip()
+                if key in MODEL_KEYS and model is None and value:
+                    model = value
+                elif key == 'cpu MHz' and mhz is None:
+                    try:
+                        mhz = float(value)
+                    except ValueError:
+                        pass
+                elif key in ('CPU implementer', 'CPU part'):
+                    arm_ids[key] = value.lower()
+    except OSError:
+        return None, None
+
+    if model is None and arm_ids:
+        implementer = arm_ids.get('CPU implementer')
+        part = ARM_PARTS.get((implementer, arm_ids.get('CPU part')))
+        vendor = ARM_IMPLEMENTERS.get(implementer)
+        board = None if part else _device_tree_model()
+        if part:
+            model = f"{vendor} {part}" if vendor and not part.startswith(vendor) else part
+        elif board:
+            model = board
+        elif vendor:
+            model = f"{vendor} {arm_ids.get('CPU part', '')}".strip()
+    return model, mhz
+
+
+def parse_cpu_list(text):
+    """
+    Parses a kernel CPU list like "0-3,8-11" into a set of CPU numbers.
+    """
+    cpus = set()
+    for part in text.strip().split(','):
+        if not part:
+            continue
+        first, _, last = part.partition('-')
+        try:
+            cpus.update(range(int(first), int(last or first) + 1))
+        except ValueError:
+            continue
+    return cpus
+
+
+def _read(path):
+    try:
+        with open(path, 'r') as f:
+            return f.read().strip()
+    except OSError:
+        return None
+
+
+def _sibling_list(cpu, names):
+    for name in names:
+        text = _read(os.path.join(CPU_SYSFS_DIR, f'cpu{cpu}', 'topology', name))
+        if text is not None:
+            return parse_cpu_list(text)
+    return None
+
+
+def read_topology():
+    """
+    Counts the online sockets, cores and threads from /sys/devices/system/cpu.
+
+    Returns:
+        dict: {'sockets', 'cores', 'threads', 'online'} (online is the kernel's CPU
+              list, e.g. "0-255"), or None if sysfs isn't available.
+    """
+    online_text = _read(os.path.join(CPU_SYSFS_DIR, 'online'))
+    if not online_text:
+        return None
+    online = parse_cpu_list(online_text)
+    if not online:
+        return None
+
+    # Each core/socket is counted once: all CPUs in its sibling list are skipped.
+    cores = 0
+    sockets = 0
+    seen_threads = set()
+    seen_packages = set()
+    for cpu in sorted(online):
+        if cpu not in seen_threads:
+            siblings = _sibling_list(cpu, ('core_cpus_list', 'thread_siblings_list'))
+            seen_threads.update(siblings or {cpu})
+            cores += 1
+        if cpu not in seen_packages:
+            package = _sibling_list(cpu, ('package_cpus_list', 'core_siblings_list'))
+            seen_packages.update(package or online)
+            sockets += 1
+    return {'sockets': sockets, 'cores': cores, 'threads': len(online), 'online': online_text}
+
+
+def read_caches(cpu=0):
+    """
+    Returns the cache sizes seen by one CPU, e.g. {'L1d': 49152, 'L1i': 32768, 'L2': 524288, 'L3': 33554432}.
+    """
+    caches = {}
+    base = os.path.join(CPU_SYSFS_DIR, f'cpu{cpu}', 'cache')
+    try:
+        indexes = sorted(entry.path for entry in os.scandir(base) if entry.name.startswith('index'))
+    except OSError:
+        return caches
+    multipliers = {'K': 1024, 'M': 1024 ** 2, 'G': 1024 ** 3}
+    for index in indexes:
+        level = _read(os.path.join(index, 'level'))
+        cache_type = _read(os.path.join(index, 'type'))
+        size = _read(os.path.join(index, 'size'))
+        if not level or not size:
+            continue
+        suffix = {'Data': 'd', 'Instruction': 'i'}.get(cache_type, '')
+        try:
+            value = int(size[:-1]) * multipliers[size[-1]] if size[-1] in multipliers else int(size)
+        except ValueError:
+            continue
+        caches[f"L{level}{suffix}"] = value
+    return caches
+
+
+def read_max_mhz():
+    """
+    Returns the highest maximum frequency of the CPUs in MHz from cpufreq, or None.
+    """
+    best = None
+    for cpu in range(4):
+        # Hybrid (P/E core) and big.LITTLE CPUs have a different maximum per core type;
+        # checking the first few CPUs avoids reading one file per logical CPU.
+        value = _read(os.path.join(CPU_SYSFS_DIR, f'cpu{cpu}', 'cpufreq', 'cpuinfo_max_freq'))
+        if value and value.isdigit():
+            mhz = int(value) / 1000
+            best = mhz if best is None else max(best, mhz)
+    return best
+
+
+def read_cpu():
+    """
+    Collects everything known about the CPU.
+
+    Returns:
+        dict: {'model', 'architecture', 'sockets', 'cores', 'threads', 'online',
+               'max_mhz', 'caches'}; unknown values are None.
+    """
+    model, cpuinfo_mhz = read_cpuinfo_model()
+    model_mhz = None
+    if model:
+        model, model_mhz = _strip_frequency(model)
+    topology = read_topology() or {}
+    return {
+        'model': model,
+        'architecture': os.uname().machine,
+        'sockets': topology.get('sockets'),
+        'cores': topology.get('cores'),
+        'threads': topology.get('threads') or os.cpu_count(),
+        'online': topology.get('online'),
+        'max_mhz': read_max_mhz() or model_mhz or cpuinfo_mhz,
+        'caches': read_caches(),
+    }
+
+
+# For testing this module independently
+if __name__ == "__main__":
+    for key, value in read_cpu().items():
+        print(f"{key}: {value}")
@@ -1,124 +1,63 @@
 # core/desktop_info.py
 
 import os
-import subprocess
-import re
-def get_desktop_info():
+
+from core import desktop_settings, wm
+from core.fields import LOCAL, run_probes
+from utils.cache import cached
+
+def _settings_policy(caller):
     """
-    Collects information about the Desktop Environment (DE), Window Manager (WM),
-    GTK/Qt themes, icons, and fonts.
+    Cache policy for the theme fields: valid until one of the settings files or the dconf database change,
+    or until the desktop or the session type do (they decide which backend is read).
     """
-    info = {}
+    context = (caller.getenv('XDG_CURRENT_DESKTOP'), caller.getenv('XDG_SESSION_TYPE'))
+    return ('context', context, ('mtime',) + tuple(desktop_settings.watched_paths()))
 
-    # 1. Desktop Environment (DE)
+def _probe_desktop_environment(caller=LOCAL):
     # XDG_CURRENT_DESKTOP is the most reliable way on modern Linux DEs.
-    info['Desktop Environment'] = os.getenv('XDG_CURRENT_DESKTOP') or 'N/A'
+    return caller.getenv('XDG_CURRENT_DESKTOP') or 'N/A'
 
-    # 2. Window Manager (WM)
-    # WM usually corresponds to the DE, but can be separate (e.g., i3, bspwm).
-    # This is often found in the WM_NAME property via xprop, or specific env vars.
-    # We'll try to get it from XDG_CURRENT_DESKTOP first, then fallback to xprop if needed.
-    wm_name = 'N/A'
-    try:
-        # Check if a specific WM environment variable exists (e.g., for i3)
-        if os.getenv('I3SOCK'):
-            wm_name = 'i3'
-        elif os.getenv('BSPWM_SOCKET'):
-            wm_name = 'bspwm'
-        # More robust way using xprop (requires xorg-xprop package)
-        elif os.getenv('DISPLAY'): # Only run if a display is available
-            wm_output = subprocess.check_output(
-                ['xprop', '-root', '-notype', '_NET_WM_NAME'],
-                text=True, stderr=subprocess.DEVNULL
-            ).strip()
-            # Example: _NET_WM_NAME(UTF8) = "GNOME Shell"
-            match = re.search(r'\"([^\"]+)\"', wm_output)
-            if match:
-                wm_name = match.group(1)
-        
-        # If the DE itself is a WM (like GNOME Shell, KWin for KDE)
-        if info['Desktop Environment'] and 'GNOME' in info['Desktop Environment']:
-            wm_name = 'GNOME Shell'
-        elif info['Desktop Environment'] and 'KDE' in info['Desktop Environment']:
-            wm_name = 'KWin'
-        
-    except (subprocess.CalledProcessError, FileNotFoundError):
-        pass # xprop not found or display not available
+def _probe_window_manager(caller=LOCAL):
+    # Env hints, then one /proc scan, then an in-process X11 query; cached per session (core/wm.py).
+    return wm.window_manager(caller.env)
 
-    info['Window Manager'] = wm_name
+# The theme fields are read through the shared settings backend (GTK, KDE, qt5ct/qt6ct
+# and GSettings, see core/desktop_settings.py) and cached until its files change.
+def _cached_setting(field, setting, caller):
+    return cached(field, _settings_policy(caller), lambda: desktop_settings.get_setting(setting, caller.env))
 
-    # 3. GTK Theme (for GTK-based DEs like GNOME, XFCE, Cinnamon, MATE)
-    gtk_theme = 'N/A'
-    try:
-        # Check ~/.config/gtk-3.0/settings.ini
-        gtk3_config_path = os.path.expanduser('~/.config/gtk-3.0/settings.ini')
-        if os.path.exists(gtk3_config_path):
-            with open(gtk3_config_path, 'r') as f:
-                for line in f:
-                    if 'gtk-theme-name=' in line:
-                        gtk_theme = line.split('=')[1].strip()
-                        break
-        if gtk_theme == 'N/A': # Fallback for GTK2 or if not in settings.ini
-            # Attempt to use 'gsettings' for GNOME/Cinnamon/MATE
-            if os.getenv('XDG_CURRENT_DESKTOP') in ['GNOME', 'Cinnamon', 'MATE']:
-                gtk_theme = subprocess.check_output(
-                    ['gsettings', 'get', 'org.gnome.desktop.interface', 'gtk-theme'],
-                    text=True, stderr=subprocess.DEVNULL
-                ).strip().strip("'")
-    except (subprocess.CalledProcessError, FileNotFoundError):
-        pass
-    info['GTK Theme'] = gtk_theme if gtk_theme else 'N/A'
+def _probe_gtk_theme(caller=LOCAL):
+    return _cached_setting('GTK Theme', 'gtk_theme', caller)
 
+def _probe_qt_theme(caller=LOCAL):
+    return _cached_setting('Qt Theme', 'qt_theme', caller)
 
-    # 4. Icon Theme
-    icon_theme = 'N/A'
-    try:
-        # Check ~/.config/gtk-3.0/settings.ini for GTK icon theme
-        gtk3_config_path = os.path.expanduser('~/.config/gtk-3.0/settings.ini')
-        if os.path.exists(gtk3_config_path):
-            with open(gtk3_config_path, 'r') as f:
-                for line in f:
-                    if 'gtk-icon-theme-name=' in line:
-                        icon_theme = line.split('=')[1].strip()
-                        break
-        if icon_theme == 'N/A': # Fallback using gsettings for GNOME-like DEs
-            if os.getenv('XDG_CURRENT_DESKTOP') in ['GNOME', 'Cinnamon', 'MATE']:
-                icon_theme = subprocess.check_output(
-                    ['gsettings', 'get', 'org.gnome.desktop.interface', 'icon-theme'],
-                    text=True, stderr=subprocess.DEVNULL
-                ).strip().strip("'")
-    except (subprocess.CalledProcessError, FileNotFoundError):
-        pass
-    info['Icons'] = icon_theme if icon_theme else 'N/A'
+def _probe_icon_theme(caller=LOCAL):
+    return _cached_setting('Icons', 'icons', caller)
 
+def _probe_font(caller=LOCAL):
+    return _cached_setting('Font', 'font', caller)
 
-    # 5. Font (GTK/System Font)
-    font_name = 'N/A'
-    try:
-        # Check ~/.config/gtk-3.0/settings.ini for GTK font
-        gtk3_config_path = os.path.expanduser('~/.config/gtk-3.0/settings.ini')
-        if os.path.exists(gtk3_config_path):
-            with open(gtk3_config_path, 'r') as f:
-                for line in f:
-                    if 'gtk-font-name=' in line:
-                        font_name = line.split('=')[1].strip()
-                        break
-        if font_name == 'N/A': # Fallback using gsettings for GNOME-like DEs
-            if os.getenv('XDG_CURRENT_DESKTOP') in ['GNOME', 'Cinnamon', 'MATE']:
-                font_name = subprocess.check_output(
-                    ['gsettings', 'get', 'org.gnome.desktop.interface', 'font-name'],
-                    text=True, stderr=subprocess.DEVNULL
-                ).strip().strip("'")
-    except (subprocess.CalledProcessError, FileNotFoundError):
-        pass
-    info['Font'] = font_name if font_name else 'N/A'
+# Field -> probe, in display order. Probes are only run for the requested fields.
+PROBES = {
+    'Desktop Environment': _probe_desktop_environment,
+    'Window Manager': _probe_window_manager,
+    'GTK Theme': _probe_gtk_theme,
+    'Qt Theme': _probe_qt_theme,
+    'Icons': _probe_icon_theme,
+    'Font': _probe_font,
+}
 
-    # Note: Getting accurate info for Qt themes, cursor, or specific details for
-    # non-GTK/GNOME environments (like pure Plasma/KDE without GTK apps) might
-    # require parsing different config files or using qt5ct/qt6ct settings.
-    # This current implementation focuses on common GTK-based setups.
+def get_desktop_info(fields=None):
+    """
+    Collects information about the Desktop Environment (DE), Window Manager (WM),
+    GTK/Qt themes, icons, and fonts.
 
-    return info
+    Args:
+        fields (collection, optional): Only collect these fields. Defaults to all of them.
+    """
+    return run_probes(PROBES, fields)
 
 # For testing this module independently
 if __name__ == "__main__":
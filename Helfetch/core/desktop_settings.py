@@ -0,0 +1,329 @@
+# core/desktop_settings.py
+
+# The desktop settings backend behind the theme, icon and font fields.
+# Every config source is parsed at most once and kept in memory until its file
+# changes (keyed by mtime), so the GTK Theme, Qt Theme, Icons and Font probes
+# share a single read of each file:
+#   - GTK: ~/.config/gtk-3.0/settings.ini, ~/.config/gtk-4.0/settings.ini, ~/.gtkrc-2.0
+#   - KDE: ~/.config/kdeglobals
+#   - Qt:  ~/.config/qt5ct/qt5ct.conf, ~/.config/qt6ct/qt6ct.conf
+#   - GNOME/Cinnamon/MATE: one 'gsettings list-recursively' call for the whole
+#     interface schema (instead of one 'gsettings get' per key), only when the
+#     files above don't have the value. A failed call isn't remembered: the
+#     lookup raises SettingsUnavailable, which the field cache doesn't store.
+
+import os
+import threading
+
+from utils import cache, profiler
+
+# Setting -> key in GTK settings.ini / .gtkrc-2.0
+GTK_KEYS = {
+    'gtk_theme': 'gtk-theme-name',
+    'icons': 'gtk-icon-theme-name',
+    'font': 'gtk-font-name',
+}
+
+# Setting -> key in the desktop's GSettings interface schema
+GSETTINGS_KEYS = {
+    'gtk_theme': 'gtk-theme',
+    'icons': 'icon-theme',
+    'font': 'font-name',
+}
+
+# Desktop (lowercase XDG_CURRENT_DESKTOP entry) -> GSettings interface schema
+GSETTINGS_SCHEMAS = {
+    'gnome': 'org.gnome.desktop.interface',
+    'unity': 'org.gnome.desktop.interface',
+    'budgie': 'org.gnome.desktop.interface',
+    'cinnamon': 'org.cinnamon.desktop.interface',
+    'mate': 'org.mate.interface',
+}
+
+# Setting -> (section, key) in kdeglobals
+KDE_KEYS = {
+    'qt_theme': ('KDE', 'widgetStyle'),
+    'icons': ('Icons', 'Theme'),
+    'font': ('General', 'font'),
+}
+
+# Setting -> (section, key) in qt5ct.conf / qt6ct.conf
+QTCT_KEYS = {
+    'qt_theme': ('Appearance', 'style'),
+    'icons': ('Appearance', 'icon_theme'),
+    'font': ('Fonts', 'general'),
+}
+
+_lock = threading.Lock()
+_parsed = {}   # path -> (mtime_ns, sections)
+_gsettings = {} # schema -> (dconf mtime_ns, values)
+_gsettings_locks = {} # schema -> lock held while its 'gsettings' call runs
+
+
+class SettingsUnavailable(cache.Uncacheable):
+    """
+    A settings source that should have answered failed (e.g. 'gsettings' exited
+    with an error). 'value' is the result from the other sources, or 'N/A'.
+    """
+
+
+def config_home():
+    return os.getenv('XDG_CONFIG_HOME') or os.path.expanduser('~/.config')
+
+
+def gtk_paths():
+    return [os.path.join(config_home(), 'gtk-3.0', 'settings.ini'),
+            os.path.join(config_home(), 'gtk-4.0', 'settings.ini'),
+            os.path.expanduser('~/.gtkrc-2.0')]
+
+
+def kde_path():
+    return os.path.join(config_home(), 'kdeglobals')
+
+
+def qtct_paths(env=None):
+    """
+    Returns the qt5ct/qt6ct config files, the one selected by QT_QPA_PLATFORMTHEME
+    (in 'env', default: os.environ) first.
+    """
+    env = os.environ if env is None else env
+    paths = [os.path.join(config_home(), name, f'{name}.conf') for name in ('qt6ct', 'qt5ct')]
+    if env.get('QT_QPA_PLATFORMTHEME') == 'qt5ct':
+        paths.reverse()
+    return paths
+
+
+def dconf_path():
+    return os.path.join(config_home(), 'dconf', 'user')
+
+
+def watched_paths():
+    """
+    Returns every file the settings are read from, for the result cache's mtime policy.
+    """
+    return gtk_paths() + [kde_path()] + qtct_paths() + [dconf_path()]
+
+
+def _mtime(path):
+    try:
+        return os.stat(path).st_mtime_ns
+    except OSError:
+        return None
+
+
+def _unquote(value):
+    value = value.strip()
+    if len(value) >= 2 and value[0] == value[-1] and value[0] in '"\'':
+        return value[1:-1]
+    return value
+
+
+def parse_ini(path):
+    """
+    Parses an INI-style file (settings.ini, .gtkrc-2.0, kdeglobals, qt5ct.conf).
+    Keys outside any section go to the '' section, KDE's '[$e]'-style key suffixes
+    are dropped and surrounding quotes are removed from values.
+
+    Returns:
+        dict: Section -> {key: value}, or an empty dict if the file can't be read.
+    """
+    sections = {}
+    current = sections.setdefault('', {})
+    try:
+        with open(path, 'r', encoding='utf-8', errors='replace') as f:
+            for line in f:
+                line = line.strip()
+                if not line or line[0] in '#;':
+                    continue
+                if line[0] == '[' and line[-1] == ']':
+                    current = sections.setdefault(line[1:-1], {})
+                    continue
+                key, sep, value = line.partition('=')
+                if sep:
+                    current[key.split('[', 1)[0].strip()] = _unquote(value)
+    except OSError:
+        return {}
+    return sections
+
+
+def _read_file(path):
+    """
+    Returns the parsed file, re-parsing it only when its mtime changed.
+    """
+    mtime = _mtime(path)
+    if mtime is None:
+        return {}
+    with _lock:
+        entry = _parsed.get(path)
+        if entry is None or entry[0] != mtime:
+            entry = (mtime, parse_ini(path))
+            _parsed[path] = entry
+    return entry[1]
+
+
+def _gsettings_values(schema):
+    """
+    Reads every key of a GSettings schema with a single 'gsettings list-recursively'
+    call, memoized until the dconf database changes. Only lookups of the same schema
+    wait for a running call.
+
+    Raises:
+        OSError: If 'gsettings' failed (the failure isn't memoized).
+    """
+    mtime = _mtime(dconf_path())
+    with _lock:
+        entry = _gsettings.get(schema)
+        if entry is not None and entry[0] == mtime:
+            return entry[1]
+        schema_lock = _gsettings_locks.setdefault(schema, threading.Lock())
+    with schema_lock:
+        with _lock:
+            entry = _gsettings.get(schema)
+            if entry is not None and entry[0] == mtime:
+                return entry[1]
+        import subprocess
+        values = {}
+        try:
+            output = subprocess.check_output(
+                ['gsettings', 'list-recursively', schema],
+                text=True, stderr=subprocess.DEVNULL
+            )
+            for line in output.splitlines():
+                # Example: org.gnome.desktop.interface gtk-theme 'Adwaita'
+                parts = line.split(None, 2)
+                if len(parts) == 3:
+                    values[parts[1]] = _unquote(parts[2])
+        except FileNotFoundError as e:
+            profiler.note_failure(f"{type(e).__name__}: {e}") # Not installed: remembered like an empty schema
+        except subprocess.CalledProcessError as e:
+            profiler.note_failure(f"{type(e).__name__}: {e}")
+            raise OSError(f"gsettings failed with exit status {e.returncode}") from None
+        with _lock:
+            _gsettings[schema] = (mtime, values)
+    return values
+
+
+def _qt_font(value):
+    """
+    Converts a QFont string ("Noto Sans,10,-1,5,50,0,0,0,0,0") to "Noto Sans 10".
+    qt5ct may also store fonts as binary @Variant values, which are skipped.
+    """
+    if value.startswith('@'):
+        return None
+    parts = value.split(',')
+    if len(parts) >= 2 and parts[1].strip():
+        return f"{parts[0].strip()} {parts[1].strip()}"
+    return parts[0].strip() or None
+
+
+def _from_gtk(setting, env):
+    key = GTK_KEYS.get(setting)
+    if key is None:
+        return None
+    for path in gtk_paths():
+        for section in _read_file(path).values():
+            if section.get(key):
+                return section[key]
+    return None
+
+
+def _from_kde(setting, env):
+    if setting not in KDE_KEYS:
+        return None
+    section, key = KDE_KEYS[setting]
+    value = _read_file(kde_path()).get(section, {}).get(key)
+    if value and setting == 'font':
+        return _qt_font(value)
+    return value or None
+
+
+def _from_qtct(setting, env):
+    if setting not in QTCT_KEYS:
+        return None
+    section, key = QTCT_KEYS[setting]
+    for path in qtct_paths(env):
+        value = _read_file(path).get(section, {}).get(key)
+        if value and setting == 'font':
+            value = _qt_font(value)
+        if value:
+            return value
+    return None
+
+
+def _from_gsettings(schema):
+    def lookup(setting, env):
+        key = GSETTINGS_KEYS.get(setting)
+        if key is None:
+            return None
+        return _gsettings_values(schema).get(key) or None
+    return lookup
+
+
+def current_desktops(env=None):
+    """
+    Returns the lowercase XDG_CURRENT_DESKTOP entries (e.g. 'ubuntu:GNOME' -> ['ubuntu', 'gnome']),
+    without the 'X-' prefix some desktops use (e.g. 'X-Cinnamon'), from 'env' (default: os.environ).
+    """
+    env = os.environ if env is None else env
+    desktops = []
+    for name in (env.get('XDG_CURRENT_DESKTOP') or '').split(':'):
+        name = name.strip().lower()
+        if name.startswith('x-'):
+            name = name[2:]
+        if name:
+            desktops.append(name)
+    return desktops
+
+
+def _sources(env):
+    """
+    Returns the lookup functions to try, most authoritative first for the current desktop.
+    GSettings is only queried on the desktops that use it.
+    """
+    desktops = current_desktops(env)
+    if 'kde' in desktops:
+        return [_from_kde, _from_gtk, _from_qtct]
+    for desktop in desktops:
+        if desktop in GSETTINGS_SCHEMAS:
+            return [_from_gtk, _from_gsettings(GSETTINGS_SCHEMAS[desktop]), _from_qtct, _from_kde]
+    return [_from_gtk, _from_qtct, _from_kde]
+
+
+def get_setting(setting, env=None):
+    """
+    Looks up a desktop setting.
+
+    Args:
+        setting (str): 'gtk_theme', 'qt_theme', 'icons' or 'font'.
+        env (dict, optional): The environment of the session to look it up for
+                              (its XDG_CURRENT_DESKTOP). Defaults to os.environ.
+
+    Returns:
+        str: The value, or 'N/A' if no source has it.
+
+    Raises:
+        SettingsUnavailable: If a source consulted before the answer failed.
+    """
+    failed = False
+    value = 'N/A'
+    for source in _sources(env):
+        try:
+            found = source(setting, env)
+        except OSError:
+            failed = True
+            continue
+        if found:
+            value = found
+            break
+    if failed:
+        raise SettingsUnavailable(value)
+    return value
+
+
+# For testing this module independently
+if __name__ == "__main__":
+    for name in ('gtk_theme', 'qt_theme', 'icons', 'font'):
+        try:
+            print(f"{name}: {get_setting(name)}")
+        except SettingsUnavailable as e:
+            print(f"{name}: {e.value} (a source failed)")
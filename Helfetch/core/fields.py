@@ -0,0 +1,212 @@
+# core/fields.py
+
+# The field registry: every output field mapped to the info module that provides it.
+# The modules themselves are only imported when one of their fields is requested,
+# so e.g. 'helfetch --fields Uptime' never loads the network module.
+
+import functools
+import importlib
+import os
+from collections import namedtuple
+
+from utils import profiler
+
+# Field -> module name, in default display order.
+FIELD_MODULES = {
+    'User': 'system',
+    'Host': 'system',
+    'OS': 'system',
+    'Kernel': 'system',
+    'Uptime': 'system',
+    'Shell': 'system',
+    'Terminal': 'system',
+    'Packages': 'system',
+    'CPU': 'hardware',
+    'RAM': 'hardware',
+    'Disk': 'hardware',
+    'Disks': 'hardware',
+    'GPU': 'hardware',
+    'CPU Usage': 'sensors',
+    'Load': 'sensors',
+    'CPU Temp': 'sensors',
+    'CPU Freq': 'sensors',
+    'Desktop Environment': 'desktop',
+    'Window Manager': 'desktop',
+    'GTK Theme': 'desktop',
+    'Qt Theme': 'desktop',
+    'Icons': 'desktop',
+    'Font': 'desktop',
+    'Local IP': 'network',
+    'Public IP': 'network',
+    'ISP': 'network',
+    'City': 'network',
+    'Country': 'network',
+}
+
+# Fields that change while the system is running. Watch mode refreshes only these;
+# everything else (CPU, GPU, OS, themes, ...) is collected once.
+VOLATILE_FIELDS = {'Uptime', 'RAM', 'Disk', 'Disks', 'Local IP', 'CPU Usage', 'Load', 'CPU Temp', 'CPU Freq'}
+
+# Fields that describe the process helfetch runs for rather than the machine: its
+# shell and terminal, its desktop session. helfetchd collects them per client;
+# their probes take the Caller as an optional argument.
+CALLER_FIELDS = {'Shell', 'Terminal', 'Desktop Environment', 'Window Manager',
+                 'GTK Theme', 'Qt Theme', 'Icons', 'Font'}
+
+# Module name -> Python module defining its PROBES.
+MODULE_PATHS = {
+    'system': 'core.system_info',
+    'hardware': 'core.hardware_info',
+    'sensors': 'core.sensors_info',
+    'desktop': 'core.desktop_info',
+    'network': 'core.network_info',
+}
+
+# Plugin name -> manifest (core/plugins.py), filled by register_plugins().
+PLUGINS = {}
+
+
+class Caller(namedtuple('Caller', ['pid', 'env'])):
+    """
+    The process the CALLER_FIELDS are collected for: 'pid' None is this process,
+    'env' None is os.environ.
+    """
+    __slots__ = ()
+
+    def getenv(self, name):
+        return os.getenv(name) if self.env is None else self.env.get(name)
+
+
+# This process (a normal run)
+LOCAL = Caller(None, None)
+
+
+def module_fields(modules):
+    """
+    Returns the fields provided by the given modules, in default display order.
+    """
+    return [field for field, module in FIELD_MODULES.items() if module in modules]
+
+
+def resolve_fields(names):
+    """
+    Maps user-supplied field names (case-insensitive) to registry field names.
+
+    Raises:
+        ValueError: If a name doesn't match any known field.
+    """
+    lookup = {field.lower(): field for field in FIELD_MODULES}
+    fields = []
+    for name in names:
+        field = lookup.get(name.strip().lower())
+        if field is None:
+            raise ValueError(f"unknown field '{name.strip()}' (available: {', '.join(FIELD_MODULES)})")
+        if field not in fields:
+            fields.append(field)
+    return fields
+
+
+def register_plugins():
+    """
+    Adds the fields of the installed plugins to the registry, after the built-in ones.
+    A plugin can't take over a built-in module name or another module's fields.
+
+    Returns:
+        list: The names of the registered plugins.
+    """
+    from core import plugins
+
+    def register():
+        for manifest in plugins.discover():
+            name = manifest['name']
+            if name in MODULE_PATHS or name in PLUGINS:
+                profiler.note_failure(f"plugin {name}: module name already in use")
+                continue
+            taken = [field for field in manifest['fields'] if field in FIELD_MODULES]
+            if taken:
+                profiler.note_failure(f"plugin {name}: field(s) already provided: {', '.join(taken)}")
+                continue
+            PLUGINS[name] = manifest
+            for field in manifest['fields']:
+                FIELD_MODULES[field] = name
+            if manifest.get('ttl') is not None:
+                VOLATILE_FIELDS.update(manifest['fields'])
+        return list(PLUGINS)
+
+    # Discovery and rejected plugins show up as the 'plugins' row of --profile.
+    return profiler.call('plugins', register)
+
+
+def run_probes(probes, fields=None):
+    """
+    Runs the probes needed for the requested fields, one after another.
+
+    Args:
+        probes (dict): Field (or tuple of fields) -> probe function, as defined by each
+                       info module's PROBES. A probe for a tuple of fields returns a dict.
+        fields (collection, optional): The requested fields. Defaults to all of them.
+
+    Returns:
+        dict: The collected information.
+    """
+    info = {}
+    for key, probe in probes.items():
+        names = key if isinstance(key, tuple) else (key,)
+        if fields is not None and not any(name in fields for name in names):
+            continue
+        if isinstance(key, tuple):
+            info.update(profiler.call(names[0], probe))
+        else:
+            info[key] = profiler.call(key, probe)
+    return info
+
+
+def probe_tasks(fields, timeouts, default_timeout=2.0, caller=None):
+    """
+    Builds scheduler tasks for the probes needed by the requested fields,
+    importing only the modules that provide them. A plugin is one task, which
+    imports it on the collector thread.
+
+    Args:
+        fields (list): The requested fields.
+        timeouts (dict): Per-module (or plugin) time budgets in seconds.
+        default_timeout (float): Budget for modules missing from 'timeouts'.
+                                 Plugins default to the budget of their cost class.
+        caller (Caller, optional): The process to collect the CALLER_FIELDS for.
+                                   Defaults to this one.
+
+    Returns:
+        list: (name, func, fields, timeout) tuples for core.scheduler.run_collectors().
+    """
+    modules = []
+    for field in fields:
+        module = FIELD_MODULES.get(field)
+        if module and module not in modules:
+            modules.append(module)
+
+    tasks = []
+    for module in modules:
+        if module in PLUGINS:
+            from core import plugins
+            manifest = PLUGINS[module]
+            names = [field for field in fields if FIELD_MODULES.get(field) == module]
+            timeout = timeouts.get(module, plugins.budget(manifest))
+            tasks.append((f"plugin:{module}", plugins.collector(manifest, names), names, timeout))
+            continue
+        probes = importlib.import_module(MODULE_PATHS[module]).PROBES
+        timeout = timeouts.get(module, default_timeout)
+        for key, probe in probes.items():
+            names = key if isinstance(key, tuple) else (key,)
+            if not any(name in fields for name in names):
+                continue
+            if caller is not None and any(name in CALLER_FIELDS for name in names):
+                probe = functools.partial(probe, caller)
+            name = f"{module}:{names[0]}"
+            tasks.append((name, _as_dict(name, key, probe), list(names), timeout))
+    return tasks
+
+
+def _as_dict(name, key, probe):
+    if isinstance(key, tuple):
+        return lambda: profiler.call(name, probe)
+    return lambda: {key: profiler.call(name, probe)}
@@ -0,0 +1,277 @@
+# core/geo.py
+
+# Public IP and geolocation lookup (Public IP, ISP, City, Country).
+#
+#   - Offline fast path: without a default route there is nothing to ask, so the
+#     lookup returns immediately instead of waiting for a connection timeout.
+#   - Hard time budget: all providers together get DEFAULT_TIMEOUTS["network"].
+#   - Provider fallback: DEFAULT_GEO_PROVIDERS are tried in order.
+#   - Keep-alive: one HTTP(S) connection per provider is kept open and reused by
+#     the next lookup in the same process (helfetchd, --watch).
+#   - Rate limiting: every request is recorded in $XDG_CACHE_HOME/helfetch/geo.json,
+#     shared by all helfetch processes of the user. A provider is skipped while it
+#     is at its per-minute limit or has told us to back off (HTTP 429, ip-api's
+#     X-Rl/X-Ttl headers); then the last successful answer is returned instead.
+#   - Failures aren't cached: when no provider answered, lookup() raises
+#     LookupFailed, which the field cache returns without storing.
+#
+# The http.client/json/ssl modules are only imported when a request is made.
+
+import os
+import threading
+import time
+
+from config.default_config import DEFAULT_GEO_PROVIDERS, DEFAULT_TIMEOUTS
+from core import probes
+from utils import cache, profiler
+
+GEO_FIELDS = ('Public IP', 'ISP', 'City', 'Country')
+
+PROVIDERS = DEFAULT_GEO_PROVIDERS
+
+RATE_WINDOW = 60 # seconds
+
+# A stale keep-alive connection isn't retried with less time than this left
+MIN_RETRY_TIME = 0.1 # seconds
+
+_lock = threading.Lock()
+_connections = {} # (scheme, host, port) -> idle keep-alive connection
+_state = None
+
+
+class LookupFailed(cache.Uncacheable):
+    """
+    No provider answered (offline, errors, rate limits). 'value' is the best
+    result available: the last successful answer, or all 'N/A'.
+    """
+
+
+def empty_result():
+    return {field: 'N/A' for field in GEO_FIELDS}
+
+
+def state_file():
+    return os.path.join(cache.cache_dir(), 'geo.json')
+
+
+def _load_state():
+    """
+    Returns the persisted rate-limit state: {'requests': {provider: [times]},
+    'blocked': {provider: until}, 'last': {'time', 'provider', 'result'}}.
+    """
+    global _state
+    if _state is None:
+        _state = {}
+        if cache.is_enabled():
+            import json
+            try:
+                with open(state_file(), 'r') as f:
+                    _state = json.load(f)
+                if not isinstance(_state, dict):
+                    _state = {}
+            except (OSError, ValueError):
+                _state = {}
+        _state.setdefault('requests', {})
+        _state.setdefault('blocked', {})
+    return _state
+
+
+def _save_state():
+    if not cache.is_enabled():
+        return
+    import json
+    try:
+        os.makedirs(cache.cache_dir(), exist_ok=True)
+        tmp_path = f"{state_file()}.{os.getpid()}.tmp"
+        with open(tmp_path, 'w') as f:
+            json.dump(_state, f)
+        os.replace(tmp_path, state_file())
+    except OSError:
+        pass
+
+
+def _reserve(provider, now):
+    """
+    Records a request to 'provider' if it is allowed right now.
+
+    Returns:
+        str: None if the request may be made, or the reason it may not.
+    """
+    name = provider['name']
+    state = _load_state()
+    if state['blocked'].get(name, 0) > now:
+        return f"{name}: backing off for {state['blocked'][name] - now:.0f}s"
+    recent = [t for t in state['requests'].get(name, []) if now - t < RATE_WINDOW]
+    limit = provider.get('per_minute')
+    if limit and len(recent) >= limit:
+        state['requests'][name] = recent
+        return f"{name}: rate limit of {limit}/min reached"
+    recent.append(now)
+    state['requests'][name] = recent
+    return None
+
+
+def _block(provider, seconds):
+    _load_state()['blocked'][provider['name']] = time.time() + seconds
+
+
+def _lookup_key(data, dotted_key):
+    for part in dotted_key.split('.'):
+        if not isinstance(data, dict):
+            return None
+        data = data.get(part)
+    return data
+
+
+def _get(url, deadline):
+    """
+    GETs a URL over a reused keep-alive connection.
+
+    Args:
+        url (str): The URL.
+        deadline (float): time.monotonic() time by which the request must be done.
+
+    Returns:
+        tuple: (status, headers, body).
+    """
+    import http.client
+    from urllib.parse import urlsplit
+
+    timeout = deadline - time.monotonic()
+    if timeout <= 0:
+        raise TimeoutError("time budget exhausted")
+    parts = urlsplit(url)
+    key = (parts.scheme, parts.hostname, parts.port)
+    with _lock:
+        connection = _connections.pop(key, None)
+    reused = connection is not None
+    if connection is None:
+        connection_class = http.client.HTTPSConnection if parts.scheme == 'https' else http.client.HTTPConnection
+        connection = connection_class(parts.hostname, parts.port, timeout=timeout)
+    else:
+        connection.timeout = timeout
+        if connection.sock is not None:
+            connection.sock.settimeout(timeout)
+
+    path = parts.path or '/'
+    if parts.query:
+        path += '?' + parts.query
+    try:
+        connection.request('GET', path, headers={'Accept': 'application/json'})
+        response = connection.getresponse()
+        body = response.read()
+    except (OSError, http.client.HTTPException):
+        connection.close()
+        if reused and deadline - time.monotonic() >= MIN_RETRY_TIME:
+            # The server closed the idle connection; try once more on a new one,
+            # within what is left of the budget.
+            return _get(url, deadline)
+        raise
+    if response.will_close:
+        connection.close()
+    else:
+        with _lock:
+            _connections[key] = connection
+    return response.status, response.headers, body
+
+
+def _query(provider, deadline):
+    """
+    Asks one provider before 'deadline' (time.monotonic()). Returns the result dict,
+    or raises on any failure.
+    """
+    import json
+
+    status, headers, body = _get(provider['url'], deadline)
+    # ip-api reports the remaining requests of the current window and when it resets.
+    if headers.get('X-Rl') == '0':
+        _block(provider, float(headers.get('X-Ttl') or RATE_WINDOW))
+    if status == 429:
+        retry_after = headers.get('Retry-After')
+        _block(provider, float(retry_after) if retry_after and retry_after.isdigit() else RATE_WINDOW)
+        raise ValueError("HTTP 429 (rate limited)")
+    if status != 200:
+        raise ValueError(f"HTTP {status}")
+
+    data = json.loads(body)
+    success = provider.get('success')
+    if success and _lookup_key(data, success[0]) != success[1]:
+        raise ValueError(f"unsuccessful answer: {str(data)[:80]}")
+    result = empty_result()
+    for field, key in provider['fields'].items():
+        value = _lookup_key(data, key)
+        if value not in (None, ''):
+            result[field] = str(value)
+    if result['Public IP'] == 'N/A':
+        raise ValueError("answer has no IP address")
+    return result
+
+
+def lookup(providers=None, timeout=None):
+    """
+    Looks up the public IP address, ISP and location.
+
+    Args:
+        providers (list, optional): Provider definitions (see DEFAULT_GEO_PROVIDERS).
+        timeout (float, optional): Total time budget in seconds for all providers.
+                                   Defaults to DEFAULT_TIMEOUTS["network"].
+
+    Returns:
+        dict: The GEO_FIELDS values, 'N/A' for the ones the provider didn't give.
+
+    Raises:
+        LookupFailed: If no provider answered; its 'value' holds the fallback result.
+    """
+    if not probes.has_default_route():
+        profiler.note_failure("offline (no default route)")
+        raise LookupFailed(empty_result())
+
+    import http.client
+
+    global _state
+    if cache.is_enabled():
+        with _lock:
+            _state = None # Re-read: other helfetch processes may have made requests since.
+
+    providers = PROVIDERS if providers is None else providers
+    timeout = DEFAULT_TIMEOUTS["network"] if timeout is None else timeout
+    deadline = time.monotonic() + timeout
+    errors = []
+    for provider in providers:
+        if time.monotonic() >= deadline:
+            errors.append("time budget exhausted")
+            break
+        with _lock:
+            refused = _reserve(provider, time.time())
+        if refused:
+            errors.append(refused)
+            continue
+        try:
+            result = _query(provider, deadline)
+        except (OSError, http.client.HTTPException, ValueError) as e:
+            errors.append(f"{provider['name']}: {type(e).__name__}: {e}")
+            continue
+        with _lock:
+            _load_state()['last'] = {'time': time.time(), 'provider': provider['name'], 'result': result}
+            _save_state()
+        return result
+
+    with _lock:
+        _save_state()
+        last = _load_state().get('last')
+    if errors:
+        profiler.note_failure("; ".join(errors))
+    if last and isinstance(last.get('result'), dict):
+        # Every provider failed or is rate limited: the last answer is the best we have.
+        raise LookupFailed({field: last['result'].get(field, 'N/A') for field in GEO_FIELDS})
+    raise LookupFailed(empty_result())
+
+
+# For testing this module independently
+if __name__ == "__main__":
+    try:
+        result = lookup()
+    except LookupFailed as e:
+        result = e.value
+    for key, value in result.items():
+        print(f"{key}: {value}")
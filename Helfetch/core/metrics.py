@@ -0,0 +1,309 @@
+# core/metrics.py
+
+# Typed values returned by the probes for numeric fields. They keep the raw
+# numbers (bytes, seconds, counts) for machine-readable output, and are only
+# turned into human-readable text when displayed (str()).
+
+from utils.helpers import format_bytes, format_duration
+
+
+class Metric:
+    """
+    Base class for typed field values.
+    """
+
+    # The number recorded in the watch-mode history (core/sampler.py) for sparklines,
+    # or None for values that aren't sampled over time.
+    sample = None
+
+    def to_json(self):
+        """
+        Returns the raw value as JSON-serializable data.
+        """
+        raise NotImplementedError
+
+    def __str__(self):
+        raise NotImplementedError
+
+
+class MemoryUsage(Metric):
+    """
+    Used/total memory in bytes, displayed like 'free -h' (e.g. "4.0Gi/15Gi").
+    """
+
+    def __init__(self, used, total):
+        self.used = used
+        self.total = total
+
+    @property
+    def percent(self):
+        return self.used * 100 / self.total if self.total else 0.0
+
+    @property
+    def sample(self):
+        return self.percent
+
+    def to_json(self):
+        return {
+            'used_bytes': self.used,
+            'total_bytes': self.total,
+            'percent': round(self.percent, 1),
+        }
+
+    def __str__(self):
+        return f"{format_bytes(self.used)}/{format_bytes(self.total)}"
+
+
+class DiskUsage(MemoryUsage):
+    """
+    Filesystem usage in bytes, displayed as a percentage like 'df' (e.g. "27%").
+    """
+
+    def __init__(self, used, total, available):
+        super().__init__(used, total)
+        self.available = available
+
+    @property
+    def percent(self):
+        # Same as 'df': the share of the space usable by non-root users.
+        usable = self.used + self.available
+        return self.used * 100 / usable if usable else 0.0
+
+    def to_json(self):
+        data = super().to_json()
+        data['available_bytes'] = self.available
+        return data
+
+    def __str__(self):
+        # 'df' rounds the percentage up.
+        usable = self.used + self.available
+        return f"{-(-self.used * 100 // usable) if usable else 0}%"
+
+
+class MountUsage(DiskUsage):
+    """
+    The usage of one mounted filesystem, displayed like "/home 61%".
+    """
+
+    def __init__(self, mount_point, fs_type, used, total, available):
+        super().__init__(used, total, available)
+        self.mount_point = mount_point
+        self.fs_type = fs_type
+
+    def to_json(self):
+        data = {'mount_point': self.mount_point, 'fs_type': self.fs_type}
+        data.update(super().to_json())
+        return data
+
+    def __str__(self):
+        return f"{self.mount_point} {super().__str__()}"
+
+
+class DiskList(Metric):
+    """
+    The usage of every mounted real filesystem, displayed like "/ 27%, /home 61%".
+    """
+
+    def __init__(self, mounts):
+        self.mounts = list(mounts)
+
+    def to_json(self):
+        return [mount.to_json() for mount in self.mounts]
+
+    def __str__(self):
+        return ", ".join(str(mount) for mount in self.mounts)
+
+
+class CpuInfo(Metric):
+    """
+    The CPU model and topology, displayed like "AMD EPYC 7763 (2S/128C/256T) @ 3.5GHz".
+    """
+
+    def __init__(self, model, architecture=None, sockets=None, cores=None, threads=None,
+                 online=None, max_mhz=None, caches=None):
+        self.model = model
+        self.architecture = architecture
+        self.sockets = sockets
+        self.cores = cores
+        self.threads = threads
+        self.online = online
+        self.max_mhz = max_mhz
+        self.caches = caches or {}
+
+    def to_json(self):
+        return {
+            'model': self.model,
+            'architecture': self.architecture,
+            'sockets': self.sockets,
+            'cores': self.cores,
+            'threads': self.threads,
+            'online': self.online,
+            'max_mhz': self.max_mhz,
+            'caches': self.caches,
+        }
+
+    def __str__(self):
+        text = self.model or self.architecture or 'Unknown CPU'
+        counts = []
+        if self.sockets and self.sockets > 1:
+            counts.append(f"{self.sockets}S")
+        if self.cores:
+            counts.append(f"{self.cores}C")
+        if self.threads:
+            counts.append(f"{self.threads}T")
+        if counts:
+            text += f" ({'/'.join(counts)})"
+        if self.max_mhz:
+            text += f" @ {self.max_mhz / 1000:.2f}".rstrip('0').rstrip('.') + "GHz"
+        return text
+
+
+class CpuUsage(Metric):
+    """
+    CPU utilisation in percent, overall and per core, displayed like "23%".
+    """
+
+    def __init__(self, percent, per_core):
+        self.percent = percent
+        self.per_core = list(per_core)
+
+    @property
+    def sample(self):
+        return self.percent
+
+    def to_json(self):
+        return {
+            'percent': round(self.percent, 1),
+            'per_core': [round(core, 1) for core in self.per_core],
+        }
+
+    def __str__(self):
+        return f"{self.percent:.0f}%"
+
+
+class LoadAverage(Metric):
+    """
+    The 1, 5 and 15 minute load averages, displayed like "0.52, 0.61, 0.70".
+    """
+
+    def __init__(self, one, five, fifteen):
+        self.one = one
+        self.five = five
+        self.fifteen = fifteen
+
+    @property
+    def sample(self):
+        return self.one
+
+    def to_json(self):
+        return {'1min': self.one, '5min': self.five, '15min': self.fifteen}
+
+    def __str__(self):
+        return f"{self.one:.2f}, {self.five:.2f}, {self.fifteen:.2f}"
+
+
+class Temperature(Metric):
+    """
+    A temperature in degrees Celsius, displayed like "54.0°C".
+    """
+
+    def __init__(self, celsius):
+        self.celsius = celsius
+
+    @property
+    def sample(self):
+        return self.celsius
+
+    def to_json(self):
+        return {'celsius': round(self.celsius, 1)}
+
+    def __str__(self):
+        return f"{self.celsius:.1f}°C"
+
+
+class Frequency(Metric):
+    """
+    The average and highest CPU core frequency in MHz, displayed like "3.49 GHz (max 4.70 GHz)".
+    """
+
+    def __init__(self, average_mhz, max_mhz):
+        self.average_mhz = average_mhz
+        self.max_mhz = max_mhz
+
+    @property
+    def sample(self):
+        return self.average_mhz
+
+    def to_json(self):
+        return {'average_mhz': round(self.average_mhz), 'max_mhz': round(self.max_mhz)}
+
+    def __str__(self):
+        return f"{self.average_mhz / 1000:.2f} GHz (max {self.max_mhz / 1000:.2f} GHz)"
+
+
+class Duration(Metric):
+    """
+    A duration in seconds, displayed like "2d 3h 15m".
+    """
+
+    def __init__(self, seconds):
+        self.seconds = seconds
+
+    def to_json(self):
+        return {'seconds': int(self.seconds)}
+
+    def __str__(self):
+        return format_duration(self.seconds)
+
+
+class PackageCounts(Metric):
+    """
+    Installed package counts per package manager, displayed like "1843 (pacman), 12 (flatpak)".
+    """
+
+    def __init__(self, counts):
+        self.counts = list(counts)
+
+    def to_json(self):
+        return {manager: count for manager, count in self.counts}
+
+    def __str__(self):
+        return ", ".join(f"{count} ({manager})" for manager, count in self.counts)
+
+
+class Program(Metric):
+    """
+    A running program and its version, displayed like "bash 5.2.26".
+    """
+
+    def __init__(self, name, version=None):
+        self.name = name
+        self.version = version
+
+    def to_json(self):
+        return {'name': self.name, 'version': self.version}
+
+    def __str__(self):
+        return f"{self.name} {self.version}" if self.version else self.name
+
+
+class TerminalInfo(Program):
+    """
+    The terminal emulator and the multiplexer running inside it, displayed like
+    "Alacritty 0.13.2 (tmux 3.4)". Either one may be unknown.
+    """
+
+    def __init__(self, name, version=None, multiplexer=None):
+        super().__init__(name, version)
+        self.multiplexer = multiplexer
+
+    def to_json(self):
+        data = super().to_json()
+        data['multiplexer'] = self.multiplexer.to_json() if self.multiplexer else None
+        return data
+
+    def __str__(self):
+        if not self.name:
+            return str(self.multiplexer)
+        text = super().__str__()
+        return f"{text} ({self.multiplexer})" if self.multiplexer else text
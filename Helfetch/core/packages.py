@@ -0,0 +1,173 @@
+# core/packages.py
+
+# Package counting backends. Each backend counts installed packages by reading
+# the package manager's database directly (no 'pacman -Qq' or 'dpkg -l' forks),
+# and is memoized on the modification time of that database.
+
+import os
+
+from utils.cache import cached
+from utils.helpers import host_path
+
+PACMAN_LOCAL_DB = host_path('/var/lib/pacman/local')
+DPKG_STATUS = host_path('/var/lib/dpkg/status')
+
+
+def _flatpak_dirs():
+    return [
+        host_path('/var/lib/flatpak/app'),
+        host_path('/var/lib/flatpak/runtime'),
+        os.path.expanduser('~/.local/share/flatpak/app'),
+        os.path.expanduser('~/.local/share/flatpak/runtime'),
+    ]
+
+
+def _pip_dirs():
+    import sysconfig
+    return [sysconfig.get_paths()['purelib']]
+
+
+def _count_dirs(path):
+    """
+    Counts the subdirectories of 'path', or returns None if it doesn't exist.
+    """
+    try:
+        with os.scandir(path) as it:
+            return sum(1 for entry in it if entry.is_dir(follow_symlinks=False))
+    except OSError:
+        return None
+
+
+def count_pacman():
+    """
+    Counts the entries in pacman's local database (one directory per package).
+    """
+    return _count_dirs(PACMAN_LOCAL_DB)
+
+
+def count_dpkg():
+    """
+    Counts the installed packages listed in dpkg's status file.
+    """
+    count = 0
+    try:
+        with open(DPKG_STATUS, 'rb') as f:
+            for line in f:
+                if line.startswith(b'Status: ') and line.rstrip().endswith(b' installed'):
+                    count += 1
+    except OSError:
+        return None
+    return count
+
+
+def count_flatpak():
+    """
+    Counts the installed Flatpak applications and runtimes (system-wide and per-user).
+    """
+    counts = [_count_dirs(path) for path in _flatpak_dirs()]
+    counts = [count for count in counts if count is not None]
+    return sum(counts) if counts else None
+
+
+def count_pip():
+    """
+    Counts the Python distributions installed in the interpreter's site-packages.
+    """
+    count = 0
+    try:
+        with os.scandir(_pip_dirs()[0]) as it:
+            for entry in it:
+                if entry.name.endswith(('.dist-info', '.egg-info')):
+                    count += 1
+    except OSError:
+        return None
+    return count
+
+
+# name -> (counter, function returning the paths whose mtime invalidates the count)
+BACKENDS = {
+    'pacman': (count_pacman, lambda: [PACMAN_LOCAL_DB]),
+    'dpkg': (count_dpkg, lambda: [DPKG_STATUS]),
+    'flatpak': (count_flatpak, _flatpak_dirs),
+    'pip': (count_pip, _pip_dirs),
+}
+
+
+def count_packages(managers):
+    """
+    Counts the installed packages for each of the given package managers.
+
+    Args:
+        managers (list): Backend names from BACKENDS, in display order.
+
+    Returns:
+        list: (manager, count) tuples for the managers that are present and have packages.
+    """
+    counts = []
+    for manager in managers:
+        if manager not in BACKENDS:
+            continue
+        counter, paths = BACKENDS[manager]
+        count = cached(f'packages:{manager}', ('mtime', *paths()), counter)
+        if count:
+            counts.append((manager, count))
+    return counts
+
+
+_pacman_listing = (None, [])
+
+
+def _pacman_entries():
+    # One directory listing per database change, shared by all version lookups.
+    global _pacman_listing
+    try:
+        mtime = os.stat(PACMAN_LOCAL_DB).st_mtime_ns
+        if _pacman_listing[0] != mtime:
+            _pacman_listing = (mtime, os.listdir(PACMAN_LOCAL_DB))
+    except OSError:
+        return []
+    return _pacman_listing[1]
+
+
+def _pacman_version(package):
+    # Local database entries are named NAME-VERSION-RELEASE, e.g. "bash-5.2.026-2".
+    prefix = package + '-'
+    for name in _pacman_entries():
+        if name.startswith(prefix) and name.count('-') - package.count('-') == 2:
+            return name[len(prefix):].rsplit('-', 1)[0]
+    return None
+
+
+def _dpkg_version(package):
+    wanted = f"Package: {package}\n".encode()
+    try:
+        with open(DPKG_STATUS, 'rb') as f:
+            in_package = False
+            for line in f:
+                if line.startswith(b'Package: '):
+                    in_package = line == wanted
+                elif in_package and line.startswith(b'Version: '):
+                    version = line[9:].strip().decode('utf-8', 'replace')
+                    version = version.split(':', 1)[-1]          # epoch
+                    return version.rsplit('-', 1)[0] if '-' in version else version # Debian revision
+    except OSError:
+        pass
+    return None
+
+
+def installed_version(package):
+    """
+    Returns the upstream version of an installed pacman or dpkg package (without
+    the package release), or None. Read from the package database, not by running
+    the program, and memoized on the database's modification time.
+    """
+    for database, lookup in ((PACMAN_LOCAL_DB, _pacman_version), (DPKG_STATUS, _dpkg_version)):
+        if os.path.exists(database):
+            return cached(f'version:{package}', ('mtime', database), lambda: lookup(package))
+    return None
+
+
+# For testing this module independently
+if __name__ == "__main__":
+    print(count_packages(list(BACKENDS)))
+    print(f"bash {installed_version('bash')}")
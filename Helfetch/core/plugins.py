@@ -0,0 +1,296 @@
+# core/plugins.py
+
+# Third-party info modules. A plugin is a Python module that looks like the
+# built-in ones (core/system_info.py, ...), plus a few declarations:
+#
+#     # ~/.config/helfetch/modules/cluster.py
+#     FIELDS = ['Cluster Role', 'Last Deploy']  # optional if the PROBES keys are literals
+#     COST = 'cheap'                            # 'cheap', 'normal' or 'expensive'
+#     TTL = 300                                 # optional, see below
+#
+#     def _probe_role(): ...
+#     def _probe_deploy(): ...
+#
+#     PROBES = {'Cluster Role': _probe_role, 'Last Deploy': _probe_deploy}
+#
+# Plugins are found in $XDG_CONFIG_HOME/helfetch/modules/*.py and in the
+# 'helfetch.modules' entry point group of installed packages. Their declarations
+# are read with 'ast' without running them (a plugin whose fields can't be read
+# that way is skipped with a warning), and the result is cached until a
+# plugin file or the installed packages change (listing entry points alone
+# takes tens of milliseconds). A plugin is only imported when one of its fields
+# is requested, and then on the collector thread, under its own time budget.
+#
+# COST picks the default time budget (DEFAULT_PLUGIN_COSTS); DEFAULT_TIMEOUTS
+# can override it per plugin name. TTL is how long a result stays valid:
+#   - None (default): collected on every run, not refreshed by watch mode
+#   - seconds: cached that long (as text) and refreshed by watch mode; 0 means always live
+#
+# A plugin can only fill the fields it declares and can't replace built-in
+# fields; anything it raises (even SystemExit) only turns its own fields into N/A.
+
+import ast
+import importlib
+import importlib.util
+import os
+import sys
+import threading
+
+from config.default_config import DEFAULT_PLUGIN_COSTS
+from utils import cache, profiler
+
+ENTRY_POINT_GROUP = 'helfetch.modules'
+
+# Module name prefix of the plugins loaded from files, in sys.modules.
+FILE_MODULE_PREFIX = 'helfetch_plugins'
+
+_lock = threading.Lock()
+_manifests = None
+_modules = {}
+_import_locks = {}
+
+
+def plugin_dir():
+    """
+    Returns the plugin directory ($XDG_CONFIG_HOME/helfetch/modules).
+    """
+    base = os.getenv('XDG_CONFIG_HOME') or os.path.expanduser('~/.config')
+    return os.path.join(base, 'helfetch', 'modules')
+
+
+def _plugin_files():
+    directory = plugin_dir()
+    try:
+        names = sorted(name for name in os.listdir(directory) if name.endswith('.py') and not name.startswith('_'))
+    except OSError:
+        return []
+    return [os.path.join(directory, name) for name in names]
+
+
+def read_declarations(path):
+    """
+    Reads a plugin's FIELDS, COST and TTL from its source without running it.
+
+    Returns:
+        dict: {'fields', 'cost', 'ttl'}, or None if the fields can't be determined
+              statically (e.g. PROBES is built at import time without a FIELDS list).
+    """
+    try:
+        with open(path, 'rb') as f:
+            tree = ast.parse(f.read(), filename=path)
+    except (OSError, SyntaxError, ValueError):
+        return None
+
+    assignments = {}
+    for node in tree.body:
+        if isinstance(node, ast.Assign) and len(node.targets) == 1 and isinstance(node.targets[0], ast.Name):
+            assignments[node.targets[0].id] = node.value
+        elif isinstance(node, ast.AnnAssign) and isinstance(node.target, ast.Name) and node.value is not None:
+            assignments[node.target.id] = node.value
+
+    def literal(name, default=None):
+        try:
+            return ast.literal_eval(assignments[name]) if name in assignments else default
+        except ValueError:
+            return default
+
+    fields = literal('FIELDS')
+    if fields is None and isinstance(assignments.get('PROBES'), ast.Dict):
+        # The PROBES keys are literals even though the values are functions.
+        fields = []
+        for key in assignments['PROBES'].keys:
+            try:
+                value = ast.literal_eval(key)
+            except ValueError:
+                return None
+            fields.extend(value if isinstance(value, tuple) else (value,))
+    if not fields:
+        return None
+    return {'fields': list(fields), 'cost': literal('COST', 'normal'), 'ttl': literal('TTL')}
+
+
+def _skip(name, source):
+    """
+    Warns about a plugin whose fields can't be read statically. Importing it to
+    find out would run arbitrary code on the main thread, outside any time budget.
+    """
+    message = f"plugin {name} ({source}) skipped: declare its fields with a literal FIELDS list"
+    profiler.note_failure(message)
+    print(f"helfetch: {message}", file=sys.stderr)
+
+
+def _entry_points():
+    from importlib.metadata import entry_points
+    try:
+        return list(entry_points(group=ENTRY_POINT_GROUP))
+    except TypeError:
+        return list(entry_points().get(ENTRY_POINT_GROUP, [])) # Python < 3.10
+
+
+def _module_source(entry_point, module_name):
+    """
+    Returns the source file of an entry point's module without importing it (finding
+    a submodule's spec would import its parent packages), or None.
+    """
+    parts = module_name.split('.')
+    candidates = ['/'.join(parts) + '.py', '/'.join(parts + ['__init__.py'])]
+    dist = getattr(entry_point, 'dist', None) # Python >= 3.10
+    for file in (getattr(dist, 'files', None) or []):
+        if file.as_posix() in candidates:
+            return str(dist.locate_file(file))
+    for base in sys.path:
+        for candidate in candidates:
+            path = os.path.join(base or os.curdir, *candidate.split('/'))
+            if os.path.isfile(path):
+                return path
+    return None
+
+
+def _scan():
+    """
+    Finds all plugins and reads their declarations.
+
+    Returns:
+        list: One dict per plugin: {'name', 'path' or 'module', 'fields', 'cost', 'ttl'}.
+    """
+    manifests = []
+    for path in _plugin_files():
+        name = os.path.basename(path)[:-3]
+        declarations = read_declarations(path)
+        if declarations is None:
+            _skip(name, path)
+            continue
+        manifests.append({'name': name, 'path': path, **declarations})
+
+    try:
+        entry_points = _entry_points()
+    except Exception as e:
+        profiler.note_failure(f"plugin entry points: {type(e).__name__}: {e}")
+        entry_points = []
+    for entry_point in entry_points:
+        module_name = entry_point.value.partition(':')[0].strip()
+        try:
+            source = _module_source(entry_point, module_name)
+        except Exception as e:
+            profiler.note_failure(f"plugin {entry_point.name}: {type(e).__name__}: {e}")
+            continue
+        declarations = read_declarations(source) if source else None
+        if declarations is None:
+            _skip(entry_point.name, source or module_name)
+            continue
+        manifests.append({'name': entry_point.name, 'module': module_name, **declarations})
+    return manifests
+
+
+def discover():
+    """
+    Returns the manifests of all installed plugins (see _scan()), cached until
+    a plugin file or an entry on sys.path changes.
+    """
+    global _manifests
+    with _lock:
+        if _manifests is not None:
+            return _manifests
+    files = _plugin_files()
+    paths = [plugin_dir()] + files + [path for path in sys.path if path and os.path.isdir(path)]
+    manifests = cache.cached('plugins', ('mtime',) + tuple(paths), _scan)
+    with _lock:
+        _manifests = manifests
+    return manifests
+
+
+def _import_file(name, path):
+    module_name = f"{FILE_MODULE_PREFIX}.{name}"
+    spec = importlib.util.spec_from_file_location(module_name, path)
+    if spec is None:
+        raise ImportError(f"can't load {path}")
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    sys.modules[module_name] = module
+    return module
+
+
+def load(manifest):
+    """
+    Imports a plugin on first use and returns its module.
+    """
+    name = manifest['name']
+    with _lock:
+        module = _modules.get(name)
+        if module is not None:
+            return module
+        import_lock = _import_locks.setdefault(name, threading.Lock())
+    # A slow import holds up this plugin's later collections only, not the other plugins.
+    with import_lock:
+        with _lock:
+            if name in _modules:
+                return _modules[name]
+        if 'path' in manifest:
+            module = _import_file(name, manifest['path'])
+        else:
+            module = importlib.import_module(manifest['module'])
+        with _lock:
+            _modules[name] = module
+    return module
+
+
+def budget(manifest):
+    """
+    Returns the default time budget of a plugin in seconds, from its cost class.
+    """
+    return DEFAULT_PLUGIN_COSTS.get(manifest.get('cost'), DEFAULT_PLUGIN_COSTS['normal'])
+
+
+def _clean(value):
+    # Plugins may return text, numbers or typed metrics (core/metrics.py).
+    if value is None:
+        return 'N/A'
+    if isinstance(value, (str, int, float, bool)) or hasattr(value, 'to_json'):
+        return value
+    return str(value)
+
+
+def collector(manifest, fields):
+    """
+    Returns a scheduler collector function for the requested fields of a plugin.
+    It returns None (so the fields show as N/A, or their stale value) if the
+    plugin can't be imported or fails.
+    """
+    declared = manifest['fields']
+    ttl = manifest.get('ttl')
+
+    def compute(wanted):
+        collected = {}
+        for key, probe in getattr(load(manifest), 'PROBES', {}).items():
+            names = key if isinstance(key, tuple) else (key,)
+            if any(name in wanted for name in names):
+                collected.update(probe() if isinstance(key, tuple) else {key: probe()})
+        return {field: _clean(collected.get(field)) for field in wanted}
+
+    def compute_cached():
+        # Cached entries are stored as JSON, so typed values are kept as their text.
+        values = compute(declared)
+        return {field: value if isinstance(value, (str, int, float, bool)) else str(value)
+                for field, value in values.items()}
+
+    def run():
+        try:
+            if ttl is not None:
+                values = cache.cached(tuple(declared), ('ttl', ttl), compute_cached)
+            else:
+                values = compute(fields)
+        except BaseException as e:
+            profiler.note_failure(f"{type(e).__name__}: {e}")
+            return None
+        return {field: values.get(field, 'N/A') for field in fields}
+
+    # The whole plugin (import included) is one row of --profile.
+    return lambda: profiler.call(f"plugin:{manifest['name']}", run)
+
+
+# For testing this module independently
+if __name__ == "__main__":
+    print(f"Plugin directory: {plugin_dir()}")
+    for manifest in _scan():
+        source = manifest.get('path') or manifest.get('module')
+        print(f"{manifest['name']} ({source}): fields={manifest['fields']} cost={manifest['cost']} ttl={manifest['ttl']}")
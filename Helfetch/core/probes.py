@@ -0,0 +1,329 @@
+# core/probes.py
+
+# Native probes that read the kernel's interfaces (/proc, /sys, statvfs) directly
+# instead of forking tools like 'free', 'df', 'lspci', 'uptime' or 'ip'.
+# They return raw numbers (bytes, seconds); formatting is left to the callers.
+# The socket modules are only imported by the network probes that use them.
+
+import os
+
+from utils.helpers import host_path
+
+PCI_DEVICES_DIR = host_path('/sys/bus/pci/devices')
+PCI_IDS_PATHS = [host_path('/usr/share/hwdata/pci.ids'), host_path('/usr/share/misc/pci.ids')]
+
+# PCI class 0x03xx is "Display controller" (VGA, XGA, 3D, other).
+PCI_DISPLAY_CLASS = '0x03'
+
+SIOCGIFADDR = 0x8915
+
+# Filesystems on block devices that aren't "real" storage (snap/AppImage images, ISOs).
+IGNORED_FS_TYPES = {'squashfs', 'iso9660', 'udf'}
+# Filesystems that don't have a /dev source but hold real data.
+NON_DEVICE_FS_TYPES = {'zfs', 'nfs', 'nfs4', 'cifs', 'smb3', 'virtiofs', '9p'}
+
+
+def read_meminfo():
+    """
+    Reads /proc/meminfo.
+
+    Returns:
+        dict: Field name -> size in bytes (e.g. {'MemTotal': 16669179904, ...}),
+              or an empty dict if /proc/meminfo is unavailable.
+    """
+    meminfo = {}
+    try:
+        with open(host_path('/proc/meminfo'), 'r') as f:
+            for line in f:
+                name, _, rest = line.partition(':')
+                parts = rest.split()
+                if parts:
+                    value = int(parts[0])
+                    if len(parts) > 1 and parts[1] == 'kB':
+                        value *= 1024
+                    meminfo[name] = value
+    except (OSError, ValueError):
+        pass
+    return meminfo
+
+
+def memory_usage():
+    """
+    Returns the (used, total) memory in bytes, computed the same way as 'free'
+    (used = MemTotal - MemAvailable), or None if unavailable.
+    """
+    meminfo = read_meminfo()
+    total = meminfo.get('MemTotal')
+    if not total:
+        return None
+    available = meminfo.get('MemAvailable')
+    if available is None:
+        # Kernels older than 3.14 have no MemAvailable.
+        available = meminfo.get('MemFree', 0) + meminfo.get('Buffers', 0) + meminfo.get('Cached', 0)
+    return total - available, total
+
+
+def disk_usage(path='/'):
+    """
+    Returns the (used, total, available) space of the filesystem holding 'path'
+    in bytes, using os.statvfs, or None if it can't be queried.
+    """
+    try:
+        st = os.statvfs(path)
+    except OSError:
+        return None
+    total = st.f_blocks * st.f_frsize
+    used = (st.f_blocks - st.f_bfree) * st.f_frsize
+    available = st.f_bavail * st.f_frsize
+    return used, total, available
+
+
+def _unescape_mount_path(path):
+    # mountinfo escapes space, tab, newline and backslash as octal (e.g. '\040' for a space).
+    if '\\' not in path:
+        return path
+    for escaped, char in (('\\040', ' '), ('\\011', '\t'), ('\\012', '\n'), ('\\134', '\\')):
+        path = path.replace(escaped, char)
+    return path
+
+
+def real_mounts():
+    """
+    Lists the mounted real filesystems from /proc/self/mountinfo: block devices
+    (except loop devices and image filesystems) and network/ZFS filesystems.
+    Each filesystem is listed once, at its first mount point (bind mounts and
+    btrfs subvolumes of the same device are skipped).
+
+    Returns:
+        list: (mount_point, fs_type, source) tuples, in mount order.
+    """
+    mounts = []
+    seen = set()
+    try:
+        with open(host_path('/proc/self/mountinfo'), 'r') as f:
+            for line in f:
+                # ID PARENT MAJOR:MINOR ROOT MOUNT_POINT OPTIONS [OPTIONAL...] - FS_TYPE SOURCE SUPER_OPTIONS
+                left, sep, right = line.partition(' - ')
+                if not sep:
+                    continue
+                fields = left.split()
+                extra = right.split()
+                if len(fields) < 5 or len(extra) < 2:
+                    continue
+                fs_type, source = extra[0], extra[1]
+                if fs_type in IGNORED_FS_TYPES:
+                    continue
+                if source.startswith('/dev/'):
+                    if source.startswith('/dev/loop'):
+                        continue
+                elif fs_type not in NON_DEVICE_FS_TYPES:
+                    continue
+                if source in seen:
+                    continue
+                seen.add(source)
+                mounts.append((_unescape_mount_path(fields[4]), fs_type, source))
+    except OSError:
+        return []
+    return mounts
+
+
+def mounted_disk_usage():
+    """
+    Returns the usage of every real filesystem (see real_mounts()).
+
+    Returns:
+        list: (mount_point, fs_type, used, total, available) tuples, sizes in bytes.
+              Filesystems that can't be queried or are empty are left out.
+    """
+    usage = []
+    for mount_point, fs_type, _ in real_mounts():
+        disk = disk_usage(mount_point)
+        if disk and disk[1] > 0:
+            usage.append((mount_point, fs_type) + disk)
+    return usage
+
+
+def read_uptime():
+    """
+    Returns the system uptime in seconds from /proc/uptime, or None.
+    """
+    try:
+        with open(host_path('/proc/uptime'), 'r') as f:
+            return float(f.readline().split()[0])
+    except (OSError, ValueError, IndexError):
+        return None
+
+
+def _read_sysfs(path):
+    try:
+        with open(path, 'r') as f:
+            return f.read().strip()
+    except OSError:
+        return None
+
+
+def _lookup_pci_names(wanted):
+    """
+    Resolves (vendor, device) ID pairs to names using the pci.ids database.
+
+    Args:
+        wanted (set): A set of (vendor_id, device_id) tuples as 4-digit lowercase hex strings.
+
+    Returns:
+        dict: (vendor_id, device_id) -> (vendor_name, device_name or None).
+    """
+    names = {}
+    vendors = {vendor for vendor, _ in wanted}
+    for path in PCI_IDS_PATHS:
+        try:
+            f = open(path, 'r', encoding='utf-8', errors='replace')
+        except OSError:
+            continue
+        with f:
+            vendor = None
+            vendor_name = None
+            for line in f:
+                if line.startswith('#') or not line.strip():
+                    continue
+                if line.startswith('C '):
+                    break # The device classes section comes after all vendors.
+                if not line.startswith('\t'):
+                    if vendor in vendors:
+                        vendors.discard(vendor)
+                        if not vendors:
+                            break
+                    vendor = line[:4]
+                    vendor_name = line[4:].strip()
+                    for key in wanted:
+                        if key[0] == vendor:
+                            names.setdefault(key, (vendor_name, None))
+                elif vendor in vendors and not line.startswith('\t\t'):
+                    key = (vendor, line[1:5])
+                    if key in wanted:
+                        names[key] = (vendor_name, line[5:].strip())
+        break
+    return names
+
+
+def list_gpus():
+    """
+    Lists display controllers from /sys/bus/pci/devices, named using pci.ids.
+
+    Returns:
+        list: Human-readable GPU descriptions (e.g. "NVIDIA Corporation GA106 [GeForce RTX 3060]").
+    """
+    try:
+        entries = sorted(os.scandir(PCI_DEVICES_DIR), key=lambda entry: entry.name)
+    except OSError:
+        return []
+
+    ids = []
+    for entry in entries:
+        pci_class = _read_sysfs(os.path.join(entry.path, 'class'))
+        if not pci_class or not pci_class.startswith(PCI_DISPLAY_CLASS):
+            continue
+        vendor = _read_sysfs(os.path.join(entry.path, 'vendor'))
+        device = _read_sysfs(os.path.join(entry.path, 'device'))
+        if vendor and device:
+            ids.append((vendor[2:].lower(), device[2:].lower()))
+
+    names = _lookup_pci_names(set(ids)) if ids else {}
+    gpus = []
+    for key in ids:
+        vendor_name, device_name = names.get(key, (None, None))
+        if vendor_name and device_name:
+            gpus.append(f"{vendor_name} {device_name}")
+        elif vendor_name:
+            gpus.append(f"{vendor_name} [{key[1]}]")
+        else:
+            gpus.append(f"[{key[0]}:{key[1]}]")
+    return gpus
+
+
+def default_route_interface():
+    """
+    Returns the interface of the IPv4 default route with the lowest metric,
+    read from /proc/net/route, or None if there is no default route.
+    """
+    best = None
+    try:
+        with open(host_path('/proc/net/route'), 'r') as f:
+            next(f, None) # Skip the header line
+            for line in f:
+                parts = line.split()
+                # Iface Destination Gateway Flags RefCnt Use Metric Mask ...
+                if len(parts) >= 8 and parts[1] == '00000000' and parts[7] == '00000000':
+                    metric = int(parts[6])
+                    if best is None or metric < best[0]:
+                        best = (metric, parts[0])
+    except (OSError, ValueError):
+        return None
+    return best[1] if best else None
+
+
+def has_default_route():
+    """
+    Returns True if there is an IPv4 or IPv6 default route, i.e. a chance to reach
+    the internet, read from /proc/net/route and /proc/net/ipv6_route.
+    """
+    if default_route_interface():
+        return True
+    try:
+        with open(host_path('/proc/net/ipv6_route'), 'r') as f:
+            for line in f:
+                parts = line.split()
+                # Destination PrefixLen Source SourcePrefixLen NextHop Metric RefCnt Use Flags Iface
+                # (the kernel's unreachable default routes live on 'lo')
+                if len(parts) >= 10 and parts[1] == '00' and parts[9] != 'lo' and not parts[0].strip('0'):
+                    return True
+    except OSError:
+        pass
+    return False
+
+
+def interface_ipv4(interface):
+    """
+    Returns the IPv4 address of a network interface using the SIOCGIFADDR ioctl, or None.
+    """
+    import fcntl
+    import socket
+    import struct
+    try:
+        with socket.socket(socket.AF_INET, socket.SOCK_DGRAM) as s:
+            request = struct.pack('256s', interface.encode()[:15])
+            result = fcntl.ioctl(s.fileno(), SIOCGIFADDR, request)
+            return socket.inet_ntoa(result[20:24])
+    except OSError:
+        return None
+
+
+def local_ip():
+    """
+    Returns the local IPv4 address used for the default route, or None.
+    """
+    interface = default_route_interface()
+    if interface:
+        address = interface_ipv4(interface)
+        if address:
+            return address
+    import socket
+    # Fallback: let the kernel pick the source address for a public destination.
+    # Connecting a UDP socket doesn't send any packets.
+    try:
+        with socket.socket(socket.AF_INET, socket.SOCK_DGRAM) as s:
+            s.connect(("8.8.8.8", 80))
+            return s.getsockname()[0]
+    except OSError:
+        return None
+
+
+# For testing this module independently
+if __name__ == "__main__":
+    print(f"Memory (used, total): {memory_usage()}")
+    print(f"Disk (used, total, available): {disk_usage('/')}")
+    print(f"Mounted filesystems: {mounted_disk_usage()}")
+    print(f"Uptime (seconds): {read_uptime()}")
+    print(f"GPUs: {list_gpus()}")
+    print(f"Default route interface: {default_route_interface()}")
+    print(f"Has a default route: {has_default_route()}")
+    print(f"Local IP: {local_ip()}")
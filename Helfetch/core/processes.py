@@ -0,0 +1,183 @@
+# core/processes.py
+
+# A shared snapshot of the process table (pid, parent pid, owner, name and, on
+# demand, the command line), used by the shell/terminal detection
+# (core/terminal.py) and the window manager scan (core/wm.py) instead of each
+# of them reading /proc on its own.
+#
+# A process is read from /proc/PID/stat (which has both the name and the parent
+# pid) the first time it is needed, so walking up from helfetch to its terminal
+# costs a handful of reads. Probes that need every process call all_pids(),
+# which fills the rest of the table with a single os.scandir() pass; later
+# lookups are served from it. The rows are kept in parallel arrays.
+
+import os
+import threading
+import time
+from array import array
+
+from utils.helpers import host_path
+
+PROC_DIR = host_path('/proc')
+
+# How long a snapshot is reused, in seconds (matters for watch mode and helfetchd).
+SNAPSHOT_MAX_AGE = 2.0
+
+_lock = threading.Lock()
+_snapshot = None
+
+
+def _read_stat(path):
+    """
+    Returns (parent pid, name) from a /proc/PID/stat file, or None.
+    """
+    try:
+        with open(path, 'rb') as f:
+            data = f.read()
+    except OSError:
+        return None
+    # "PID (name) STATE PPID ..."; the name may itself contain spaces and parentheses.
+    start = data.find(b'(')
+    end = data.rfind(b')')
+    if start < 0 or end < 0:
+        return None
+    try:
+        ppid = int(data[end + 2:].split(b' ', 2)[1])
+    except (IndexError, ValueError):
+        return None
+    return ppid, data[start + 1:end].decode('utf-8', 'replace')
+
+
+class ProcessTable:
+    """
+    Process rows in parallel arrays, indexed by pid. Thread-safe.
+    """
+
+    def __init__(self):
+        self.created = time.monotonic()
+        self.pids = array('l')
+        self.ppids = array('l')
+        self.uids = array('l')
+        self.names = []
+        self.rows = {}        # pid -> row (-1: the process doesn't exist)
+        self.cmdlines = {}    # pid -> argv, read on demand
+        self.complete = False # True once every process has been read
+        self._lock = threading.RLock()
+
+    def _add(self, pid, path):
+        stat = _read_stat(os.path.join(path, 'stat'))
+        if stat is None:
+            self.rows[pid] = -1 # It exited; remember that too
+            return -1
+        try:
+            uid = os.stat(path).st_uid
+        except OSError:
+            uid = -1
+        self.rows[pid] = len(self.pids)
+        self.pids.append(pid)
+        self.ppids.append(stat[0])
+        self.uids.append(uid)
+        self.names.append(stat[1])
+        return self.rows[pid]
+
+    def _row(self, pid):
+        with self._lock:
+            row = self.rows.get(pid)
+            if row is None:
+                row = -1 if self.complete else self._add(pid, os.path.join(PROC_DIR, str(pid)))
+            return row
+
+    def exists(self, pid):
+        return self._row(pid) >= 0
+
+    def name(self, pid):
+        row = self._row(pid)
+        return self.names[row] if row >= 0 else None
+
+    def parent(self, pid):
+        row = self._row(pid)
+        return self.ppids[row] if row >= 0 else None
+
+    def uid(self, pid):
+        row = self._row(pid)
+        return self.uids[row] if row >= 0 else None
+
+    def cmdline(self, pid):
+        """
+        Returns the argument list of a process (empty for kernel threads or if it exited).
+        """
+        with self._lock:
+            if pid in self.cmdlines:
+                return self.cmdlines[pid]
+        try:
+            with open(os.path.join(PROC_DIR, str(pid), 'cmdline'), 'rb') as f:
+                argv = [arg.decode('utf-8', 'replace') for arg in f.read().split(b'\0') if arg]
+        except OSError:
+            argv = []
+        with self._lock:
+            self.cmdlines[pid] = argv
+        return argv
+
+    def ancestors(self, pid):
+        """
+        Yields the parent, grandparent, ... of a process, up to (not including) pid 0.
+        """
+        seen = {pid}
+        pid = self.parent(pid)
+        while pid and pid not in seen:
+            seen.add(pid)
+            yield pid
+            pid = self.parent(pid)
+
+    def all_pids(self, uid=None):
+        """
+        Returns the pids of every process (of one user, if 'uid' is given),
+        reading the processes not seen yet in one pass over /proc.
+        """
+        with self._lock:
+            if not self.complete:
+                try:
+                    with os.scandir(PROC_DIR) as entries:
+                        for entry in entries:
+                            if entry.name.isdigit() and int(entry.name) not in self.rows:
+                                self._add(int(entry.name), entry.path)
+                except OSError:
+                    pass
+                self.complete = True
+            if uid is None:
+                return self.pids.tolist()
+            return [pid for pid, owner in zip(self.pids, self.uids) if owner == uid]
+
+
+def self_pid():
+    """
+    Returns the pid of this process as seen in PROC_DIR (a recorded one under HELFETCH_ROOT).
+    """
+    try:
+        with open(os.path.join(PROC_DIR, 'self', 'stat'), 'rb') as f:
+            return int(f.read().split(b' ', 1)[0])
+    except (OSError, ValueError):
+        return os.getpid()
+
+
+def snapshot(max_age=SNAPSHOT_MAX_AGE):
+    """
+    Returns the shared process table, starting a new one when it is older than 'max_age' seconds.
+    """
+    global _snapshot
+    with _lock:
+        if _snapshot is None or time.monotonic() - _snapshot.created > max_age:
+            _snapshot = ProcessTable()
+        return _snapshot
+
+
+# For testing this module independently
+if __name__ == "__main__":
+    table = snapshot()
+    pid = self_pid()
+    print(f"This process: {pid} ({table.name(pid)})")
+    for ancestor in table.ancestors(pid):
+        print(f"  <- {ancestor} ({table.name(ancestor)})")
+    start = time.perf_counter()
+    count = len(table.all_pids())
+    print(f"{count} processes, full scan in {(time.perf_counter() - start) * 1000:.2f} ms")
@@ -0,0 +1,264 @@
+# core/sampler.py
+
+# Live resource sampling for watch mode and helfetchd: CPU utilisation from
+# /proc/stat deltas, the load average, the CPU temperature (hwmon or thermal
+# zones) and the current CPU frequency (cpufreq), plus fixed-size, array-backed
+# ring buffers that keep a short history of every sampled field for sparklines.
+#
+# Sensor files are discovered once per process; a sample then reads only the
+# files it needs (one for the temperature, one per CPU for the frequency).
+
+import os
+import threading
+import time
+from array import array
+
+from utils.helpers import host_path
+
+# Seconds between the two /proc/stat reads of a first (one-shot) CPU usage sample.
+FIRST_SAMPLE_WINDOW = 0.1
+
+# Samples kept per field (one sparkline character each).
+HISTORY_SIZE = 20
+
+# hwmon drivers and thermal zone types that measure the CPU, most specific first.
+CPU_HWMON_NAMES = ('coretemp', 'k10temp', 'zenpower', 'cpu_thermal', 'cpu-thermal', 'soc_thermal')
+CPU_THERMAL_TYPES = ('x86_pkg_temp', 'cpu-thermal', 'cpu_thermal', 'soc_thermal', 'soc-thermal', 'acpitz')
+# hwmon labels of the package/die temperature, preferred over single-core sensors.
+CPU_TEMP_LABELS = ('Package id 0', 'Tctl', 'Tdie')
+
+_lock = threading.Lock()
+_previous_stat = None
+_sensor_paths = {}
+
+
+class RingBuffer:
+    """
+    A fixed-size history of float samples stored in a preallocated array.
+    Adding a sample never allocates; the oldest sample is overwritten.
+    """
+
+    def __init__(self, size=HISTORY_SIZE):
+        self.data = array('d', bytes(8 * size))
+        self.size = size
+        self.start = 0
+        self.count = 0
+
+    def push(self, value):
+        self.data[(self.start + self.count) % self.size] = value
+        if self.count < self.size:
+            self.count += 1
+        else:
+            self.start = (self.start + 1) % self.size
+
+    def values(self):
+        """
+        Returns the samples, oldest first.
+        """
+        end = self.start + self.count
+        if end <= self.size:
+            return self.data[self.start:end].tolist()
+        return self.data[self.start:].tolist() + self.data[:end - self.size].tolist()
+
+    def __len__(self):
+        return self.count
+
+
+class History:
+    """
+    One RingBuffer per field, fed with each field's numeric 'sample' (see core/metrics.py).
+    """
+
+    def __init__(self, size=HISTORY_SIZE):
+        self.size = size
+        self.buffers = {}
+
+    def record(self, info_data):
+        for field, value in info_data.items():
+            sample = getattr(value, 'sample', None)
+            if sample is None:
+                continue
+            buffer = self.buffers.get(field)
+            if buffer is None:
+                buffer = self.buffers[field] = RingBuffer(self.size)
+            buffer.push(sample)
+
+    def get(self, field):
+        return self.buffers.get(field)
+
+
+def read_cpu_times():
+    """
+    Reads the busy and total jiffies of all CPUs and of each core from /proc/stat.
+
+    Returns:
+        tuple: (busy, total) arrays; index 0 is the aggregate line, 1.. the cores.
+               Empty arrays if /proc/stat can't be read.
+    """
+    busy = array('d')
+    total = array('d')
+    try:
+        with open(host_path('/proc/stat'), 'rb') as f:
+            for line in f:
+                if not line.startswith(b'cpu'):
+                    break # The cpu lines come first.
+                # cpu user nice system idle iowait irq softirq steal [guest guest_nice]
+                # (guest time is already included in user/nice)
+                values = [int(value) for value in line.split()[1:9]]
+                all_time = sum(values)
+                idle = values[3] + (values[4] if len(values) > 4 else 0)
+                busy.append(all_time - idle)
+                total.append(all_time)
+    except (OSError, ValueError):
+        return array('d'), array('d')
+    return busy, total
+
+
+def cpu_usage():
+    """
+    Returns the CPU utilisation since the previous call, in percent.
+    The first call measures over FIRST_SAMPLE_WINDOW seconds.
+
+    Returns:
+        tuple: (overall, [per core]), or None if /proc/stat is unavailable.
+    """
+    global _previous_stat
+    with _lock:
+        previous = _previous_stat
+    if previous is None:
+        previous = read_cpu_times()
+        time.sleep(FIRST_SAMPLE_WINDOW)
+    current = read_cpu_times()
+    with _lock:
+        _previous_stat = current
+    if not current[1] or len(current[1]) != len(previous[1]):
+        return None
+
+    usage = []
+    for i in range(len(current[1])):
+        elapsed = current[1][i] - previous[1][i]
+        busy = current[0][i] - previous[0][i]
+        usage.append(min(100.0, max(0.0, busy * 100 / elapsed)) if elapsed > 0 else 0.0)
+    return usage[0], usage[1:]
+
+
+def load_average():
+    """
+    Returns the 1, 5 and 15 minute load averages from /proc/loadavg, or None.
+    """
+    try:
+        with open(host_path('/proc/loadavg'), 'r') as f:
+            parts = f.read().split()
+        return float(parts[0]), float(parts[1]), float(parts[2])
+    except (OSError, ValueError, IndexError):
+        return None
+
+
+def _read_line(path):
+    try:
+        with open(path, 'r') as f:
+            return f.readline().strip()
+    except OSError:
+        return None
+
+
+def _find_hwmon_sensor():
+    base = host_path('/sys/class/hwmon')
+    try:
+        entries = sorted(os.scandir(base), key=lambda entry: entry.name)
+    except OSError:
+        return None
+    candidates = {}
+    for entry in entries:
+        name = _read_line(os.path.join(entry.path, 'name'))
+        if name not in CPU_HWMON_NAMES or name in candidates:
+            continue
+        try:
+            inputs = sorted(f for f in os.listdir(entry.path) if f.startswith('temp') and f.endswith('_input'))
+        except OSError:
+            continue
+        if not inputs:
+            continue
+        chosen = inputs[0]
+        for sensor in inputs:
+            label = _read_line(os.path.join(entry.path, sensor.replace('_input', '_label')))
+            if label in CPU_TEMP_LABELS:
+                chosen = sensor
+                break
+        candidates[name] = os.path.join(entry.path, chosen)
+    for name in CPU_HWMON_NAMES:
+        if name in candidates:
+            return candidates[name]
+    return None
+
+
+def _find_thermal_zone():
+    base = host_path('/sys/class/thermal')
+    try:
+        zones = sorted(entry.path for entry in os.scandir(base) if entry.name.startswith('thermal_zone'))
+    except OSError:
+        return None
+    types = {zone: _read_line(os.path.join(zone, 'type')) for zone in zones}
+    for wanted in CPU_THERMAL_TYPES:
+        for zone in zones:
+            if types[zone] == wanted:
+                return os.path.join(zone, 'temp')
+    return os.path.join(zones[0], 'temp') if zones else None
+
+
+def _sensor(kind, find):
+    # Sensor discovery walks /sys, so it's done once per process.
+    with _lock:
+        if kind not in _sensor_paths:
+            _sensor_paths[kind] = find()
+        return _sensor_paths[kind]
+
+
+def cpu_temperature():
+    """
+    Returns the CPU temperature in degrees Celsius (hwmon, else a thermal zone), or None.
+    """
+    path = _sensor('temperature', lambda: _find_hwmon_sensor() or _find_thermal_zone())
+    if not path:
+        return None
+    value = _read_line(path)
+    try:
+        return int(value) / 1000
+    except (TypeError, ValueError):
+        return None
+
+
+def _find_cpufreq_files():
+    base = host_path('/sys/devices/system/cpu')
+    files = []
+    try:
+        for entry in os.scandir(base):
+            if entry.name.startswith('cpu') and entry.name[3:].isdigit():
+                path = os.path.join(entry.path, 'cpufreq', 'scaling_cur_freq')
+                if os.path.exists(path):
+                    files.append(path)
+    except OSError:
+        pass
+    return files
+
+
+def cpu_frequency():
+    """
+    Returns the current average and the highest core frequency in MHz, or None.
+    """
+    values = []
+    for path in _sensor('frequency', _find_cpufreq_files):
+        value = _read_line(path)
+        if value and value.isdigit():
+            values.append(int(value) / 1000) # kHz -> MHz
+    if not values:
+        return None
+    return sum(values) / len(values), max(values)
+
+
+# For testing this module independently
+if __name__ == "__main__":
+    print(f"CPU usage (overall, per core): {cpu_usage()}")
+    print(f"Load average: {load_average()}")
+    print(f"CPU temperature: {cpu_temperature()}")
+    print(f"CPU frequency (average, max): {cpu_frequency()}")
@@ -0,0 +1,73 @@
+# core/scheduler.py
+
+import threading
+import queue
+import time
+
+
+def run_collectors(collectors, fallback=None, on_result=None):
+    """
+    Runs the given collectors concurrently and waits for each one up to its
+    own time budget.
+
+    Every collector runs on a daemon thread, so a collector that never returns
+    (a hung HTTP request, a stuck 'lspci') cannot keep the process alive after
+    the output has been printed.
+
+    Args:
+        collectors (list): A list of (name, func, fields, timeout) tuples. 'func' is called
+                           without arguments and must return a dict. 'fields' lists
+                           the keys the collector normally returns; they are filled
+                           with 'N/A' if the collector misses its 'timeout' (in seconds)
+                           or fails.
+        fallback (callable, optional): Called with a field name when its collector misses
+                                       the deadline; may return a stale value to show instead.
+        on_result (callable, optional): Called with each collector's dict as soon as it
+                                        arrives, on the calling thread (progressive output).
+
+    Returns:
+        dict: The merged information, in the same order as 'collectors'.
+    """
+    results = {}
+    done = queue.Queue()
+
+    def worker(name, func):
+        try:
+            done.put((name, func()))
+        except Exception:
+            done.put((name, None))
+
+    start = time.monotonic()
+    deadlines = {}
+    for name, func, _, timeout in collectors:
+        deadlines[name] = start + timeout
+        threading.Thread(target=worker, args=(name, func), daemon=True).start()
+
+    pending = set(deadlines)
+    while pending:
+        # انتظر حتى أقرب موعد نهائي لم ينتهِ بعد
+        remaining = min(deadlines[name] for name in pending) - time.monotonic()
+        if remaining <= 0:
+            pending = {name for name in pending if deadlines[name] > time.monotonic()}
+            continue
+        try:
+            name, data = done.get(timeout=remaining)
+        except queue.Empty:
+            continue
+        if name in pending:
+            pending.discard(name)
+            if data is not None:
+                results[name] = data
+                if on_result:
+                    on_result(data)
+
+    all_info = {}
+    for name, _, fields, _ in collectors:
+        if name in results:
+            all_info.update(results[name])
+        else:
+            # The collector timed out or failed: show a stale value if there is one.
+            for field in fields:
+                value = fallback(field) if fallback else None
+                all_info[field] = value if value is not None else 'N/A'
+    return all_info
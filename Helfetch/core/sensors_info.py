@@ -0,0 +1,51 @@
+# core/sensors_info.py
+
+# Live CPU readings from core/sampler.py. These fields aren't part of the
+# default output (a first CPU usage sample takes FIRST_SAMPLE_WINDOW seconds);
+# they are shown in watch mode, by helfetchd when asked, or with --fields.
+
+from core import sampler
+from core.fields import run_probes
+from core.metrics import CpuUsage, LoadAverage, Temperature, Frequency
+
+def _probe_cpu_usage():
+    usage = sampler.cpu_usage()
+    if usage is None:
+        return 'N/A'
+    return CpuUsage(*usage)
+
+def _probe_load():
+    load = sampler.load_average()
+    return LoadAverage(*load) if load else 'N/A'
+
+def _probe_cpu_temperature():
+    celsius = sampler.cpu_temperature()
+    return Temperature(celsius) if celsius is not None else 'N/A'
+
+def _probe_cpu_frequency():
+    frequency = sampler.cpu_frequency()
+    return Frequency(*frequency) if frequency else 'N/A'
+
+# Field -> probe, in display order. Probes are only run for the requested fields.
+PROBES = {
+    'CPU Usage': _probe_cpu_usage,
+    'Load': _probe_load,
+    'CPU Temp': _probe_cpu_temperature,
+    'CPU Freq': _probe_cpu_frequency,
+}
+
+def get_sensors_info(fields=None):
+    """
+    Collects live CPU readings: utilisation, load average, temperature and frequency.
+
+    Args:
+        fields (collection, optional): Only collect these fields. Defaults to all of them.
+    """
+    return run_probes(PROBES, fields)
+
+# For testing this module independently
+if __name__ == "__main__":
+    sensors_data = get_sensors_info()
+    print("\n--- Sensors Information ---")
+    for key, value in sensors_data.items():
+        print(f"{key}: {value}")
@@ -1,33 +1,26 @@
 # core/system_info.py
 
-import platform
-import subprocess
 import os
-import re
-import random # استيراد مكتبة random لاختيار الرسائل عشوائيا
 
 # استيراد قائمة الرسائل من ملف quotes.py
 from config.quotes import QUOTES
+from config.default_config import DEFAULT_PACKAGE_MANAGERS
+from core import probes, packages, terminal
+from core.fields import LOCAL, run_probes
+from core.metrics import Duration, PackageCounts, Program, TerminalInfo
+from utils import profiler
+from utils.cache import cached
+from utils.helpers import host_path
 
-def get_system_info():
+OS_RELEASE = host_path('/etc/os-release')
+
+def _read_os_name():
     """
-    Collects basic system-related information.
+    Returns the pretty OS name from /etc/os-release.
     """
-    info = {}
-
-    # 1. User
-    try:
-        info['User'] = os.getlogin()
-    except OSError:
-        info['User'] = os.getenv('USER') or os.getenv('USERNAME') or 'N/A'
-
-    # 2. Host
-    info['Host'] = platform.node()
-
-    # 3. OS
     os_name = 'N/A'
     try:
-        with open('/etc/os-release', 'r') as f:
+        with open(OS_RELEASE, 'r') as f:
             for line in f:
                 if line.startswith('PRETTY_NAME='):
                     os_name = line.strip().split('=')[1].strip('"')
@@ -36,77 +29,82 @@ def get_system_info():
             os_name = os_name.replace("Arch Linux", "Helwan Linux")
             # يمكنك إضافة إصدار مخصص لـ Helwan Linux هنا
             # os_name += " (Ver. 1.0 'Phoenix')"
-    except FileNotFoundError:
+    except FileNotFoundError as e:
+        profiler.note_failure(f"{type(e).__name__}: {e}")
+        import platform
         os_name = platform.system()
         if os_name == "Windows":
             os_name = "Windows"
-    info['OS'] = os_name
-
-    # 4. Kernel
-    info['Kernel'] = platform.release()
+    return os_name
 
-    # 5. Uptime
-    uptime_val = 'N/A'
-    try:
-        result = subprocess.run(['uptime', '-p'], capture_output=True, text=True, check=True)
-        uptime_val = result.stdout.strip().replace('up ', '')
-    except (subprocess.CalledProcessError, FileNotFoundError):
-        try:
-            with open('/proc/uptime', 'r') as f:
-                uptime_seconds = float(f.readline().split()[0])
-                days = int(uptime_seconds // 86400)
-                hours = int((uptime_seconds % 86400) // 3600)
-                minutes = int((uptime_seconds % 3600) // 60)
-                if days > 0:
-                    uptime_val = f"{days}d {hours}h {minutes}m"
-                elif hours > 0:
-                    uptime_val = f"{hours}h {minutes}m"
-                else:
-                    uptime_val = f"{minutes}m"
-        except (FileNotFoundError, ValueError):
-            uptime_val = 'N/A'
-    info['Uptime'] = uptime_val
-
-    # 6. Shell
-    shell_val = 'N/A'
+def _probe_user():
     try:
-        shell_val = os.getenv('SHELL')
-        if shell_val:
-            shell_val = os.path.basename(shell_val)
-    except Exception:
-        pass
-    info['Shell'] = shell_val
-
-    # 7. Terminal
-    terminal_val = 'N/A'
-    try:
-        terminal_val = os.getenv('TERM') or os.getenv('COLORTERM')
-    except Exception:
-        pass
-    info['Terminal'] = terminal_val
-
-    # 8. Packages (Pacman) - This section remains unchanged from previous step
-    packages_val = 'N/A'
-    package_manager = 'N/A'
-    try:
-        pacman_count = subprocess.run(['pacman', '-Qq'], capture_output=True, text=True).stdout.count('\n')
-        if pacman_count > 0:
-            packages_val = str(pacman_count)
-            package_manager = 'Pacman'
-    except (subprocess.CalledProcessError, FileNotFoundError):
-        pass
+        return os.getlogin()
+    except OSError:
+        return os.getenv('USER') or os.getenv('USERNAME') or 'N/A'
 
-    if package_manager != 'N/A':
-        info[f'Packages ({package_manager})'] = packages_val
-    else:
-        info['Packages'] = 'N/A'
+def _probe_os():
+    # Cached until /etc/os-release changes
+    return cached('OS', ('mtime', OS_RELEASE), _read_os_name)
 
-    return info
+def _probe_host():
+    return os.uname().nodename
+
+def _probe_kernel():
+    return os.uname().release
+
+def _probe_uptime():
+    uptime_seconds = probes.read_uptime()
+    return Duration(uptime_seconds) if uptime_seconds is not None else 'N/A'
+
+def _probe_shell(caller=LOCAL):
+    # The shell helfetch (or the helfetchd client) runs in, from the process tree, else the login shell
+    shell = terminal.detect(caller.pid, caller.env)['shell']
+    if shell:
+        return Program(*shell)
+    shell_val = caller.getenv('SHELL')
+    return os.path.basename(shell_val) if shell_val else 'N/A'
+
+def _probe_terminal(caller=LOCAL):
+    # The terminal emulator and multiplexer from the process tree, else the terminfo name
+    detected = terminal.detect(caller.pid, caller.env)
+    if detected['terminal'] or detected['multiplexer']:
+        name, version = detected['terminal'] or (None, None)
+        multiplexer = Program(*detected['multiplexer']) if detected['multiplexer'] else None
+        return TerminalInfo(name, version, multiplexer)
+    return caller.getenv('TERM') or caller.getenv('COLORTERM') or 'N/A'
+
+def _probe_packages():
+    # Counted from each package manager's database, e.g. "1843 (pacman), 12 (flatpak)"
+    package_counts = packages.count_packages(DEFAULT_PACKAGE_MANAGERS)
+    return PackageCounts(package_counts) if package_counts else 'N/A'
+
+# Field -> probe, in display order. Probes are only run for the requested fields.
+PROBES = {
+    'User': _probe_user,
+    'Host': _probe_host,
+    'OS': _probe_os,
+    'Kernel': _probe_kernel,
+    'Uptime': _probe_uptime,
+    'Shell': _probe_shell,
+    'Terminal': _probe_terminal,
+    'Packages': _probe_packages,
+}
+
+def get_system_info(fields=None):
+    """
+    Collects basic system-related information.
+
+    Args:
+        fields (collection, optional): Only collect these fields. Defaults to all of them.
+    """
+    return run_probes(PROBES, fields)
 
 def get_inspirational_quote():
     """
     Returns a random inspirational quote from the QUOTES list.
     """
     if QUOTES:
+        import random # استيراد مكتبة random لاختيار الرسائل عشوائيا
         return random.choice(QUOTES)
     return "" # ارجع سلسلة فارغة لو مفيش اقتباسات
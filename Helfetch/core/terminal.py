@@ -0,0 +1,190 @@
+# core/terminal.py
+
+# Finds the shell, terminal emulator and multiplexer that helfetch actually
+# runs in by walking up the process tree (core/processes.py), instead of
+# trusting $SHELL (the login shell) and $TERM (the terminfo name, e.g.
+# "xterm-256color"):
+#
+#   helfetch -> [sh -c ...] -> zsh -> [tmux: server] ... [tmux: client] -> alacritty
+#
+# Inside tmux or screen the shell's ancestors end at the multiplexer server,
+# so the terminal is found from one of its clients instead. Versions come from
+# the package database (core/packages.py), or from $TERM_PROGRAM_VERSION.
+#
+# The walk starts from helfetch itself by default; helfetchd starts it from the
+# client that asked (and reads that client's environment), not from the daemon.
+
+import os
+
+from core import packages, processes
+
+# Process names of interactive shells -> package name (None: no reliable package).
+KNOWN_SHELLS = {
+    'bash': 'bash',
+    'zsh': 'zsh',
+    'fish': 'fish',
+    'dash': 'dash',
+    'sh': None,
+    'ksh': 'ksh',
+    'mksh': 'mksh',
+    'oksh': 'oksh',
+    'tcsh': 'tcsh',
+    'csh': 'tcsh',
+    'yash': 'yash',
+    'nu': 'nushell',
+    'elvish': 'elvish',
+    'xonsh': 'xonsh',
+    'pwsh': 'powershell',
+    'ion': 'ion',
+}
+
+# Process names (at most 15 characters) of terminal emulators -> (display name, package name).
+KNOWN_TERMINALS = {
+    'hel-terminal': ('hel-terminal', 'hel-terminal'),
+    'gnome-terminal-': ('GNOME Terminal', 'gnome-terminal'), # gnome-terminal-server
+    'kgx': ('Console', 'gnome-console'),
+    'ptyxis-agent': ('Ptyxis', 'ptyxis'),
+    'ptyxis': ('Ptyxis', 'ptyxis'),
+    'konsole': ('Konsole', 'konsole'),
+    'yakuake': ('Yakuake', 'yakuake'),
+    'alacritty': ('Alacritty', 'alacritty'),
+    'kitty': ('kitty', 'kitty'),
+    'foot': ('foot', 'foot'),
+    'footclient': ('foot', 'foot'),
+    'wezterm-gui': ('WezTerm', 'wezterm'),
+    'ghostty': ('Ghostty', 'ghostty'),
+    'xterm': ('XTerm', 'xterm'),
+    'urxvt': ('URxvt', 'rxvt-unicode'),
+    'urxvtd': ('URxvt', 'rxvt-unicode'),
+    'st': ('st', 'st'),
+    'tilix': ('Tilix', 'tilix'),
+    'terminator': ('Terminator', 'terminator'),
+    'xfce4-terminal': ('Xfce Terminal', 'xfce4-terminal'),
+    'mate-terminal': ('MATE Terminal', 'mate-terminal'),
+    'lxterminal': ('LXTerminal', 'lxterminal'),
+    'qterminal': ('QTerminal', 'qterminal'),
+    'sakura': ('Sakura', 'sakura'),
+    'guake': ('Guake', 'guake'),
+    'tilda': ('Tilda', 'tilda'),
+    'terminology': ('Terminology', 'terminology'),
+    'cool-retro-term': ('cool-retro-term', 'cool-retro-term'),
+    'blackbox': ('Black Box', 'blackbox-terminal'),
+    'rio': ('Rio', 'rio'),
+    'contour': ('Contour', 'contour'),
+    'tabby': ('Tabby', 'tabby'),
+    'code': ('VS Code', 'code'),
+}
+
+# Ancestors that mean "no terminal emulator": the console or a remote login.
+SESSION_LEADERS = {
+    'login': 'Linux console',
+    'agetty': 'Linux console',
+    'sshd': 'SSH',
+    'sshd-session': 'SSH',
+}
+
+# Multiplexer server process names -> (display name, package name, client process names).
+MULTIPLEXERS = {
+    'tmux: server': ('tmux', 'tmux', ('tmux: client', 'tmux')),
+    'screen': ('screen', 'screen', ('screen',)),
+    'SCREEN': ('screen', 'screen', ('screen',)),
+    'zellij': ('zellij', 'zellij', ('zellij',)),
+}
+
+
+def _version(name, package, env):
+    # Terminals and tmux often announce themselves: TERM_PROGRAM=tmux, TERM_PROGRAM_VERSION=3.4
+    if (env.get('TERM_PROGRAM') or '').lower() == name.lower() and env.get('TERM_PROGRAM_VERSION'):
+        return env['TERM_PROGRAM_VERSION']
+    return packages.installed_version(package) if package else None
+
+
+def _is_interactive_shell(table, pid):
+    # 'sh -c "..."' and 'bash script.sh' are wrappers (e.g. a launcher script), not the user's shell.
+    args = table.cmdline(pid)[1:]
+    return not any(arg == '-c' or not arg.startswith('-') for arg in args)
+
+
+def find_shell(table, pid):
+    """
+    Returns the pid of the nearest interactive shell above 'pid', or None.
+    """
+    wrapper = None
+    for ancestor in table.ancestors(pid):
+        if table.name(ancestor) in KNOWN_SHELLS:
+            if _is_interactive_shell(table, ancestor):
+                return ancestor
+            wrapper = wrapper or ancestor
+        elif table.name(ancestor) in MULTIPLEXERS or table.name(ancestor) in KNOWN_TERMINALS:
+            break
+    return wrapper
+
+
+def _terminal_above(table, pid):
+    """
+    Walks up from 'pid' and returns ('terminal', pid), ('multiplexer', pid),
+    ('leader', pid) for the first match, or None.
+    """
+    for ancestor in table.ancestors(pid):
+        name = table.name(ancestor)
+        if name in KNOWN_TERMINALS:
+            return 'terminal', ancestor
+        if name in MULTIPLEXERS:
+            return 'multiplexer', ancestor
+        if name in SESSION_LEADERS:
+            return 'leader', ancestor
+    return None
+
+
+def _client_terminal(table, server):
+    # The multiplexer server is detached; its clients run inside the terminal(s).
+    clients = MULTIPLEXERS[table.name(server)][2]
+    uid = table.uid(server)
+    for pid in sorted(table.all_pids(uid), reverse=True): # the most recent client first
+        if pid != server and table.name(pid) in clients:
+            found = _terminal_above(table, pid)
+            if found and found[0] != 'multiplexer':
+                return found
+    return None
+
+
+def detect(pid=None, env=None):
+    """
+    Finds the shell, terminal emulator and multiplexer a process runs in.
+
+    Args:
+        pid (int, optional): The process to start from. Defaults to this one.
+        env (dict, optional): That process's environment. Defaults to os.environ.
+
+    Returns:
+        dict: {'shell', 'terminal', 'multiplexer'}, each (name, version) or None.
+    """
+    table = processes.snapshot()
+    start = processes.self_pid() if pid is None else pid
+    env = os.environ if env is None else env
+    if not table.exists(start):
+        table = processes.snapshot(max_age=0) # Started after the shared snapshot was taken
+    result = {'shell': None, 'terminal': None, 'multiplexer': None}
+
+    shell = find_shell(table, start)
+    if shell is not None:
+        name = table.name(shell)
+        result['shell'] = (name, _version(name, KNOWN_SHELLS[name], env))
+
+    found = _terminal_above(table, shell or start)
+    if found and found[0] == 'multiplexer':
+        name, package, _ = MULTIPLEXERS[table.name(found[1])]
+        result['multiplexer'] = (name, _version(name, package, env))
+        found = _client_terminal(table, found[1])
+    if found and found[0] == 'terminal':
+        name, package = KNOWN_TERMINALS[table.name(found[1])]
+        result['terminal'] = (name, _version(name, package, env))
+    elif found and found[0] == 'leader':
+        result['terminal'] = (SESSION_LEADERS[table.name(found[1])], None)
+    return result
+
+
+# For testing this module independently
+if __name__ == "__main__":
+    for key, value in detect().items():
+        print(f"{key}: {value}")
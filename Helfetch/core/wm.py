@@ -0,0 +1,305 @@
+# core/wm.py
+
+# Window manager / Wayland compositor detection, without forking 'xprop':
+#   1. Environment hints set by the compositor itself (Hyprland, sway, niri, i3, ...)
+#   2. The current user's processes (so e.g. the login screen's gnome-shell
+#      doesn't count), from the shared process table, against KNOWN_WMS
+#   3. X11 only: the _NET_SUPPORTING_WM_CHECK window's _NET_WM_NAME, queried
+#      in-process through libX11 (ctypes)
+#   4. XDG_CURRENT_DESKTOP, for desktops whose WM runs inside another process
+#
+# The result is cached for the session (utils/cache.py SESSION policy), including
+# "not found" (as NOT_FOUND); a cache hit only checks that the detected process
+# is still running. Outside a graphical session nothing is scanned at all.
+#
+# Everything reads the session from an environment (os.environ by default), so
+# helfetchd can answer for the session of the client that asked.
+
+import os
+
+from core import processes
+from utils import profiler
+from utils.cache import cached, invalidate, SESSION
+
+# Process name (/proc/PID/comm, at most 15 characters) -> (display name, protocol).
+# Protocol is 'wayland', 'x11' or None for window managers that can be both.
+KNOWN_WMS = {
+    # Wayland compositors
+    'Hyprland': ('Hyprland', 'wayland'),
+    'sway': ('sway', 'wayland'),
+    'river': ('river', 'wayland'),
+    'niri': ('niri', 'wayland'),
+    'kwin_wayland': ('KWin', 'wayland'),
+    'labwc': ('labwc', 'wayland'),
+    'wayfire': ('Wayfire', 'wayland'),
+    'weston': ('Weston', 'wayland'),
+    'hikari': ('hikari', 'wayland'),
+    'dwl': ('dwl', 'wayland'),
+    'cage': ('Cage', 'wayland'),
+    'gamescope': ('gamescope', 'wayland'),
+    'cosmic-comp': ('COSMIC', 'wayland'),
+    # Both (the WM runs inside the desktop shell)
+    'gnome-shell': ('GNOME Shell', None),
+    'cinnamon': ('Muffin', None),
+    'budgie-wm': ('Budgie', None),
+    'mutter': ('Mutter', None),
+    'enlightenment': ('Enlightenment', None),
+    # X11 window managers
+    'kwin_x11': ('KWin', 'x11'),
+    'xfwm4': ('Xfwm4', 'x11'),
+    'marco': ('Marco', 'x11'),
+    'muffin': ('Muffin', 'x11'),
+    'metacity': ('Metacity', 'x11'),
+    'openbox': ('Openbox', 'x11'),
+    'fluxbox': ('Fluxbox', 'x11'),
+    'icewm': ('IceWM', 'x11'),
+    'i3': ('i3', 'x11'),
+    'bspwm': ('bspwm', 'x11'),
+    'awesome': ('awesome', 'x11'),
+    'dwm': ('dwm', 'x11'),
+    'herbstluftwm': ('herbstluftwm', 'x11'),
+    'spectrwm': ('spectrwm', 'x11'),
+    'qtile': ('Qtile', None),
+    'fvwm': ('FVWM', 'x11'),
+    'fvwm3': ('FVWM3', 'x11'),
+    'jwm': ('JWM', 'x11'),
+    'compiz': ('Compiz', 'x11'),
+    'xmonad': ('xmonad', 'x11'),
+}
+# Process name prefixes, for window managers whose binary names are longer than
+# 'comm' (e.g. xmonad's compiled config, "xmonad-x86_64-linux").
+KNOWN_WM_PREFIXES = {
+    'xmonad-': 'xmonad',
+}
+
+# Environment variables set by a compositor for its clients -> (display name, protocol).
+# SWAYSOCK comes before I3SOCK, which sway also sets.
+ENV_HINTS = (
+    ('HYPRLAND_INSTANCE_SIGNATURE', 'Hyprland', 'wayland'),
+    ('SWAYSOCK', 'sway', 'wayland'),
+    ('NIRI_SOCKET', 'niri', 'wayland'),
+    ('WAYFIRE_SOCKET', 'Wayfire', 'wayland'),
+    ('I3SOCK', 'i3', 'x11'),
+)
+
+# XDG_CURRENT_DESKTOP component -> window manager, when nothing else matched.
+DESKTOP_WMS = {
+    'GNOME': 'GNOME Shell',
+    'KDE': 'KWin',
+    'X-Cinnamon': 'Muffin',
+    'XFCE': 'Xfwm4',
+    'MATE': 'Marco',
+    'Budgie': 'Budgie',
+}
+
+PROTOCOL_NAMES = {'wayland': 'Wayland', 'x11': 'X11'}
+
+_x_error_handler = None
+
+
+def session_protocol(env=None):
+    """
+    Returns the display protocol of the current session ('wayland' or 'x11'),
+    or None outside a graphical session (a TTY, SSH).
+    """
+    env = os.environ if env is None else env
+    if env.get('WAYLAND_DISPLAY') or env.get('XDG_SESSION_TYPE') == 'wayland':
+        return 'wayland'
+    if env.get('DISPLAY'):
+        return 'x11'
+    return None
+
+
+def _known_wm(comm):
+    if comm in KNOWN_WMS:
+        return comm
+    for prefix, name in KNOWN_WM_PREFIXES.items():
+        if comm.startswith(prefix):
+            return name
+    return None
+
+
+def scan_processes(protocol):
+    """
+    Looks for a known window manager among the current user's processes.
+
+    Args:
+        protocol (str): The session protocol; a WM speaking it is preferred.
+
+    Returns:
+        dict: {'name', 'protocol', 'pid', 'comm'}, or None.
+    """
+    table = processes.snapshot()
+    fallback = None
+    for pid in table.all_pids(os.getuid()):
+        comm = table.name(pid)
+        known = _known_wm(comm)
+        if known is None:
+            continue
+        name, wm_protocol = KNOWN_WMS[known]
+        result = {'name': name, 'protocol': wm_protocol or protocol, 'pid': pid, 'comm': comm}
+        if wm_protocol is None or wm_protocol == protocol:
+            return result
+        fallback = fallback or result # e.g. an X11 WM nested in a Wayland session
+    return fallback
+
+
+def _x11_wm_name(display_name=None):
+    """
+    Reads the EWMH window manager name from the X server through libX11:
+    root._NET_SUPPORTING_WM_CHECK -> window._NET_WM_NAME. Same answer as
+    'xprop -root', without the fork.
+
+    Args:
+        display_name (str, optional): The X display (e.g. ":0"). Defaults to $DISPLAY.
+
+    Returns:
+        str or None
+    """
+    import ctypes
+
+    try:
+        xlib = ctypes.CDLL('libX11.so.6')
+    except OSError as e:
+        profiler.note_failure(f"libX11: {e}")
+        return None
+
+    c_ulong_p = ctypes.POINTER(ctypes.c_ulong)
+    xlib.XOpenDisplay.restype = ctypes.c_void_p
+    xlib.XOpenDisplay.argtypes = [ctypes.c_char_p]
+    xlib.XCloseDisplay.argtypes = [ctypes.c_void_p]
+    xlib.XDefaultRootWindow.restype = ctypes.c_ulong
+    xlib.XDefaultRootWindow.argtypes = [ctypes.c_void_p]
+    xlib.XInternAtom.restype = ctypes.c_ulong
+    xlib.XInternAtom.argtypes = [ctypes.c_void_p, ctypes.c_char_p, ctypes.c_int]
+    xlib.XGetWindowProperty.argtypes = [
+        ctypes.c_void_p, ctypes.c_ulong, ctypes.c_ulong, ctypes.c_long, ctypes.c_long, ctypes.c_int,
+        ctypes.c_ulong, c_ulong_p, ctypes.POINTER(ctypes.c_int), c_ulong_p, c_ulong_p,
+        ctypes.POINTER(ctypes.c_void_p),
+    ]
+    xlib.XFree.argtypes = [ctypes.c_void_p]
+
+    # Xlib's default error handler exits the process (e.g. on BadWindow from a stale check window).
+    # The callback is kept alive for as long as libX11 may call it.
+    global _x_error_handler
+    _x_error_handler = ctypes.CFUNCTYPE(ctypes.c_int, ctypes.c_void_p, ctypes.c_void_p)(lambda display, event: 0)
+    xlib.XSetErrorHandler.argtypes = [ctypes.c_void_p]
+    xlib.XSetErrorHandler(ctypes.cast(_x_error_handler, ctypes.c_void_p))
+
+    display = xlib.XOpenDisplay(display_name.encode() if display_name else None)
+    if not display:
+        profiler.note_failure("can't open the X display")
+        return None
+
+    def get_property(window, name, req_type):
+        atom = xlib.XInternAtom(display, name, 1)
+        if not atom:
+            return None, 0, 0
+        actual_type = ctypes.c_ulong()
+        actual_format = ctypes.c_int()
+        count = ctypes.c_ulong()
+        bytes_after = ctypes.c_ulong()
+        data = ctypes.c_void_p()
+        status = xlib.XGetWindowProperty(display, window, atom, 0, 1024, 0, req_type,
+                                         ctypes.byref(actual_type), ctypes.byref(actual_format),
+                                         ctypes.byref(count), ctypes.byref(bytes_after), ctypes.byref(data))
+        if status != 0 or not data.value:
+            return None, 0, 0
+        return data, actual_format.value, count.value
+
+    try:
+        XA_WINDOW = 33
+        data, fmt, count = get_property(xlib.XDefaultRootWindow(display), b'_NET_SUPPORTING_WM_CHECK', XA_WINDOW)
+        if data is None:
+            return None
+        # Format 32 properties are returned as an array of C longs.
+        check_window = ctypes.cast(data, c_ulong_p)[0] if fmt == 32 and count else None
+        xlib.XFree(data)
+        if not check_window:
+            return None
+        utf8_string = xlib.XInternAtom(display, b'UTF8_STRING', 0)
+        data, fmt, count = get_property(check_window, b'_NET_WM_NAME', utf8_string)
+        if data is None:
+            return None
+        name = ctypes.string_at(data, count).decode('utf-8', 'replace') if fmt == 8 else None
+        xlib.XFree(data)
+        return name or None
+    finally:
+        xlib.XCloseDisplay(display)
+
+
+def _detect(env):
+    protocol = session_protocol(env)
+    if protocol is None:
+        return None
+
+    for variable, name, hint_protocol in ENV_HINTS:
+        if env.get(variable):
+            return {'name': name, 'protocol': hint_protocol, 'pid': None, 'comm': None}
+
+    found = scan_processes(protocol)
+    if found:
+        return found
+
+    if protocol == 'x11':
+        name = _x11_wm_name(env.get('DISPLAY'))
+        if name:
+            return {'name': name, 'protocol': 'x11', 'pid': None, 'comm': None}
+
+    for desktop in (env.get('XDG_CURRENT_DESKTOP') or '').split(':'):
+        if desktop in DESKTOP_WMS:
+            return {'name': DESKTOP_WMS[desktop], 'protocol': protocol, 'pid': None, 'comm': None}
+    return None
+
+
+# Cached when no window manager was found, so the next runs don't look again
+NOT_FOUND = {'name': None, 'protocol': None, 'pid': None, 'comm': None}
+
+
+def _still_running(result):
+    if result.get('pid') is None:
+        return True
+    return processes.snapshot().name(result['pid']) == result['comm']
+
+
+def detect(env=None):
+    """
+    Returns the running window manager as {'name', 'protocol', 'pid', 'comm'}, or None.
+
+    Args:
+        env (dict, optional): The environment of the session. Defaults to os.environ.
+    """
+    policy = SESSION if env is None else ('session', env)
+    env = os.environ if env is None else env
+    # One entry per session, so helfetchd's clients from different sessions don't evict each other.
+    key = f"wm:{env.get('XDG_SESSION_ID') or env.get('DISPLAY') or env.get('WAYLAND_DISPLAY')}"
+    detected = []
+
+    def compute():
+        detected.append(True)
+        return _detect(env) or NOT_FOUND
+
+    result = cached(key, policy, compute)
+    if not detected and not _still_running(result):
+        # The WM was replaced (e.g. 'openbox --replace') within the same session: look again.
+        invalidate(key)
+        result = cached(key, policy, compute)
+    return result if result.get('name') else None
+
+
+def window_manager(env=None):
+    """
+    Returns the window manager for display, e.g. "Hyprland (Wayland)", or 'N/A'.
+    """
+    result = detect(env)
+    if not result:
+        return 'N/A'
+    protocol = PROTOCOL_NAMES.get(result.get('protocol'))
+    return f"{result['name']} ({protocol})" if protocol else result['name']
+
+
+# For testing this module independently
+if __name__ == "__main__":
+    print(f"Session protocol: {session_protocol()}")
+    print(f"Process scan: {scan_processes(session_protocol() or 'x11')}")
+    print(f"Window manager: {window_manager()}")
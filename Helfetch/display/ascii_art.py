@@ -21,20 +21,23 @@ COLORS = {
 
 # Helwan Linux ASCII Art (Colored using ANSI escape codes)
 # Your unique Helwan Linux logo!
-HELWAN_LOGO = f"""\
-{COLORS["light_cyan"]}▖▖   ▜
+HELWAN_LOGO_TEXT = """\
+▖▖   ▜
 ▙▌█▌▐ ▌▌▌▀▌▛▌
-▌▌▙▖▐▖▚▚▘█▌▌▌{COLORS["reset"]}
+▌▌▙▖▐▖▚▚▘█▌▌▌"""
+HELWAN_LOGO = f"""{COLORS["light_cyan"]}{HELWAN_LOGO_TEXT}{COLORS["reset"]}
 """
 
-def get_ascii_logo(os_name="Helwan Linux"):
+def get_ascii_logo(os_name="Helwan Linux", color="light_cyan"):
     """
-    Returns the ASCII art logo for Helwan Linux.
+    Returns the ASCII art logo for Helwan Linux, in the given color (a key of COLORS).
     Currently, only the Helwan Linux logo is supported.
     """
     # بما أننا نركز على Helwan Linux فقط، يمكننا إرجاع هذا الشعار مباشرةً
     # Since we are focusing only on Helwan Linux, we can return this logo directly.
-    return HELWAN_LOGO
+    if color == "light_cyan":
+        return HELWAN_LOGO
+    return f"{COLORS.get(color, COLORS['light_cyan'])}{HELWAN_LOGO_TEXT}{COLORS['reset']}\n"
 
 # For testing this module independently
 if __name__ == "__main__":
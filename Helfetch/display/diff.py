@@ -0,0 +1,69 @@
+# display/diff.py
+
+# The output of 'helfetch diff': for each compared snapshot, its changed fields
+# grouped by the collector that produces them, then a summary of how many
+# snapshots changed and which fields changed most often.
+
+from display.fleet import format_cell
+
+
+def describe_delta(field, old, new):
+    """
+    Returns how much a numeric value changed, e.g. "+40 pacman" for Packages, or ''.
+    """
+    if isinstance(old, dict) and isinstance(new, dict) and field == 'Packages':
+        deltas = [f"{new.get(manager, 0) - old.get(manager, 0):+d} {manager}"
+                  for manager in list(old) + [manager for manager in new if manager not in old]
+                  if new.get(manager, 0) != old.get(manager, 0)]
+        return ", ".join(deltas)
+    if all(isinstance(value, (int, float)) and not isinstance(value, bool) for value in (old, new)):
+        return f"{new - old:+g}"
+    return ''
+
+
+def format_snapshot_diff(result, groups):
+    """
+    Formats one compared snapshot.
+
+    Args:
+        result (dict): A result from utils.diff.diff_snapshots().
+        groups (list): Its changes from utils.diff.group_by_collector().
+
+    Returns:
+        str: A header line and the changed fields, indented under their collector.
+    """
+    if result['baseline'] is None:
+        return f"{result['name']}: {result['error']}"
+    target = result['name'] if result['name'] == result['baseline'] else f"{result['name']} (vs {result['baseline']})"
+    if not groups:
+        return f"{target}: no changes"
+
+    key_width = max(len(field) for _, changes in groups for field, _, _ in changes)
+    lines = [f"{target}:"]
+    for collector, changes in groups:
+        lines.append(f"  {collector}")
+        for field, old, new in changes:
+            line = f"    {field.ljust(key_width)}  {format_cell(field, old)} -> {format_cell(field, new)}"
+            delta = describe_delta(field, old, new)
+            lines.append(f"{line} ({delta})" if delta else line)
+    return "\n".join(lines)
+
+
+def format_diff_summary(compared, changed, unmatched, field_counts):
+    """
+    Formats the closing summary.
+
+    Args:
+        compared (int): Snapshots compared with a baseline.
+        changed (int): Snapshots with at least one changed field.
+        unmatched (int): Snapshots without a baseline (or that failed).
+        field_counts (dict): Field -> number of snapshots where it changed.
+    """
+    summary = f"{compared} compared, {changed} changed, {compared - changed} unchanged"
+    if unmatched:
+        summary += f", {unmatched} without a baseline"
+    lines = [summary]
+    if field_counts:
+        ranked = sorted(field_counts.items(), key=lambda item: (-item[1], item[0]))
+        lines.append("Changed fields: " + ", ".join(f"{field} ({count})" for field, count in ranked))
+    return "\n".join(lines)
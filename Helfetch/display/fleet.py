@@ -0,0 +1,76 @@
+# display/fleet.py
+
+# The aggregated table printed by 'helfetch fleet': one row per host, built
+# from the JSON records gathered by utils/fleet.py.
+
+from utils.helpers import format_bytes
+
+
+def format_cell(field, value):
+    """
+    Formats one JSON field value (as produced by --format json) for the table.
+    """
+    if value is None:
+        return 'N/A'
+    if isinstance(value, list):
+        return ", ".join(format_cell(field, item) for item in value) or 'N/A'
+    if isinstance(value, dict):
+        if field == 'Packages':
+            return ", ".join(f"{count} ({manager})" for manager, count in value.items()) or 'N/A'
+        if field == 'CPU':
+            from core.metrics import CpuInfo
+            return str(CpuInfo(**value))
+        if 'name' in value and 'version' in value:
+            from core.metrics import Program, TerminalInfo
+            multiplexer = value.get('multiplexer')
+            if multiplexer:
+                return str(TerminalInfo(value['name'], value['version'], Program(**multiplexer)))
+            return str(Program(value['name'], value['version'])) if value['name'] else 'N/A'
+        if 'mount_point' in value:
+            return f"{value['mount_point']} {value.get('percent', 0):.0f}%"
+        if 'used_bytes' in value and 'total_bytes' in value:
+            return (f"{format_bytes(value['used_bytes'])}/{format_bytes(value['total_bytes'])}"
+                    f" ({value.get('percent', 0):.0f}%)")
+        if 'seconds' in value:
+            from utils.helpers import format_duration
+            return format_duration(value['seconds'])
+    return str(value)
+
+
+def format_fleet_table(records, fields):
+    """
+    Formats fleet records as a table, sorted by host name.
+
+    Args:
+        records (list): Records from utils.fleet.run_fleet().
+        fields (list): The field columns to show.
+
+    Returns:
+        str: The table, followed by a summary line.
+    """
+    header = ['Host'] + list(fields)
+    rows = []
+    failed = 0
+    for record in sorted(records, key=lambda record: record['host']):
+        if record['ok']:
+            info = record['info']
+            rows.append([record['host']] + [format_cell(field, info.get(field)) for field in fields])
+        else:
+            failed += 1
+            rows.append([record['host'], f"error: {record['error']}"])
+
+    widths = [len(title) for title in header]
+    for row in rows:
+        # An error message spans the field columns, so it doesn't widen them.
+        if len(row) == len(header):
+            widths = [max(width, len(cell)) for width, cell in zip(widths, row)]
+        else:
+            widths[0] = max(widths[0], len(row[0]))
+
+    lines = ["  ".join(title.ljust(width) for title, width in zip(header, widths)).rstrip()]
+    lines.append("  ".join('-' * width for width in widths))
+    for row in rows:
+        lines.append("  ".join(cell.ljust(width) for cell, width in zip(row, widths)).rstrip())
+    lines.append("")
+    lines.append(f"{len(rows)} hosts, {len(rows) - failed} ok, {failed} failed")
+    return "\n".join(lines)
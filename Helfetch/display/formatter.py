@@ -1,9 +1,32 @@
 # display/formatter.py
 
 import re
+from functools import lru_cache
 from display.ascii_art import COLORS # استيراد قاموس الألوان من ascii_art
 from config.default_config import DEFAULT_COLORS # استيراد الألوان الافتراضية، بما في ذلك لون الاقتباس
 
+# Matches ANSI escape codes (colors, cursor movement); compiled once at import.
+ANSI_ESCAPE = re.compile(r'\x1B(?:[@-Z\\-_]|\[[0-?]*[ -/]*[@-~])')
+
+# Fields shown with a usage bar, and the bar's color
+PROGRESS_BAR_COLORS = {
+    "CPU Usage": "green",
+    "RAM": "blue",
+    "Disk": "yellow",
+}
+
+SPARKLINE_CHARS = "▁▂▃▄▅▆▇█"
+
+# Shown in place of a value that is still being collected (progressive output)
+PLACEHOLDER = "…"
+
+@lru_cache(maxsize=256)
+def _progress_bar(filled_chars_count, bar_length, filled_char, empty_char, bar_color, empty_color):
+    # There are only bar_length + 1 different bars per style, so each is built once.
+    filled_bar = COLORS.get(bar_color, COLORS["reset"]) + (filled_char * filled_chars_count)
+    empty_bar = COLORS.get(empty_color, COLORS["reset"]) + (empty_char * (bar_length - filled_chars_count))
+    return f"[{filled_bar}{empty_bar}{COLORS['reset']}]"
+
 def create_progress_bar(percentage, bar_length=20, filled_char="█", empty_char="-", bar_color="green", empty_color="white"):
     """
     Creates an ASCII art progress bar based on a percentage.
@@ -12,18 +35,63 @@ def create_progress_bar(percentage, bar_length=20, filled_char="█", empty_char
         percentage = max(0, min(100, percentage))
 
     filled_chars_count = int(bar_length * percentage / 100)
-    empty_chars_count = bar_length - filled_chars_count
+    return _progress_bar(filled_chars_count, bar_length, filled_char, empty_char, bar_color, empty_color)
 
-    filled_bar = COLORS.get(bar_color, COLORS["reset"]) + (filled_char * filled_chars_count)
-    empty_bar = COLORS.get(empty_color, COLORS["reset"]) + (empty_char * empty_chars_count)
 
-    return f"[{filled_bar}{empty_bar}{COLORS['reset']}]"
+def create_sparkline(values, low=None, high=None, color="cyan"):
+    """
+    Draws a series of samples as a one-line sparkline (e.g. "▁▂▄▇▅").
 
+    Args:
+        values (list): The samples, oldest first.
+        low, high (float, optional): The range of the scale; defaults to the samples' range.
+    """
+    if not values:
+        return ""
+    low = min(values) if low is None else low
+    high = max(values) if high is None else high
+    top = len(SPARKLINE_CHARS) - 1
+    span = high - low
+    if span <= 0:
+        chars = SPARKLINE_CHARS[top // 2] * len(values)
+    else:
+        chars = "".join(SPARKLINE_CHARS[max(0, min(top, round((value - low) * top / span)))] for value in values)
+    return f"{COLORS.get(color, COLORS['reset'])}{chars}{COLORS['reset']}"
+
+
+def format_value(key, value, history=None):
+    """
+    Returns the text shown for a field value, with a progress bar for the usage
+    fields and, in watch mode, a sparkline of the field's recent samples.
 
-def format_info_output(info_data, logo_lines=None, inspirational_quote="", logo_color="light_cyan", info_key_color="light_yellow", info_value_color="white"):
+    Args:
+        key (str): The field name.
+        value: The field value (a string or a typed metric).
+        history (RingBuffer, optional): The field's recent samples (core/sampler.py).
+    """
+    # Typed metrics (core/metrics.py) carry their raw numbers and percentage;
+    # units are only applied here, by str().
+    display_value = str(value)
+    bar_color = PROGRESS_BAR_COLORS.get(key)
+    percentage = getattr(value, 'percent', None)
+    if bar_color and percentage is not None:
+        bar = create_progress_bar(percentage, bar_length=15, bar_color=bar_color, empty_color="white")
+        display_value = f"{display_value} {bar}"
+    if history is not None and len(history) > 1:
+        # Percentages share a fixed 0-100 scale; other samples use their own range.
+        scale = (0, 100) if percentage is not None else (None, None)
+        display_value = f"{display_value} {create_sparkline(history.values(), *scale)}"
+    return display_value
+
+
+def format_info_output(info_data, logo_lines=None, inspirational_quote="", logo_color="light_cyan", info_key_color="light_yellow", info_value_color="white", history=None):
     """
     Formats the system information, combines it with an ASCII art logo, and includes an inspirational quote.
 
+    The layout (logo padding, key alignment, colors) is compiled once per logo and
+    set of shown fields and reused by later calls, which only re-format the values
+    that changed (see display/layout.py).
+
     Args:
         info_data (dict): A dictionary containing all the system information.
         logo_lines (list, optional): A list of strings representing the ASCII art logo, line by line.
@@ -32,108 +100,36 @@ def format_info_output(info_data, logo_lines=None, inspirational_quote="", logo_
         logo_color (str): The color key from COLORS to apply to the logo (if not already colored).
         info_key_color (str): The color key for the information labels (e.g., "OS", "CPU").
         info_value_color (str): The color key for the information values (e.g., "Arch Linux", "Intel i7").
+        history (History, optional): Recent samples per field (watch mode), drawn as sparklines.
 
     Returns:
         str: The formatted output ready to be printed to the console.
     """
-    formatted_lines = []
-    
-    colored_info_lines = []
-    max_key_length = 0
-    
-    # Calculate max key length for alignment
-    for key in info_data.keys():
-        # Ensure key is not empty and value is relevant before considering for max_key_length
-        if key and info_data.get(key) not in [None, '', 'N/A']:
-            if len(key) > max_key_length:
-                max_key_length = len(key)
-
-    for key, value in info_data.items():
-        if value is None or value == '' or value == 'N/A':
-            continue
-        
-        display_value = value
-
-        # Process RAM and Disk for progress bar display
-        if key == "RAM":
-            try:
-                if '/' in value:
-                    parts = value.replace('Gi', '').replace('Mi', '').split('/')
-                    used = float(parts[0])
-                    total = float(parts[1])
-                    if total > 0:
-                        percentage = (used / total) * 100
-                        bar = create_progress_bar(percentage, bar_length=15, bar_color="blue", empty_color="white")
-                        display_value = f"{value} {bar}"
-                elif value.endswith('%'):
-                    percentage = float(value.strip('%'))
-                    bar = create_progress_bar(percentage, bar_length=15, bar_color="blue", empty_color="white")
-                    display_value = f"{value} {bar}"
-            except (ValueError, IndexError):
-                pass
-
-        elif key == "Disk":
-            try:
-                if value.endswith('%'):
-                    percentage = float(value.strip('%'))
-                    bar = create_progress_bar(percentage, bar_length=15, bar_color="yellow", empty_color="white")
-                    display_value = f"{value} {bar}"
-            except ValueError:
-                pass
-
-        padding = " " * (max_key_length - len(key))
-        colored_info_lines.append(
-            f"{COLORS.get(info_key_color, COLORS['reset'])}{key}:{padding}{COLORS.get(info_value_color, COLORS['reset'])} {display_value}{COLORS['reset']}"
-        )
-
-    max_lines = max(len(logo_lines.split('\n')) if logo_lines else 0, len(colored_info_lines))
-
-    combined_lines = []
-    logo_lines_list = logo_lines.split('\n') if logo_lines else []
-
-    max_logo_visual_width = 0
-    for logo_line in logo_lines_list:
-        stripped_logo_line_len = len(strip_ansi_codes(logo_line))
-        if stripped_logo_line_len > max_logo_visual_width:
-            max_logo_visual_width = stripped_logo_line_len
-
-    for i in range(max_lines):
-        logo_line = logo_lines_list[i] if i < len(logo_lines_list) else ""
-        info_line = colored_info_lines[i] if i < len(colored_info_lines) else ""
-        
-        stripped_logo_line_len = len(strip_ansi_codes(logo_line))
-        padding_between = " " * ((max_logo_visual_width - stripped_logo_line_len) + 4)
-        
-        combined_lines.append(f"{logo_line}{padding_between}{info_line}")
-
-    # إضافة الاقتباس بعد معلومات النظام
-    if inspirational_quote:
-        combined_lines.append("") # سطر فارغ للفاصل
-        quote_padding = " " * (max_logo_visual_width + 4) # نفس المسافة بين الشعار والمعلومات
-        
-        # استخدام اللون من DEFAULT_COLORS
-        combined_lines.append(f"{quote_padding}{COLORS.get(DEFAULT_COLORS['quote_color'], COLORS['reset'])}{inspirational_quote}{COLORS['reset']}")
-
-    return "\n".join(combined_lines)
+    from display.layout import get_layout
+
+    # Fields without a value are not shown at all.
+    fields = tuple(key for key, value in info_data.items() if key and value is not None and value != '' and value != 'N/A')
+    layout = get_layout(logo_lines, fields, info_key_color, info_value_color, DEFAULT_COLORS['quote_color'])
+    return layout.render(info_data, inspirational_quote, history)
 
 def strip_ansi_codes(text):
     """
     Removes ANSI escape codes from a string to get its 'visual' length.
     """
-    ansi_escape = re.compile(r'\x1B(?:[@-Z\\-_]|\[[0-?]*[ -/]*[@-~])')
-    return ansi_escape.sub('', text)
+    return ANSI_ESCAPE.sub('', text)
 
 # For testing this module independently (يجب أن يعمل هذا القسم بشكل صحيح للاختبار)
 if __name__ == "__main__":
     # هذا الجزء يستخدم لغرض الاختبار المباشر لـ formatter.py فقط
     # لا تعتمد عليه لإخراج Helfetch بالكامل
+    from core.metrics import MemoryUsage, DiskUsage
     example_info = {
         "User": "testuser",
         "Host": "testhost",
         "OS": "Test OS",
         "Kernel": "1.0",
-        "RAM": "4.0Gi/8.0Gi",
-        "Disk": "50%",
+        "RAM": MemoryUsage(900 * 1024**2, 15 * 1024**3),
+        "Disk": DiskUsage(50 * 1024**3, 100 * 1024**3, 50 * 1024**3),
         "Public IP": "127.0.0.1",
         "ISP": "Test ISP",
         "City": "Test City",
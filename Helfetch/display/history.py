@@ -0,0 +1,129 @@
+# display/history.py
+
+# The output of 'helfetch history', read from the recorded snapshot log
+# (utils/history.py): a table with one row per run (runs that show the same
+# values as the previous one are folded), or one line per field with a
+# sparkline of its numeric values, or its changes for text fields like Kernel.
+
+import time
+
+from core.metrics import Duration
+from display.formatter import create_sparkline
+
+TIME_FORMAT = '%Y-%m-%d %H:%M'
+
+# Sparkline colors per field (the usage fields use the progress bar colors).
+SPARKLINE_COLORS = {
+    'RAM': 'blue',
+    'Disk': 'yellow',
+    'Packages': 'green',
+    'Uptime': 'cyan',
+}
+
+
+def format_time(when):
+    return time.strftime(TIME_FORMAT, time.localtime(when))
+
+
+def sample(value):
+    """
+    Returns the number drawn in a sparkline for a recorded value, or None for text values.
+    """
+    if isinstance(value, (int, float)):
+        return value
+    if isinstance(value, Duration):
+        return value.seconds
+    return getattr(value, 'sample', None)
+
+
+def format_history_table(rows, fields):
+    """
+    Formats recorded runs as a table.
+
+    Args:
+        rows (iterable): (time, values) pairs from HistoryLog.rows(), oldest first.
+        fields (list): The field columns, in the order of 'values'.
+
+    Returns:
+        str: The table, or None if there are no rows.
+    """
+    header = ['Time'] + list(fields)
+    lines = []
+    previous = None
+    runs = 0
+    for when, values in rows:
+        runs += 1
+        cells = ['-' if value is None else str(value) for value in values]
+        if cells == previous:
+            continue
+        previous = cells
+        lines.append([format_time(when)] + cells)
+    if not lines:
+        return None
+
+    widths = [max(len(title), max(len(line[i]) for line in lines)) for i, title in enumerate(header)]
+    output = ["  ".join(title.ljust(width) for title, width in zip(header, widths)).rstrip()]
+    output.append("  ".join('-' * width for width in widths))
+    output.extend("  ".join(cell.ljust(width) for cell, width in zip(line, widths)).rstrip() for line in lines)
+    output.append("")
+    output.append(f"{runs} runs, {len(lines)} shown (runs with unchanged values are folded)")
+    return "\n".join(output)
+
+
+def _downsample(values, width):
+    # Averages consecutive samples so that the sparkline fits in 'width' characters.
+    if len(values) <= width:
+        return values
+    step = len(values) / width
+    return [sum(values[int(i * step):int((i + 1) * step)]) / (int((i + 1) * step) - int(i * step))
+            for i in range(width)]
+
+
+def format_history_line(field, points, width):
+    """
+    Formats one field's recorded values as a single line.
+
+    Args:
+        field (str): The field name.
+        points (iterable): (time, value) pairs from HistoryLog.scan(), oldest first.
+        width (int): The width of the line, in characters; the sparkline takes what
+                     the values and the time span leave.
+
+    Returns:
+        str: e.g. "Disk  18% ▁▁▂▃▅▆ 27%  (412 runs, 2026-09-17 08:02 -> 2026-10-17 09:15)",
+             or None if the field has no recorded values.
+    """
+    first = last = None
+    samples = []
+    changes = []
+    percent_scale = False
+    count = 0
+    for when, value in points:
+        if first is None:
+            first = (when, value)
+            percent_scale = getattr(value, 'percent', None) is not None
+        last = (when, value)
+        count += 1
+        number = sample(value)
+        if number is not None:
+            samples.append(number)
+        elif not changes or changes[-1] != str(value):
+            changes.append(str(value))
+    if first is None:
+        return None
+
+    span = f"({count} runs, {format_time(first[0])} -> {format_time(last[0])})"
+    if samples:
+        scale = (0, 100) if percent_scale else (None, None)
+        room = width - len(f"{first[1]}  {last[1]}  {span}")
+        line = create_sparkline(_downsample(samples, max(room, 10)), *scale, color=SPARKLINE_COLORS.get(field, 'cyan'))
+        return f"{first[1]} {line} {last[1]}  {span}"
+    return f"{' -> '.join(changes)}  {span}"
+
+
+def format_history_sparklines(lines):
+    """
+    Aligns (field, line) pairs from format_history_line() under their field names.
+    """
+    key_width = max((len(field) for field, _ in lines), default=0)
+    return "\n".join(f"{field + ':':<{key_width + 1}} {line}" for field, line in lines)
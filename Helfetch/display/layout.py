@@ -0,0 +1,109 @@
+# display/layout.py
+
+# The layout engine behind format_info_output(). Everything that only depends on
+# the logo, the colors and which fields are shown is computed once and cached:
+#   - LogoBlock: the logo's lines, padded to a common visual width (per logo/theme)
+#   - Layout: the line buffer with the logo column and the aligned, colored key
+#     prefixes already in place (per logo + field set + colors)
+# Both caches are LRU-bounded, so a long-running process (helfetchd serving many
+# option combinations, --watch across config reloads) keeps only recent ones.
+# Rendering then only formats the values that changed since the previous frame
+# and patches them into the buffer, which is what watch mode and helfetchd do
+# over and over.
+
+from functools import lru_cache
+
+from display.ascii_art import COLORS
+from display.formatter import format_value, strip_ansi_codes
+
+# Spaces between the logo and the information column
+LOGO_GAP = 4
+
+# Compiled logos and layouts kept for reuse
+MAX_LOGO_BLOCKS = 8
+MAX_LAYOUTS = 32
+
+
+class LogoBlock:
+    """
+    A logo split into lines, each padded to the same visual width plus the gap.
+    """
+
+    def __init__(self, logo):
+        lines = logo.split('\n') if logo else []
+        widths = [len(strip_ansi_codes(line)) for line in lines]
+        self.width = max(widths, default=0)
+        self.prefixes = [line + " " * (self.width - width + LOGO_GAP) for line, width in zip(lines, widths)]
+        # Rows below the logo (and the quote) are indented by the same amount.
+        self.blank = " " * (self.width + LOGO_GAP)
+
+    def prefix(self, row):
+        return self.prefixes[row] if row < len(self.prefixes) else self.blank
+
+
+@lru_cache(maxsize=MAX_LOGO_BLOCKS)
+def get_logo_block(logo):
+    return LogoBlock(logo)
+
+
+class Layout:
+    """
+    A compiled template for one logo, set of shown fields and color scheme.
+
+    Not thread-safe: callers rendering from several threads (helfetchd) must
+    serialize their calls.
+    """
+
+    def __init__(self, logo, fields, key_color, value_color, quote_color):
+        self.logo = get_logo_block(logo)
+        self.fields = fields
+        key_width = max((len(key) for key in fields), default=0)
+        key_code = COLORS.get(key_color, COLORS['reset'])
+        value_code = COLORS.get(value_color, COLORS['reset'])
+        self.quote_code = COLORS.get(quote_color, COLORS['reset'])
+
+        # Everything on a field's line except its value
+        self.prefixes = [
+            f"{self.logo.prefix(row)}{key_code}{key}:{' ' * (key_width - len(key))}{value_code} "
+            for row, key in enumerate(fields)
+        ]
+        rows = max(len(self.logo.prefixes), len(fields))
+        self.buffer = [self.logo.prefix(row) for row in range(rows)]
+        self.values = [None] * len(fields)
+        self.quote = None
+        self.quote_lines = []
+
+    def render(self, info_data, quote="", history=None):
+        """
+        Renders the layout with the given values, re-formatting only the fields
+        whose value changed since the last call. 'history' (core/sampler.History)
+        adds sparklines; it only changes together with the sampled values.
+        """
+        buffer = self.buffer
+        values = self.values
+        for row, key in enumerate(self.fields):
+            value = info_data[key]
+            previous = values[row]
+            if previous is value or (previous is not None and type(previous) is str and previous == value):
+                continue
+            values[row] = value
+            samples = history.get(key) if history is not None else None
+            buffer[row] = f"{self.prefixes[row]}{format_value(key, value, samples)}{COLORS['reset']}"
+
+        if quote != self.quote:
+            self.quote = quote
+            self.quote_lines = ["", f"{self.logo.blank}{self.quote_code}{quote}{COLORS['reset']}"] if quote else []
+        return "\n".join(buffer + self.quote_lines if self.quote_lines else buffer)
+
+
+@lru_cache(maxsize=MAX_LAYOUTS)
+def get_layout(logo, fields, key_color, value_color, quote_color):
+    """
+    Returns the cached Layout for these parameters, compiling it on first use.
+
+    Args:
+        logo (str): The (colored) logo text, or None.
+        fields (tuple): The fields shown, in display order.
+        key_color, value_color, quote_color (str): Color names from COLORS.
+    """
+    return Layout(logo, fields, key_color, value_color, quote_color)
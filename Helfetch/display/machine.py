@@ -0,0 +1,98 @@
+# display/machine.py
+
+# Machine-readable output modes. Unlike format_info_output(), these never build
+# colors, padding, the logo or the quote: values come straight from the probes,
+# with typed metrics (core/metrics.py) emitted as raw numbers. The json/re/shlex
+# modules are imported by the formatter that needs them, not at startup.
+
+OUTPUT_FORMATS = ['text', 'json', 'ndjson', 'env']
+
+
+def to_json_value(value):
+    """
+    Converts a field value to JSON data: metrics become numbers, 'N/A' becomes null.
+    """
+    if value is None or value == 'N/A':
+        return None
+    if hasattr(value, 'to_json'):
+        return value.to_json()
+    return value
+
+
+def format_json(info_data):
+    """
+    Formats all fields as a single JSON object, keyed by field name.
+    """
+    import json
+    return json.dumps({key: to_json_value(value) for key, value in info_data.items()}, ensure_ascii=False)
+
+
+def format_ndjson(info_data):
+    """
+    Formats one JSON object per line: {"field": "RAM", "value": {...}}.
+    """
+    import json
+    return "\n".join(
+        json.dumps({'field': key, 'value': to_json_value(value)}, ensure_ascii=False)
+        for key, value in info_data.items()
+    )
+
+
+def env_name(*parts):
+    """
+    Builds a shell variable name from field/sub-field names, e.g. ('Public IP',) -> PUBLIC_IP.
+    A name starting with a digit gets a '_' prefix (e.g. '3D' -> _3D); a name with no
+    letter or digit at all comes out empty, and the caller skips it.
+    """
+    import re
+    name = re.sub(r'[^A-Z0-9]+', '_', "_".join(parts).upper()).strip('_')
+    return f"_{name}" if name[:1].isdigit() else name
+
+
+def format_env(info_data):
+    """
+    Formats fields as shell-sourceable KEY=value lines. Structured metrics are
+    flattened, e.g. RAM -> RAM_USED_BYTES, RAM_TOTAL_BYTES, RAM_PERCENT, and lists
+    are numbered, e.g. Disks -> DISKS_COUNT, DISKS_0_MOUNT_POINT, DISKS_0_PERCENT, ...
+    Fields whose names make no valid variable name are left out.
+    """
+    import shlex
+    lines = []
+
+    def flatten(parts, data):
+        if not env_name(*parts):
+            return
+        if isinstance(data, dict):
+            for sub_key, sub_value in data.items():
+                flatten(parts + (sub_key,), sub_value)
+        elif isinstance(data, list):
+            lines.append(f"{env_name(*parts, 'count')}={len(data)}")
+            for index, item in enumerate(data):
+                flatten(parts + (str(index),), item)
+        else:
+            lines.append(f"{env_name(*parts)}={shlex.quote('' if data is None else str(data))}")
+
+    for key, value in info_data.items():
+        flatten((key,), to_json_value(value))
+    return "\n".join(lines)
+
+
+FORMATTERS = {
+    'json': format_json,
+    'ndjson': format_ndjson,
+    'env': format_env,
+}
+
+
+def format_machine_output(info_data, output_format):
+    """
+    Formats the collected information in one of the machine-readable formats.
+
+    Args:
+        info_data (dict): A dictionary containing all the system information.
+        output_format (str): 'json', 'ndjson' or 'env'.
+
+    Returns:
+        str: The formatted output.
+    """
+    return FORMATTERS[output_format](info_data)
@@ -0,0 +1,96 @@
+# display/terminal.py
+
+import shutil
+import sys
+
+from display.formatter import strip_ansi_codes
+
+# ANSI/VT100 control sequences used for in-place redraws
+CURSOR_UP = "\033[{}A"
+CURSOR_DOWN = "\033[{}B"
+CLEAR_LINE = "\033[K"
+CLEAR_BELOW = "\033[J"
+HIDE_CURSOR = "\033[?25l"
+SHOW_CURSOR = "\033[?25h"
+
+
+def line_rows(line, columns):
+    """
+    Returns how many terminal rows a line takes once wrapped at 'columns'.
+    """
+    width = len(strip_ansi_codes(line))
+    return max(1, -(-width // columns))
+
+
+def rendered_rows(text, columns=None):
+    """
+    Returns how many terminal rows a block of text takes (default: at the current terminal width).
+    """
+    columns = columns or shutil.get_terminal_size().columns
+    return sum(line_rows(line, columns) for line in text.split("\n"))
+
+
+class LiveScreen:
+    """
+    Keeps a block of text on the terminal and redraws it in place.
+
+    Only the lines that changed since the previous frame are rewritten, using
+    relative cursor movements, so a refresh costs a few bytes instead of the
+    whole output. Movements count terminal rows, so lines wider than the
+    terminal (which wrap) are accounted for. The cursor always rests on the
+    row just below the block.
+    """
+
+    def __init__(self, stream=None):
+        self.stream = stream or sys.stdout
+        self.lines = None
+        self.rows = None    # Rows taken by each line of the last frame
+        self.columns = None # Terminal width the last frame was drawn at
+
+    def draw(self, text):
+        """
+        Draws a new frame, rewriting only the lines that differ from the last one.
+        """
+        lines = text.split("\n")
+        columns = shutil.get_terminal_size().columns
+        rows = [line_rows(line, columns) for line in lines]
+        out = []
+        if self.lines is None:
+            out.append(HIDE_CURSOR)
+            out.append("\n".join(lines) + "\n")
+        elif len(lines) != len(self.lines) or columns != self.columns or any(
+                old != new and old_rows != new_rows
+                for old, new, old_rows, new_rows in zip(self.lines, lines, self.rows, rows)):
+            # The layout changed (or a line now wraps differently): clear the old block
+            # and draw everything again. After a resize, the old frame is measured the
+            # way most terminals reflow it, at the new width.
+            if columns == self.columns:
+                height = sum(self.rows)
+            else:
+                height = sum(line_rows(line, columns) for line in self.lines)
+            out.append(CURSOR_UP.format(height) + "\r" + CLEAR_BELOW)
+            out.append("\n".join(lines) + "\n")
+        else:
+            below = sum(rows)
+            for old, new, line_height in zip(self.lines, lines, rows):
+                if old != new:
+                    # A line that fills its last row exactly leaves the cursor on its last
+                    # character, which clearing to the end of the row would erase.
+                    clear = CLEAR_LINE if len(strip_ansi_codes(new)) % columns else ""
+                    after = below - line_height + 1
+                    out.append(f"{CURSOR_UP.format(below)}\r{new}{clear}{CURSOR_DOWN.format(after)}\r")
+                below -= line_height
+        self.lines = lines
+        self.rows = rows
+        self.columns = columns
+        if out:
+            self.stream.write("".join(out))
+            self.stream.flush()
+
+    def close(self):
+        """
+        Restores the cursor; the last frame stays on screen.
+        """
+        if self.lines is not None:
+            self.stream.write(SHOW_CURSOR)
+            self.stream.flush()
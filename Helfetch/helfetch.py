@@ -3,67 +3,663 @@
 import sys
 import argparse
 import os
+import time
 
 # إضافة مسار مجلد السكريبت إلى sys.path
 script_dir = os.path.dirname(os.path.abspath(__file__))
 sys.path.append(script_dir)
 
+# المسار السريع: لو helfetchd شغّال نطبع اللقطة الجاهزة منه ونخرج قبل أي استيراد ثقيل
+# Fast path: if helfetchd is running, print its pre-rendered output before importing anything heavy.
+if __name__ == "__main__":
+    from utils.client import print_from_daemon
+    if print_from_daemon(sys.argv[1:]):
+        sys.exit(0)
+
 # استيراد الدوال من وحدات جمع المعلومات
-from core.system_info import get_system_info, get_inspirational_quote
-from core.hardware_info import get_hardware_info
-from core.desktop_info import get_desktop_info
-from core.network_info import get_network_info
+# (تُستورد وحدات المعلومات عند الحاجة فقط عبر سجل الحقول)
+from core.system_info import get_inspirational_quote
+from core.fields import module_fields, resolve_fields, probe_tasks, register_plugins, Caller, CALLER_FIELDS, FIELD_MODULES, VOLATILE_FIELDS, PLUGINS
+from core.scheduler import run_collectors
+from utils import cache, profiler
 
 # استيراد وحدات العرض والتنسيق
 from display.ascii_art import get_ascii_logo, COLORS
 from display.formatter import format_info_output
+from display.machine import format_machine_output, OUTPUT_FORMATS
+from display.terminal import LiveScreen, rendered_rows
 
 # استيراد الإعدادات الافتراضية
-from config.default_config import DEFAULT_COLORS
+from config import default_config, user_config
+from config.default_config import DEFAULT_COLORS, DEFAULT_TIMEOUTS, DEFAULT_MODULES, DEFAULT_FIELDS, DEFAULT_DAEMON_INTERVAL
 
-def main():
+# Options that need an in-process run; helfetchd declines requests that set them
+# (the client already keeps them local, see utils/client.py LOCAL_ONLY_OPTIONS).
+LOCAL_ONLY_ARGS = ('daemon', 'watch', 'no_cache', 'refresh', 'profile', 'record', 'timeout')
+
+# helfetchd re-collects every field (not only the volatile ones) this often, in seconds.
+DAEMON_FULL_REFRESH = 60
+
+# Rendered outputs helfetchd keeps between refreshes (one per set of options and client session)
+DAEMON_MAX_OUTPUTS = 64
+
+def collect(fields, timeouts, on_result=None, caller=None):
     """
-    The main function to run Helfetch.
-    It collects all system information, formats it with the logo, and prints it.
-    Supports command-line arguments for customization.
+    Collects the requested fields concurrently and returns them in the requested order.
+    'on_result' is called with each collector's values as soon as they arrive; 'caller'
+    is the process the CALLER_FIELDS are collected for (default: this one).
+    """
+    tasks = probe_tasks(fields, timeouts, caller=caller)
+    collected = run_collectors(tasks, fallback=cache.stale, on_result=on_result)
+    return {field: collected[field] for field in fields if field in collected}
+
+def can_draw_progressively(args):
+    """
+    Returns True if the output can be drawn progressively: text output to a
+    terminal that understands cursor movements, unless disabled.
+    """
+    if args.no_progressive or not default_config.DEFAULT_PROGRESSIVE:
+        return False
+    if args.format != "text" or args.watch:
+        return False
+    return sys.stdout.isatty() and os.getenv('TERM', 'dumb') != 'dumb'
+
+def collect_progressively(fields, timeouts, render):
+    """
+    Collects the fields like collect() while drawing them: the logo and a
+    placeholder for every field right away, then each line in place as soon as
+    its collector finishes. The last frame stays on screen.
+
+    Returns:
+        dict: The collected information, or None if the output is too tall to be
+              redrawn in place (nothing has been drawn then).
+    """
+    import shutil
+    from display.formatter import PLACEHOLDER
+
+    info = dict.fromkeys(fields, PLACEHOLDER)
+    frame = render(info)
+    # Relative cursor movements can't reach rows that scrolled off the top (wrapped lines count per row).
+    if rendered_rows(frame) >= shutil.get_terminal_size().lines:
+        return None
+
+    def on_result(data):
+        info.update((field, value) for field, value in data.items() if field in info)
+        screen.draw(render(info))
+
+    screen = LiveScreen()
+    try:
+        screen.draw(frame)
+        all_info = collect(fields, timeouts, on_result)
+        screen.draw(render(all_info))
+    finally:
+        screen.close()
+    return all_info
+
+def watch(all_info, fields, timeouts, interval, render):
+    """
+    Keeps refreshing the volatile fields (RAM, Disk, Uptime, CPU usage, ...) every
+    'interval' seconds and redraws only the lines that changed, with a sparkline
+    of their recent samples. Static fields keep the values from the first collection.
+    """
+    from core.sampler import History
+
+    volatile_fields = [field for field in fields if field in VOLATILE_FIELDS]
+    history = History()
+    history.record(all_info)
+    screen = LiveScreen()
+    try:
+        while True:
+            screen.draw(render(all_info, history))
+            time.sleep(interval)
+            if volatile_fields:
+                updated = collect(volatile_fields, timeouts)
+                history.record(updated)
+                all_info.update(updated)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        screen.close()
+
+def build_parser():
     """
+    Builds the command-line parser (shared by the CLI and helfetchd).
+    """
+    # No abbreviated options: the client decides from the exact option names
+    # (utils/client.py LOCAL_ONLY_OPTIONS) whether a run can be served by helfetchd.
     parser = argparse.ArgumentParser(
-        description="A custom system information fetcher for Helwan Linux."
+        description="A custom system information fetcher for Helwan Linux.",
+        allow_abbrev=False
     )
     parser.add_argument(
         "--no-logo",
         action="store_true",
         help="Do not display the Helwan Linux ASCII art logo."
     )
-    args = parser.parse_args()
+    parser.add_argument(
+        "--timeout",
+        type=float,
+        metavar="SECONDS",
+        help="Time budget for every collector, overriding the configured defaults."
+    )
+    parser.add_argument(
+        "--no-cache",
+        action="store_true",
+        help="Do not read or write the result cache."
+    )
+    parser.add_argument(
+        "--refresh",
+        action="store_true",
+        help="Ignore cached results and collect everything again."
+    )
+    parser.add_argument(
+        "--fields",
+        metavar="FIELD[,FIELD...]",
+        help="Only collect and show these fields, in this order (e.g. CPU,RAM,Uptime)."
+    )
+    parser.add_argument(
+        "--format",
+        choices=OUTPUT_FORMATS,
+        default="text",
+        help="Output format. 'json', 'ndjson' and 'env' print raw typed values without logo, colors or quote."
+    )
+    parser.add_argument(
+        "--watch",
+        type=float,
+        metavar="INTERVAL",
+        help="Keep running and refresh the volatile fields every INTERVAL seconds."
+    )
+    parser.add_argument(
+        "--daemon",
+        action="store_true",
+        help="Run helfetchd: keep a warm snapshot and serve it to other helfetch runs over a Unix socket."
+    )
+    parser.add_argument(
+        "--record",
+        action="store_true",
+        help="Also append this run's RAM, Disk, package count, kernel and uptime to the "
+             "history log (see 'helfetch history')."
+    )
+    parser.add_argument(
+        "--no-progressive",
+        action="store_true",
+        help="Print the output at once when everything is collected, instead of line by line as it arrives."
+    )
+    parser.add_argument(
+        "--no-plugins",
+        action="store_true",
+        help="Do not load plugin modules (from ~/.config/helfetch/modules or installed packages)."
+    )
+    parser.add_argument(
+        "--profile",
+        nargs="?",
+        const="table",
+        choices=["table", "json"],
+        help="Print per-probe timings, bytes read, spawned commands, "
+             "cache hits and failure reasons to stderr (as a table or JSON)."
+    )
+    return parser
 
-    system_data = get_system_info()
-    hardware_data = get_hardware_info()
-    desktop_data = get_desktop_info()
-    network_data = get_network_info()
-    
-    inspirational_quote = get_inspirational_quote()
+def select_fields(args):
+    """
+    Returns the fields to show: --fields if given, else those of the enabled modules
+    followed by those of the registered plugins.
 
-    all_info = {
-        **system_data,
-        **hardware_data,
-        **desktop_data,
-        **network_data
-    }
+    Raises:
+        ValueError: If --fields names an unknown field.
+    """
+    if args.fields:
+        return resolve_fields(args.fields.split(','))
+    if DEFAULT_FIELDS:
+        # From config.toml; names it can't resolve (e.g. of a removed plugin) are skipped.
+        return [field for name in DEFAULT_FIELDS for field in _resolve_configured(name)]
+    plugin_fields = [] if args.no_plugins else module_fields(PLUGINS)
+    fields = module_fields(DEFAULT_MODULES)
+    if args.watch and 'sensors' not in DEFAULT_MODULES:
+        # Watch mode also shows the live CPU readings, after the hardware fields.
+        sensors = module_fields(['sensors'])
+        position = max((i + 1 for i, field in enumerate(fields) if FIELD_MODULES[field] == 'hardware'), default=len(fields))
+        fields = fields[:position] + sensors + fields[position:]
+    return fields + plugin_fields
+
+def _resolve_configured(name):
+    try:
+        return resolve_fields([name])
+    except ValueError:
+        return []
+
+def render(all_info, args, inspirational_quote, history=None):
+    """
+    Renders the collected information in the output format selected by 'args'.
+    """
+    if args.format != "text":
+        return format_machine_output(all_info, args.format)
 
     helwan_logo = None
-    if not args.no_logo:
-        helwan_logo = get_ascii_logo("Helwan Linux")
+    if not args.no_logo and default_config.DEFAULT_LOGO:
+        helwan_logo = get_ascii_logo("Helwan Linux", DEFAULT_COLORS["logo_color"])
 
-    formatted_output = format_info_output(
+    return format_info_output(
         info_data=all_info,
         logo_lines=helwan_logo,
         inspirational_quote=inspirational_quote,
         info_key_color=DEFAULT_COLORS["info_key_color"],
-        info_value_color=DEFAULT_COLORS["info_value_color"]
+        info_value_color=DEFAULT_COLORS["info_value_color"],
+        history=history
+    )
+
+def print_profile(args):
+    """
+    Prints the --profile report to stderr, so it never mixes with machine-readable output,
+    and turns profiling off.
+    """
+    if args.profile:
+        profiler.disable()
+        sys.stdout.flush()
+        print(profiler.format_report(args.profile), file=sys.stderr)
+
+def record_history(all_info, timeouts):
+    """
+    Appends the snapshot to the history log (--record). Recorded fields that
+    weren't shown (e.g. with --fields) are collected for it too.
+    """
+    from utils import history
+
+    snapshot = dict(all_info)
+    missing = [field for field in history.FIELDS if field not in snapshot]
+    if missing:
+        snapshot.update(collect(missing, timeouts))
+    try:
+        history.record(snapshot)
+    except (OSError, history.HistoryError) as e:
+        print(f"helfetch: can't record the snapshot: {e}", file=sys.stderr)
+
+def run_daemon(parser, timeouts):
+    """
+    Runs helfetchd. The snapshot's volatile fields are refreshed every
+    DEFAULT_DAEMON_INTERVAL seconds and the rest every DAEMON_FULL_REFRESH seconds;
+    rendered outputs are cached until the snapshot or config.toml changes.
+    The CALLER_FIELDS (shell, terminal, desktop session) are never part of the
+    snapshot: they are collected for each client from its pid and environment,
+    and the outputs are cached per set of options and values of those fields.
+    """
+    import threading
+    from utils.daemon import serve
+
+    lock = threading.Lock()
+    shared_fields = [field for field in module_fields(DEFAULT_MODULES) + module_fields(PLUGINS)
+                     if field not in CALLER_FIELDS]
+    snapshot = {
+        'info': collect(shared_fields, timeouts),
+        'quote': get_inspirational_quote(),
+        'parsed': {},   # argv -> (args, fields)
+        'rendered': {}, # (argv, client field values) -> output
+        'full_refresh_at': time.monotonic() + DAEMON_FULL_REFRESH,
+    }
+    cache.save()
+
+    def refresh():
+        if user_config.load_and_apply(report=False):
+            # config.toml changed: drop the outputs rendered with the old settings.
+            with lock:
+                snapshot['parsed'] = {}
+                snapshot['rendered'] = {}
+        with lock:
+            fields = list(snapshot['info'])
+        if time.monotonic() >= snapshot['full_refresh_at']:
+            snapshot['full_refresh_at'] = time.monotonic() + DAEMON_FULL_REFRESH
+            updated = collect(fields, timeouts)
+            cache.save()
+        else:
+            updated = collect([field for field in fields if field in VOLATILE_FIELDS], timeouts)
+        with lock:
+            if any(str(value) != str(snapshot['info'].get(field)) for field, value in updated.items()):
+                snapshot['info'].update(updated)
+                snapshot['quote'] = get_inspirational_quote()
+                snapshot['rendered'] = {}
+
+    def handle(argv, pid, env):
+        with lock:
+            parsed = snapshot['parsed'].get(tuple(argv))
+        if parsed is None:
+            try:
+                args = parser.parse_args(argv)
+                parsed = (args, select_fields(args))
+            except (SystemExit, ValueError):
+                return None
+            if any(getattr(args, name) not in (None, False) for name in LOCAL_ONLY_ARGS):
+                return None
+            with lock:
+                snapshot['parsed'][tuple(argv)] = parsed
+        args, fields = parsed
+
+        client_fields = [field for field in fields if field in CALLER_FIELDS]
+        if client_fields and (pid is None or env is None):
+            return None # Only the client itself can tell its shell, terminal and session
+        client_info = collect(client_fields, timeouts, caller=Caller(pid, env)) if client_fields else {}
+        key = (tuple(argv), tuple(str(value) for value in client_info.values()))
+        with lock:
+            if key in snapshot['rendered']:
+                return snapshot['rendered'][key]
+            missing = [field for field in fields if field not in snapshot['info'] and field not in CALLER_FIELDS]
+        if missing:
+            # Fields outside the default modules are collected on first use, then kept warm.
+            collected = collect(missing, timeouts)
+            with lock:
+                snapshot['info'].update(collected)
+        with lock:
+            all_info = {}
+            for field in fields:
+                if field in client_info:
+                    all_info[field] = client_info[field]
+                elif field in snapshot['info']:
+                    all_info[field] = snapshot['info'][field]
+            output = render(all_info, args, snapshot['quote']) + "\n"
+            if len(snapshot['rendered']) >= DAEMON_MAX_OUTPUTS:
+                snapshot['rendered'] = {}
+            snapshot['rendered'][key] = output
+        return output
+
+    serve(handle, refresh, DEFAULT_DAEMON_INTERVAL)
+
+def fleet_command(argv):
+    """
+    'helfetch fleet': collects a summary from many hosts in parallel and prints
+    it as an aggregated table, or streams one NDJSON record per host as they finish.
+
+    Returns:
+        int: The exit status (1 if any host failed).
+    """
+    from utils.fleet import read_hosts, run_fleet, FLEET_FIELDS
+
+    parser = argparse.ArgumentParser(
+        prog="helfetch fleet",
+        description="Collect helfetch summaries from many hosts over SSH, in parallel."
+    )
+    parser.add_argument(
+        "hosts",
+        nargs="*",
+        metavar="HOST",
+        help="[user@]hostname to query over SSH, or local:ROOT to run the collectors against a fixture root."
+    )
+    parser.add_argument(
+        "-f", "--hosts-file",
+        metavar="FILE",
+        help="Read hosts from FILE, one per line ('#' starts a comment)."
+    )
+    parser.add_argument(
+        "-j", "--jobs",
+        type=int,
+        default=16,
+        help="Maximum number of hosts queried at the same time (default: 16)."
+    )
+    parser.add_argument(
+        "--timeout",
+        type=float,
+        default=30.0,
+        metavar="SECONDS",
+        help="Time budget for each host, including the SSH connection (default: 30)."
+    )
+    parser.add_argument(
+        "--fields",
+        metavar="FIELD[,FIELD...]",
+        help=f"Fields to collect (default: {','.join(FLEET_FIELDS)})."
+    )
+    parser.add_argument(
+        "--format",
+        choices=["table", "ndjson"],
+        default="table",
+        help="'table' prints an aggregated table at the end; 'ndjson' streams one record per host as it arrives."
+    )
+    args = parser.parse_args(argv)
+    register_plugins() # So that --fields accepts plugin fields
+
+    hosts = list(args.hosts)
+    try:
+        if args.hosts_file:
+            hosts += read_hosts(args.hosts_file)
+        fields = resolve_fields(args.fields.split(',')) if args.fields else FLEET_FIELDS
+    except (OSError, ValueError) as e:
+        parser.error(str(e))
+    if not hosts:
+        parser.error("no hosts given")
+
+    records = []
+    for record in run_fleet(hosts, fields, jobs=args.jobs, timeout=args.timeout):
+        records.append(record)
+        if args.format == "ndjson":
+            import json
+            print(json.dumps(record, ensure_ascii=False), flush=True)
+
+    if args.format == "table":
+        from display.fleet import format_fleet_table
+        print(format_fleet_table(records, fields))
+    return 0 if all(record['ok'] for record in records) else 1
+
+def history_command(argv):
+    """
+    'helfetch history': shows how the fields recorded with --record changed
+    over time, as a table or as one sparkline per field.
+
+    Returns:
+        int: The exit status (1 if nothing was recorded in the range).
+    """
+    from utils import history
+    from display.history import format_history_table, format_history_line, format_history_sparklines
+
+    parser = argparse.ArgumentParser(
+        prog="helfetch history",
+        description="Show how the snapshots recorded with 'helfetch --record' changed over time."
+    )
+    parser.add_argument(
+        "--field",
+        action="append",
+        choices=list(history.FIELDS),
+        help="A field to show; repeat for several (default: all recorded fields)."
     )
+    parser.add_argument(
+        "--since",
+        metavar="AGE|DATE",
+        help="Only show runs from the last AGE (e.g. 30d, 12h, 2w) or since DATE (YYYY-MM-DD)."
+    )
+    parser.add_argument(
+        "--format",
+        choices=["table", "sparkline"],
+        default="table",
+        help="'table' lists the runs whose values changed; 'sparkline' prints one line per field."
+    )
+    args = parser.parse_args(argv)
+
+    fields = args.field or list(history.FIELDS)
+    try:
+        since = history.parse_since(args.since) if args.since else None
+    except ValueError as e:
+        parser.error(str(e))
+
+    try:
+        log = history.HistoryLog()
+    except history.HistoryError as e:
+        print(f"helfetch history: {e}", file=sys.stderr)
+        return 1
+    with log:
+        if args.format == "table":
+            output = format_history_table(log.rows(fields, since), fields)
+        else:
+            import shutil
+            width = shutil.get_terminal_size().columns - max(len(field) for field in fields) - 2
+            lines = [(field, format_history_line(field, log.scan(field, since), width)) for field in fields]
+            lines = [(field, line) for field, line in lines if line is not None]
+            output = format_history_sparklines(lines) if lines else None
+    if output is None:
+        print(f"helfetch history: no recorded runs{' in this range' if since else ''}; "
+              f"record them with 'helfetch --record' (log: {history.history_file()})", file=sys.stderr)
+        return 1
+    print(output)
+    return 0
+
+def diff_command(argv):
+    """
+    'helfetch diff': compares snapshots (--format json/ndjson output or fleet
+    NDJSON dumps) with a baseline and prints the changed fields, grouped by
+    collector. Hosts of a fleet baseline are matched by name.
+
+    Returns:
+        int: 0 if nothing changed, 1 if something did (or has no baseline),
+             2 if the baseline can't be read (like diff).
+    """
+    import json
+    from utils.diff import diff_snapshots, group_by_collector, SnapshotError
+    from display.diff import format_snapshot_diff, format_diff_summary
+
+    parser = argparse.ArgumentParser(
+        prog="helfetch diff",
+        description="Compare helfetch snapshots (e.g. 'helfetch --format json' output or "
+                    "'helfetch fleet --format ndjson' dumps) with a baseline."
+    )
+    parser.add_argument(
+        "baseline",
+        metavar="BASELINE",
+        help="The baseline snapshot, or a fleet dump whose hosts are matched by name."
+    )
+    parser.add_argument(
+        "targets",
+        nargs="+",
+        metavar="SNAPSHOT",
+        help="Snapshot files or dumps to compare, or directories of them (*.json, *.ndjson)."
+    )
+    parser.add_argument(
+        "--all",
+        action="store_true",
+        help="Also compare the volatile fields (RAM, Disk, Uptime, sensor readings, ...)."
+    )
+    parser.add_argument(
+        "--changed-only",
+        action="store_true",
+        help="Leave out the snapshots that have no changes."
+    )
+    parser.add_argument(
+        "--format",
+        choices=["text", "ndjson"],
+        default="text",
+        help="'text' groups the changes per snapshot and ends with a summary; "
+             "'ndjson' streams one record per snapshot."
+    )
+    args = parser.parse_args(argv)
+    register_plugins() # So that plugin fields are grouped under their plugin
+
+    ignore = set() if args.all else set(VOLATILE_FIELDS)
+    compared = changed = unmatched = 0
+    field_counts = {}
+    try:
+        for result in diff_snapshots(args.baseline, args.targets, ignore):
+            groups = group_by_collector(result['changes'])
+            if result['baseline'] is None:
+                unmatched += 1
+            else:
+                compared += 1
+                if result['changes']:
+                    changed += 1
+                for field, _, _ in result['changes']:
+                    field_counts[field] = field_counts.get(field, 0) + 1
+            if args.changed_only and result['baseline'] is not None and not result['changes']:
+                continue
+            if args.format == "ndjson":
+                record = {'name': result['name'], 'baseline': result['baseline'], 'changes': {
+                    collector: {field: {'old': old, 'new': new} for field, old, new in changes}
+                    for collector, changes in groups
+                }}
+                if 'error' in result:
+                    record['error'] = result['error']
+                print(json.dumps(record, ensure_ascii=False), flush=True)
+            else:
+                print(format_snapshot_diff(result, groups), flush=True)
+    except SnapshotError as e:
+        print(f"helfetch diff: {e}", file=sys.stderr)
+        return 2
+
+    if args.format == "text":
+        print()
+        print(format_diff_summary(compared, changed, unmatched, field_counts))
+    return 1 if changed or unmatched else 0
+
+# Subcommands: 'helfetch <command> [options]'. Everything else is the regular fetch.
+COMMANDS = {
+    'fleet': fleet_command,
+    'history': history_command,
+    'diff': diff_command,
+}
+
+def main():
+    """
+    The main function to run Helfetch.
+    It collects all system information, formats it with the logo, and prints it.
+    Supports command-line arguments for customization.
+    """
+    if len(sys.argv) > 1 and sys.argv[1] in COMMANDS:
+        sys.exit(COMMANDS[sys.argv[1]](sys.argv[2:]))
+
+    user_config.load_and_apply()
+    parser = build_parser()
+    args = parser.parse_args()
+
+    cache.configure(enabled=not args.no_cache, refresh=args.refresh)
+    if args.profile:
+        profiler.enable()
+    if not args.no_plugins:
+        register_plugins()
+
+    try:
+        fields = select_fields(args)
+    except ValueError as e:
+        parser.error(str(e))
+
+    timeouts = dict(DEFAULT_TIMEOUTS)
+    if args.timeout is not None:
+        timeouts = {name: args.timeout for name in list(timeouts) + list(PLUGINS)}
+
+    if args.daemon:
+        run_daemon(parser, timeouts)
+        return
+
+    if can_draw_progressively(args):
+        inspirational_quote = get_inspirational_quote()
+        all_info = collect_progressively(fields, timeouts, lambda info: render(info, args, inspirational_quote))
+        if all_info is not None:
+            if args.record:
+                record_history(all_info, timeouts)
+            cache.save()
+            print_profile(args)
+            return
+
+    all_info = collect(fields, timeouts)
+    if args.record:
+        record_history(all_info, timeouts)
+    cache.save()
+
+    if args.format != "text":
+        if args.watch:
+            # Machine formats print one full record per refresh (e.g. an NDJSON stream).
+            try:
+                while True:
+                    print(render(all_info, args, ""), flush=True)
+                    time.sleep(args.watch)
+                    all_info.update(collect([f for f in fields if f in VOLATILE_FIELDS], timeouts))
+            except KeyboardInterrupt:
+                pass
+        else:
+            sys.stdout.write(render(all_info, args, "") + "\n")
+            print_profile(args)
+        return
+
+    inspirational_quote = get_inspirational_quote()
+
+    if args.watch:
+        watch(all_info, fields, timeouts, args.watch, lambda info, history: render(info, args, inspirational_quote, history))
+        return
 
-    print(formatted_output)
+    # The whole output in one write, so a pipe or file never sees a partial frame.
+    sys.stdout.write(render(all_info, args, inspirational_quote) + "\n")
+    print_profile(args)
 
 if __name__ == "__main__":
     try:
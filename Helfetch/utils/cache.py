@@ -0,0 +1,232 @@
+# utils/cache.py
+
+import os
+import time
+import threading
+
+from utils import profiler
+from utils.helpers import host_path
+
+# Validity policies for cached fields:
+#   ('boot',)             -> valid until the next reboot (keyed on the kernel boot_id)
+#   ('ttl', seconds)      -> valid for a fixed number of seconds
+#   ('mtime', path, ...)  -> valid until one of the given paths changes (or appears/disappears)
+#   ('session',)          -> valid for the current graphical session (same boot and
+#                            same SESSION_VARIABLES)
+#   ('session', env)      -> the same for the session of another environment (a dict,
+#                            e.g. a helfetchd client's)
+#   ('context', values, policy)
+#                         -> valid while 'policy' holds and 'values' (a tuple of strings,
+#                            e.g. the environment variables the value depends on) are
+#                            unchanged; 'policy' is any of the above but 'ttl'
+BOOT = ('boot',)
+SESSION = ('session',)
+
+# Environment variables that identify a graphical session.
+SESSION_VARIABLES = ('XDG_SESSION_ID', 'XDG_CURRENT_DESKTOP', 'DISPLAY', 'WAYLAND_DISPLAY',
+                     'SWAYSOCK', 'HYPRLAND_INSTANCE_SIGNATURE')
+
+BOOT_ID_PATH = host_path('/proc/sys/kernel/random/boot_id')
+
+_lock = threading.Lock()
+_entries = None
+_dirty = False
+_enabled = True
+_refresh = False
+
+
+class Uncacheable(Exception):
+    """
+    Raised by a compute function whose result must not be stored (e.g. a lookup
+    that failed and fell back to 'N/A'): cached() returns 'value' instead.
+    """
+
+    def __init__(self, value):
+        super().__init__(value)
+        self.value = value
+
+
+def cache_dir():
+    """
+    Returns the helfetch cache directory ($XDG_CACHE_HOME/helfetch).
+    """
+    base = os.getenv('XDG_CACHE_HOME') or os.path.expanduser('~/.cache')
+    return os.path.join(base, 'helfetch')
+
+
+def cache_file():
+    return os.path.join(cache_dir(), 'results.json')
+
+
+def configure(enabled=True, refresh=False):
+    """
+    Sets the cache mode for this run.
+
+    Args:
+        enabled (bool): If False, the cache is neither read nor written (--no-cache).
+        refresh (bool): If True, cached values are ignored but fresh ones are stored (--refresh).
+    """
+    global _enabled, _refresh
+    _enabled = enabled
+    _refresh = refresh
+
+
+def is_enabled():
+    """
+    Returns False when running with --no-cache.
+    """
+    return _enabled
+
+
+def _load():
+    global _entries
+    if _entries is None:
+        import json
+        try:
+            with open(cache_file(), 'r') as f:
+                _entries = json.load(f)
+            if not isinstance(_entries, dict):
+                _entries = {}
+        except (OSError, ValueError):
+            _entries = {}
+    return _entries
+
+
+def _validity_key(policy):
+    """
+    Computes the cheap, stat-based key that a cached entry must match to be valid.
+    """
+    kind = policy[0]
+    if kind == 'boot':
+        try:
+            with open(BOOT_ID_PATH, 'r') as f:
+                return f.read().strip()
+        except OSError:
+            return None
+    if kind == 'session':
+        boot_id = _validity_key(BOOT)
+        if boot_id is None:
+            return None
+        env = policy[1] if len(policy) > 1 else os.environ
+        return [boot_id] + [env.get(name) for name in SESSION_VARIABLES]
+    if kind == 'mtime':
+        key = []
+        for path in policy[1:]:
+            try:
+                key.append(os.stat(path).st_mtime_ns)
+            except OSError:
+                key.append(None)
+        return key
+    if kind == 'context':
+        key = _validity_key(policy[2])
+        return None if key is None else [list(policy[1]), key]
+    return None
+
+
+def _is_fresh(entry, policy, key):
+    if policy[0] == 'ttl':
+        return time.time() - entry.get('time', 0) < policy[1]
+    return key is not None and entry.get('key') == key
+
+
+def cached(fields, policy, compute):
+    """
+    Returns the cached value of one or more fields, recomputing it when stale.
+
+    Args:
+        fields (str or tuple): A single field name, or a tuple of field names that are
+                               computed together (then 'compute' must return a dict).
+        policy (tuple): One of the validity policies described at the top of this module.
+        compute (callable): Computes the fresh value when the cache can't be used.
+                            It may raise Uncacheable to return a value without storing it.
+
+    Returns:
+        The cached or freshly computed value (a dict for a tuple of fields).
+    """
+    global _dirty
+    if not _enabled:
+        try:
+            return compute()
+        except Uncacheable as e:
+            return e.value
+
+    names = fields if isinstance(fields, tuple) else (fields,)
+    key = _validity_key(policy)
+    with _lock:
+        entries = _load()
+        if not _refresh:
+            hits = [entries.get(name) for name in names]
+            if all(hit is not None and _is_fresh(hit, policy, key) for hit in hits):
+                profiler.note_cache('hit')
+                if isinstance(fields, tuple):
+                    return {name: hit['value'] for name, hit in zip(names, hits)}
+                return hits[0]['value']
+
+    profiler.note_cache('miss')
+    try:
+        value = compute()
+    except Uncacheable as e:
+        return e.value
+    now = time.time()
+    with _lock:
+        entries = _load()
+        if isinstance(fields, tuple):
+            for name in names:
+                entries[name] = {'value': value.get(name), 'key': key, 'time': now}
+        else:
+            entries[fields] = {'value': value, 'key': key, 'time': now}
+        _dirty = True
+    return value
+
+
+def invalidate(fields):
+    """
+    Drops the cached value of one or more fields, e.g. when a cheap check after
+    a cache hit shows that it no longer holds.
+    """
+    global _dirty
+    if not _enabled:
+        return
+    names = fields if isinstance(fields, tuple) else (fields,)
+    with _lock:
+        entries = _load()
+        for name in names:
+            if entries.pop(name, None) is not None:
+                _dirty = True
+
+
+def stale(field):
+    """
+    Returns the last cached value of a field regardless of its validity, or None.
+    Used as a fallback for fields whose collector missed its deadline.
+    """
+    if not _enabled:
+        return None
+    with _lock:
+        entry = _load().get(field)
+    if entry is None or not isinstance(entry.get('value'), str):
+        return None
+    return entry['value']
+
+
+def save():
+    """
+    Writes the cache back to disk if anything changed during this run.
+    """
+    global _dirty
+    if not _enabled:
+        return
+    import json
+    with _lock:
+        if not _dirty:
+            return
+        data = json.dumps(_entries)
+        _dirty = False
+    try:
+        os.makedirs(cache_dir(), exist_ok=True)
+        tmp_path = f"{cache_file()}.{os.getpid()}.tmp"
+        with open(tmp_path, 'w') as f:
+            f.write(data)
+        os.replace(tmp_path, cache_file())
+    except OSError:
+        pass # مجلد الكاش غير قابل للكتابة، نتجاهل ببساطة
@@ -0,0 +1,132 @@
+# utils/client.py
+
+# The thin client for helfetchd. It only uses the 'os', 'sys' and 'socket'
+# modules so that a terminal with a running daemon never pays for importing
+# the collectors, argparse or the formatter.
+
+import os
+import sys
+import socket
+
+SOCKET_NAME = 'helfetch.sock'
+
+# Options that need a live, in-process run and are never sent to the daemon.
+# The CLI parser doesn't accept abbreviations, so the exact names are enough.
+LOCAL_ONLY_OPTIONS = {'--daemon', '--watch', '--no-cache', '--refresh', '--profile', '--record', '--timeout',
+                      '-h', '--help'}
+
+# The client's environment variables the daemon needs for the fields that
+# describe the client rather than the machine (core/fields.py CALLER_FIELDS):
+# its shell and terminal, its desktop and graphical session.
+CLIENT_VARIABLES = (
+    'SHELL', 'TERM', 'COLORTERM', 'TERM_PROGRAM', 'TERM_PROGRAM_VERSION',
+    'XDG_CURRENT_DESKTOP', 'XDG_SESSION_TYPE', 'XDG_SESSION_ID', 'DISPLAY', 'WAYLAND_DISPLAY',
+    'HYPRLAND_INSTANCE_SIGNATURE', 'SWAYSOCK', 'NIRI_SOCKET', 'WAYFIRE_SOCKET', 'I3SOCK',
+)
+
+# Response header sent by the daemon before the rendered output.
+OK_HEADER = b'OK\n'
+
+CONNECT_TIMEOUT = 0.2
+READ_TIMEOUT = 2.0
+
+
+def socket_path():
+    """
+    Returns the daemon socket path ($XDG_RUNTIME_DIR/helfetch.sock), or None
+    if there is no per-user runtime directory.
+    """
+    runtime_dir = os.getenv('XDG_RUNTIME_DIR')
+    if not runtime_dir:
+        return None
+    return os.path.join(runtime_dir, SOCKET_NAME)
+
+
+def encode_request(argv, env=None):
+    # One argument per line; arguments can't contain newlines on a command line
+    # that the daemon would accept anyway. The environment follows as NUL-prefixed
+    # NAME=value lines (NUL can't appear in an argument), after a lone NUL line.
+    lines = list(argv)
+    if env is not None:
+        lines.append("\0")
+        lines.extend(f"\0{name}={value}" for name, value in env.items() if "\n" not in value)
+    return ("\n".join(lines) + "\n\n").encode('utf-8', 'surrogateescape')
+
+
+def decode_request(data):
+    """
+    Returns (argv, env) from a request; 'env' is None if the client sent none.
+    """
+    text = data.decode('utf-8', 'surrogateescape')
+    argv = []
+    env = None
+    for line in text.split("\n"):
+        if line.startswith("\0"):
+            env = {} if env is None else env
+            name, sep, value = line[1:].partition("=")
+            if sep:
+                env[name] = value
+        elif line:
+            argv.append(line)
+    return argv, env
+
+
+def client_environment():
+    """
+    Returns the CLIENT_VARIABLES that are set in this process.
+    """
+    return {name: os.environ[name] for name in CLIENT_VARIABLES if name in os.environ}
+
+
+def fetch_from_daemon(argv):
+    """
+    Asks a running helfetchd for the rendered output of 'helfetch <argv>'.
+
+    Returns:
+        bytes: The rendered output, or None if the daemon isn't running, can't
+               handle these options, or doesn't answer in time.
+    """
+    if any(arg.split('=')[0] in LOCAL_ONLY_OPTIONS for arg in argv):
+        return None
+    if argv and not argv[0].startswith('-'):
+        return None # Subcommands (e.g. 'helfetch fleet') always run locally
+    path = socket_path()
+    if not path:
+        return None
+    try:
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as s:
+            s.settimeout(CONNECT_TIMEOUT)
+            s.connect(path)
+            s.settimeout(READ_TIMEOUT)
+            s.sendall(encode_request(argv, client_environment()))
+            chunks = []
+            while True:
+                chunk = s.recv(65536)
+                if not chunk:
+                    break
+                chunks.append(chunk)
+    except OSError:
+        return None
+    response = b"".join(chunks)
+    if not response.startswith(OK_HEADER):
+        return None
+    return response[len(OK_HEADER):]
+
+
+def print_from_daemon(argv):
+    """
+    Prints the daemon's output for 'argv' to stdout.
+
+    Returns:
+        bool: True if the daemon answered, False if helfetch must run in-process.
+    """
+    output = fetch_from_daemon(argv)
+    if output is None:
+        return False
+    stdout = getattr(sys.stdout, 'buffer', None)
+    if stdout is not None:
+        stdout.write(output)
+        stdout.flush()
+    else:
+        sys.stdout.write(output.decode('utf-8', 'replace'))
+    return True
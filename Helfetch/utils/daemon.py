@@ -0,0 +1,116 @@
+# utils/daemon.py
+
+# helfetchd: a per-user daemon that keeps a warm snapshot of the collected
+# information and serves rendered output over a Unix socket (see utils/client.py).
+# Each request comes with the client's pid (from the socket's peer credentials)
+# and its environment, for the fields that describe the client itself.
+
+import os
+import signal
+import socket
+import struct
+import sys
+import threading
+import time
+
+from utils.client import socket_path, decode_request, OK_HEADER
+
+MAX_REQUEST_SIZE = 65536
+
+
+def _is_running(path):
+    try:
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as s:
+            s.settimeout(0.2)
+            s.connect(path)
+        return True
+    except OSError:
+        return False
+
+
+def _read_request(conn):
+    data = b""
+    while not data.endswith(b"\n\n") and len(data) < MAX_REQUEST_SIZE:
+        chunk = conn.recv(4096)
+        if not chunk:
+            break
+        data += chunk
+    return decode_request(data)
+
+
+def _peer_pid(conn):
+    """
+    Returns the pid of the process on the other end of a Unix socket, or None.
+    """
+    try:
+        credentials = conn.getsockopt(socket.SOL_SOCKET, socket.SO_PEERCRED, struct.calcsize('3i'))
+    except (AttributeError, OSError):
+        return None # Not Linux
+    pid = struct.unpack('3i', credentials)[0]
+    return pid or None
+
+
+def _serve_connection(conn, handle):
+    with conn:
+        try:
+            conn.settimeout(2.0)
+            argv, env = _read_request(conn)
+            output = handle(argv, _peer_pid(conn), env)
+            if output is not None:
+                conn.sendall(OK_HEADER + output.encode('utf-8'))
+            # With no output the client gets an empty reply and runs in-process.
+        except Exception:
+            pass # A broken request must never bring the daemon down.
+
+
+def serve(handle, refresh, interval):
+    """
+    Runs the daemon until interrupted.
+
+    Args:
+        handle (callable): Called with the client's argument list, pid and environment
+                           (None when unknown); returns the rendered output as a
+                           string, or None to make the client fall back.
+        refresh (callable): Refreshes the snapshot; called every 'interval' seconds
+                            on a background thread.
+        interval (float): Seconds between snapshot refreshes.
+
+    Raises:
+        RuntimeError: If there is no runtime directory or a daemon is already running.
+    """
+    path = socket_path()
+    if not path:
+        raise RuntimeError("XDG_RUNTIME_DIR is not set, cannot create the helfetchd socket")
+    if os.path.exists(path):
+        if _is_running(path):
+            raise RuntimeError(f"helfetchd is already running on {path}")
+        os.unlink(path) # Stale socket left by a daemon that didn't exit cleanly
+
+    def refresher():
+        while True:
+            time.sleep(interval)
+            try:
+                refresh()
+            except Exception:
+                pass
+
+    # Clean up the socket when stopped by 'systemctl --user stop' or 'kill'.
+    signal.signal(signal.SIGTERM, lambda signum, frame: sys.exit(0))
+
+    server = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        server.bind(path)
+        os.chmod(path, 0o600)
+        server.listen(16)
+        threading.Thread(target=refresher, daemon=True).start()
+        while True:
+            conn, _ = server.accept()
+            threading.Thread(target=_serve_connection, args=(conn, handle), daemon=True).start()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.close()
+        try:
+            os.unlink(path)
+        except OSError:
+            pass
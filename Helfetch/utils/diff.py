@@ -0,0 +1,267 @@
+# utils/diff.py
+
+# Snapshot comparison for 'helfetch diff': what changed between helfetch
+# snapshots, e.g. "kernel changed, 40 new packages, GPU driver changed".
+# Snapshots are the JSON written by 'helfetch --format json' (or ndjson), or
+# the per-host records of a 'helfetch fleet --format ndjson' dump.
+#
+# The baseline file is indexed once: for each snapshot in it, the byte offset
+# of its record and a hash of every field's value. The compared snapshots are
+# then streamed one at a time and matched against the index field by field;
+# the baseline's values are only read back (from their offset) for the fields
+# that differ. Memory thus depends on the number of baseline snapshots, not on
+# the size of the dumps being compared.
+
+import hashlib
+import json
+import os
+from array import array
+
+# Files picked up when a directory is compared
+SNAPSHOT_EXTENSIONS = ('.json', '.ndjson', '.jsonl')
+
+
+class SnapshotError(Exception):
+    """
+    A snapshot file can't be read or isn't in a known format.
+    """
+
+
+def _canonical(value):
+    return json.dumps(value, sort_keys=True, ensure_ascii=False, separators=(',', ':'))
+
+
+def value_hash(value):
+    """
+    Returns a 64-bit digest of a JSON field value's canonical encoding: equal values
+    (in any key order) hash equally, and values of different types never do (unlike
+    hash(), where 1, 1.0 and True collide, and so do -1 and -2).
+    """
+    digest = hashlib.blake2b(_canonical(value).encode('utf-8'), digest_size=8).digest()
+    return int.from_bytes(digest, 'little', signed=True)
+
+
+# A missing field compares equal to null ('N/A'): snapshots taken with different
+# --fields don't differ in the fields only one of them has.
+NULL_HASH = value_hash(None)
+
+
+def fingerprint(info):
+    """
+    Returns {field: hash of its value} for a snapshot.
+    """
+    return {field: value_hash(value) for field, value in info.items()}
+
+
+def _parse_record(data):
+    """
+    Returns (host, info) for a fleet record line, or (None, data) for a plain snapshot.
+    'info' is None for a host that failed.
+    """
+    if isinstance(data, dict) and 'host' in data and 'ok' in data:
+        return data['host'], data.get('info') if data['ok'] else None
+    return None, data
+
+
+def iter_snapshots(path):
+    """
+    Streams the snapshots in a file.
+
+    Yields:
+        tuple: (name, offset, info). 'name' is the host of a fleet record, else the
+               file name (with ':LINE' when the file has one snapshot per line);
+               'offset' is the byte offset of the snapshot's line, or None when the
+               snapshot is the whole file; 'info' is the field dict (None for a
+               host that failed).
+
+    Raises:
+        SnapshotError: If the file can't be read or parsed.
+    """
+    base = os.path.basename(path)
+    try:
+        with open(path, 'rb') as f:
+            fields = {}       # '--format ndjson' lines: one field per line
+            pending = None    # The last plain snapshot, held back to name it
+            plain = 0
+            offset = 0
+            number = 0
+            for line in f:
+                line_offset = offset
+                offset += len(line)
+                if not line.strip():
+                    continue
+                number += 1
+                try:
+                    data = json.loads(line)
+                except ValueError:
+                    if number == 1:
+                        break # Not line-based: a pretty-printed JSON document
+                    raise SnapshotError(f"{path}:{number}: invalid JSON") from None
+                if isinstance(data, dict) and set(data) == {'field', 'value'}:
+                    fields[data['field']] = data['value']
+                    continue
+                host, info = _parse_record(data)
+                if host is not None:
+                    yield host, line_offset, info
+                    continue
+                if not isinstance(info, dict):
+                    raise SnapshotError(f"{path}:{number}: not a helfetch snapshot")
+                if pending is not None:
+                    yield f"{base}:{pending[0]}", pending[1], pending[2]
+                pending = (number, line_offset, info)
+                plain += 1
+            else:
+                if pending is not None:
+                    yield (base if plain == 1 else f"{base}:{pending[0]}"), pending[1], pending[2]
+                if fields:
+                    yield base, None, fields
+                return
+
+            f.seek(0)
+            try:
+                data = json.load(f)
+            except ValueError as e:
+                raise SnapshotError(f"{path}: invalid JSON: {e}") from None
+    except OSError as e:
+        raise SnapshotError(f"can't read {path}: {e.strerror}") from None
+    if not isinstance(data, dict):
+        raise SnapshotError(f"{path}: not a helfetch snapshot")
+    yield base, None, data
+
+
+def read_snapshot(path, offset):
+    """
+    Reads back one snapshot found by iter_snapshots() at 'offset'.
+    """
+    if offset is None:
+        for _, _, info in iter_snapshots(path):
+            return info
+        return {}
+    with open(path, 'rb') as f:
+        f.seek(offset)
+        return _parse_record(json.loads(f.readline()))[1]
+
+
+def expand_paths(paths, exclude=None):
+    """
+    Returns the snapshot files to compare: files as given, and the snapshot
+    files directly inside directories, sorted by name.
+    """
+    exclude = os.path.realpath(exclude) if exclude else None
+    files = []
+    for path in paths:
+        if os.path.isdir(path):
+            with os.scandir(path) as entries:
+                names = sorted(entry.path for entry in entries
+                               if entry.is_file() and entry.name.endswith(SNAPSHOT_EXTENSIONS))
+            files.extend(name for name in names if os.path.realpath(name) != exclude)
+        else:
+            files.append(path)
+    return files
+
+
+class SnapshotIndex:
+    """
+    The baseline snapshots of a file, by name: the offset of each one, its
+    field names and the hashes of its field values. The field name tuples are
+    shared between snapshots with the same fields, and the hashes are kept in
+    arrays, so an entry costs little more than its hashes.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        # name -> (fields, array of [offset, hash of each field]); offset -1 is the whole file
+        self.entries = {}
+        field_sets = {}
+        for name, offset, info in iter_snapshots(path):
+            if info is not None:
+                fields = tuple(info)
+                fields = field_sets.setdefault(fields, fields)
+                hashes = array('q', (value_hash(info[field]) for field in fields))
+                hashes.insert(0, -1 if offset is None else offset)
+                self.entries[name] = (fields, hashes)
+        if not self.entries:
+            raise SnapshotError(f"{path}: no snapshots")
+
+    def __len__(self):
+        return len(self.entries)
+
+    def match(self, name):
+        """
+        Returns the baseline snapshot name to compare 'name' against, or None: the
+        only one if the baseline has a single snapshot, else the one with that name.
+        """
+        if len(self.entries) == 1:
+            return next(iter(self.entries))
+        return name if name in self.entries else None
+
+    def compare(self, name, info, ignore=()):
+        """
+        Compares a snapshot with the baseline snapshot 'name'.
+
+        Returns:
+            list: (field, old value, new value) for each field that differs, in
+                  the baseline's field order (new fields last).
+        """
+        old_fields, hashes = self.entries[name]
+        old_hashes = dict(zip(old_fields, hashes[1:]))
+        new_hashes = fingerprint(info)
+        fields = list(old_hashes) + [field for field in new_hashes if field not in old_hashes]
+        changed = [field for field in fields
+                   if field not in ignore and old_hashes.get(field, NULL_HASH) != new_hashes.get(field, NULL_HASH)]
+        if not changed:
+            return []
+        old = read_snapshot(self.path, hashes[0] if hashes[0] >= 0 else None)
+        return [(field, old.get(field), info.get(field)) for field in changed]
+
+
+def group_by_collector(changes):
+    """
+    Groups changes by the module (or plugin) that collects each field, in
+    module order; fields unknown to this helfetch go under 'other'.
+
+    Returns:
+        list: (collector, [(field, old, new), ...]) pairs.
+    """
+    from core.fields import FIELD_MODULES, MODULE_PATHS, PLUGINS
+
+    order = list(MODULE_PATHS) + list(PLUGINS)
+    groups = {}
+    for change in changes:
+        groups.setdefault(FIELD_MODULES.get(change[0], 'other'), []).append(change)
+    return sorted(groups.items(), key=lambda item: order.index(item[0]) if item[0] in order else len(order))
+
+
+def diff_snapshots(baseline, paths, ignore=()):
+    """
+    Compares every snapshot in 'paths' (files or directories) with its baseline.
+
+    Args:
+        baseline (str): The baseline snapshot file (one snapshot, or a fleet dump
+                        whose hosts are matched by name).
+        paths (list): The snapshot files or directories to compare.
+        ignore (set): Fields left out of the comparison.
+
+    Yields:
+        dict: {'name', 'path', 'baseline', 'changes'}; 'baseline' is None for a
+              snapshot with nothing to compare against, in which case 'error'
+              says why. 'changes' is a list of (field, old, new).
+
+    Raises:
+        SnapshotError: If the baseline can't be read.
+    """
+    index = SnapshotIndex(baseline)
+    for path in expand_paths(paths, exclude=baseline):
+        try:
+            for name, _, info in iter_snapshots(path):
+                result = {'name': name, 'path': path, 'baseline': index.match(name), 'changes': []}
+                if info is None:
+                    result['baseline'] = None
+                    result['error'] = "no snapshot (the host failed)"
+                elif result['baseline'] is None:
+                    result['error'] = "not in the baseline"
+                else:
+                    result['changes'] = index.compare(result['baseline'], info, ignore)
+                yield result
+        except SnapshotError as e:
+            yield {'name': os.path.basename(path), 'path': path, 'baseline': None, 'changes': [], 'error': str(e)}
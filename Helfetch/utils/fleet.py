@@ -0,0 +1,125 @@
+# utils/fleet.py
+
+# Fleet mode: runs helfetch's collectors on many hosts at once and gathers
+# their JSON output. Remote hosts are reached over SSH, with one shared
+# (ControlMaster) connection per host that stays open between runs, and at
+# most 'jobs' hosts are queried at the same time. A "local:ROOT" host runs the
+# collectors in a subprocess against a fixture root (HELFETCH_ROOT) instead,
+# for testing without any machines.
+
+import os
+import sys
+
+# The fields shown in the fleet table.
+FLEET_FIELDS = ['OS', 'Kernel', 'Packages', 'RAM', 'Disk']
+
+LOCAL_PREFIX = 'local:'
+HELFETCH_SCRIPT = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'helfetch.py')
+
+# How long an idle shared SSH connection is kept open, in seconds.
+SSH_CONTROL_PERSIST = 60
+
+
+def read_hosts(path):
+    """
+    Reads a host list: one host per line, blank lines and '#' comments ignored.
+    """
+    with open(path, 'r') as f:
+        return [line.split('#', 1)[0].strip() for line in f if line.split('#', 1)[0].strip()]
+
+
+def control_dir():
+    """
+    Returns the directory for the shared SSH connection sockets, creating it if needed.
+    """
+    base = os.getenv('XDG_RUNTIME_DIR')
+    if not base:
+        from utils.cache import cache_dir
+        base = cache_dir()
+    path = os.path.join(base, 'helfetch-ssh')
+    os.makedirs(path, mode=0o700, exist_ok=True)
+    return path
+
+
+def host_command(host, fields, timeout):
+    """
+    Builds the command that runs 'helfetch --format json' for one host.
+
+    Args:
+        host (str): "[user@]hostname" for SSH, or "local:ROOT" for a local fixture root.
+        fields (list): The fields to collect.
+        timeout (float): Connection timeout in seconds.
+
+    Returns:
+        tuple: (argv, env) for subprocess; env is None to inherit the environment.
+    """
+    helfetch_args = ['--format', 'json', '--fields', ','.join(fields)]
+    if host.startswith(LOCAL_PREFIX):
+        env = dict(os.environ)
+        env['HELFETCH_ROOT'] = host[len(LOCAL_PREFIX):]
+        # Never answer from the local daemon or from the cache shared with the real system.
+        env.pop('XDG_RUNTIME_DIR', None)
+        return [sys.executable, HELFETCH_SCRIPT, '--no-cache'] + helfetch_args, env
+
+    import shlex
+    ssh = [
+        'ssh',
+        '-o', 'BatchMode=yes',
+        '-o', f'ConnectTimeout={max(1, int(timeout))}',
+        '-o', 'ControlMaster=auto',
+        '-o', f'ControlPath={os.path.join(control_dir(), "%C")}',
+        '-o', f'ControlPersist={SSH_CONTROL_PERSIST}',
+        host, '--',
+    ]
+    return ssh + [shlex.join(['helfetch'] + helfetch_args)], None
+
+
+def query_host(host, fields, timeout):
+    """
+    Collects the fields from one host.
+
+    Returns:
+        dict: {'host', 'ok', 'elapsed_ms'} plus 'info' (the host's JSON output)
+              on success or 'error' on failure.
+    """
+    import json
+    import subprocess
+    import time
+
+    start = time.monotonic()
+    record = {'host': host, 'ok': False}
+    try:
+        argv, env = host_command(host, fields, timeout)
+        result = subprocess.run(argv, env=env, stdin=subprocess.DEVNULL, capture_output=True,
+                                text=True, timeout=timeout)
+        if result.returncode != 0:
+            message = result.stderr.strip().splitlines()
+            record['error'] = message[-1] if message else f"exit status {result.returncode}"
+        else:
+            info = json.loads(result.stdout)
+            if not isinstance(info, dict):
+                raise ValueError("expected a JSON object")
+            record['ok'] = True
+            record['info'] = info
+    except subprocess.TimeoutExpired:
+        record['error'] = f"timed out after {timeout:g}s"
+    except (OSError, ValueError) as e:
+        record['error'] = f"{type(e).__name__}: {e}"
+    record['elapsed_ms'] = round((time.monotonic() - start) * 1000, 1)
+    return record
+
+
+def run_fleet(hosts, fields=None, jobs=16, timeout=30.0):
+    """
+    Queries many hosts in parallel, at most 'jobs' at a time.
+
+    Yields:
+        dict: One query_host() record per host, in the order they finish.
+    """
+    from concurrent.futures import ThreadPoolExecutor, as_completed
+
+    fields = fields or FLEET_FIELDS
+    with ThreadPoolExecutor(max_workers=max(1, jobs)) as executor:
+        futures = [executor.submit(query_host, host, fields, timeout) for host in hosts]
+        for future in as_completed(futures):
+            yield future.result()
@@ -0,0 +1,48 @@
+# utils/helpers.py
+
+import os
+
+# Optional root directory prepended to system paths (/proc, /sys, /etc, /var, /usr).
+# Setting HELFETCH_ROOT runs the probes against a recorded fixture tree instead of
+# the live system, as the benchmarks do.
+SYSTEM_ROOT = os.environ.get('HELFETCH_ROOT', '').rstrip('/')
+
+# Binary unit suffixes, as used by 'free -h' and 'df -h'.
+BYTE_UNITS = ['B', 'Ki', 'Mi', 'Gi', 'Ti', 'Pi']
+
+
+def host_path(path):
+    """
+    Returns the absolute system path 'path' under SYSTEM_ROOT (unchanged when unset).
+    """
+    return SYSTEM_ROOT + path
+
+
+def format_bytes(num_bytes):
+    """
+    Formats a byte count the way 'free -h' does (e.g. 1536 -> "1.5Ki", 16e9 -> "15Gi").
+    """
+    value = float(num_bytes)
+    for unit in BYTE_UNITS:
+        if value < 1024 or unit == BYTE_UNITS[-1]:
+            break
+        value /= 1024
+    if unit == 'B':
+        return f"{int(value)}B"
+    if value < 10:
+        return f"{value:.1f}{unit}"
+    return f"{value:.0f}{unit}"
+
+
+def format_duration(seconds):
+    """
+    Formats a number of seconds as a short uptime string (e.g. "2d 3h 15m").
+    """
+    days = int(seconds // 86400)
+    hours = int((seconds % 86400) // 3600)
+    minutes = int((seconds % 3600) // 60)
+    if days > 0:
+        return f"{days}d {hours}h {minutes}m"
+    elif hours > 0:
+        return f"{hours}h {minutes}m"
+    return f"{minutes}m"
@@ -0,0 +1,393 @@
+# utils/history.py
+
+# The snapshot history written by 'helfetch --record' and read by
+# 'helfetch history': how RAM, Disk, the package count, the kernel and the
+# uptime change on this machine over weeks.
+#
+# The log ($XDG_STATE_HOME/helfetch/history.bin) is a small header followed by
+# fixed-width binary records (RECORD), appended in time order. Because every
+# record has the same size, a query memory-maps the file, finds the first
+# record of its time range by binary search on the time column, and unpacks
+# only the columns of the field it asked for; nothing else is decoded.
+#
+# When the log grows over DEFAULT_HISTORY_MAX_BYTES it is compacted: records
+# older than DEFAULT_HISTORY_FULL_DAYS are thinned to one per day, and the
+# oldest ones are dropped if that isn't enough. Writers lock the file (flock).
+
+import bisect
+import fcntl
+import mmap
+import os
+import struct
+import time
+
+from config import default_config
+from core.metrics import MemoryUsage, DiskUsage, Duration
+
+MAGIC = b'HFHS'
+FORMAT_VERSION = 1
+
+# After compaction the log is at most this share of the size cap, so that it
+# isn't compacted again on every run.
+COMPACT_TARGET = 0.75
+
+KERNEL_SIZE = 48
+
+# The record layout: (column, struct format). Little-endian, no padding.
+COLUMNS = (
+    ('time', 'd'),              # Unix time of the run
+    ('present', 'H'),           # One bit per FIELDS entry that has a value
+    ('ram_used', 'Q'),
+    ('ram_total', 'Q'),
+    ('disk_used', 'Q'),
+    ('disk_total', 'Q'),
+    ('disk_available', 'Q'),
+    ('packages', 'I'),          # Total over all package managers
+    ('uptime', 'I'),            # Seconds
+    ('kernel', f'{KERNEL_SIZE}s'),
+)
+
+HEADER = struct.Struct('<4sHH') # magic, format version, record size
+RECORD = struct.Struct('<' + ''.join(fmt for _, fmt in COLUMNS))
+
+COLUMN_INDEX = {column: index for index, (column, _) in enumerate(COLUMNS)}
+OFFSETS = {}
+_offset = 0
+for _column, _fmt in COLUMNS:
+    OFFSETS[_column] = _offset
+    _offset += struct.calcsize('<' + _fmt)
+del _offset, _column, _fmt
+
+TIME = struct.Struct('<d')
+PRESENT = struct.Struct('<H')
+
+
+def _encode_memory(value):
+    return (int(value.used), int(value.total)) if isinstance(value, MemoryUsage) else None
+
+
+def _encode_disk(value):
+    if not isinstance(value, DiskUsage):
+        return None
+    return (int(value.used), int(value.total), int(value.available))
+
+
+def _encode_packages(value):
+    counts = getattr(value, 'counts', None)
+    return (sum(count for _, count in counts),) if counts else None
+
+
+def _encode_uptime(value):
+    return (min(int(value.seconds), 0xFFFFFFFF),) if isinstance(value, Duration) else None
+
+
+def _encode_kernel(value):
+    if not isinstance(value, str) or value in ('', 'N/A'):
+        return None
+    return (value.encode('utf-8')[:KERNEL_SIZE],)
+
+
+def _decode_kernel(raw):
+    return raw.rstrip(b'\0').decode('utf-8', 'replace')
+
+
+# Recorded fields: field -> (first column, struct format of its columns, encode, decode).
+# 'encode' returns the column values (None if the value can't be recorded);
+# 'decode' turns them back into the typed value that helfetch displays.
+FIELDS = {
+    'RAM': ('ram_used', 'QQ', _encode_memory, MemoryUsage),
+    'Disk': ('disk_used', 'QQQ', _encode_disk, DiskUsage),
+    'Packages': ('packages', 'I', _encode_packages, int),
+    'Uptime': ('uptime', 'I', _encode_uptime, Duration),
+    'Kernel': ('kernel', f'{KERNEL_SIZE}s', _encode_kernel, _decode_kernel),
+}
+FIELD_BITS = {field: 1 << bit for bit, field in enumerate(FIELDS)}
+_FIELD_STRUCTS = {field: struct.Struct('<' + fmt) for field, (_, fmt, _, _) in FIELDS.items()}
+
+# --since units, in seconds
+SINCE_UNITS = {'s': 1, 'm': 60, 'h': 3600, 'd': 86400, 'w': 7 * 86400}
+
+
+class HistoryError(Exception):
+    """
+    The history log can't be read or written (e.g. it has an unknown format).
+    """
+
+
+def state_dir():
+    """
+    Returns the helfetch state directory ($XDG_STATE_HOME/helfetch).
+    """
+    base = os.getenv('XDG_STATE_HOME') or os.path.expanduser('~/.local/state')
+    return os.path.join(base, 'helfetch')
+
+
+def history_file():
+    return os.path.join(state_dir(), 'history.bin')
+
+
+def parse_since(text, now=None):
+    """
+    Parses a --since value: a relative age ("30d", "12h", "2w") or a date ("2026-09-01").
+
+    Returns:
+        float: The Unix time it stands for.
+
+    Raises:
+        ValueError: If the value can't be parsed.
+    """
+    now = time.time() if now is None else now
+    text = text.strip()
+    if text[:-1].isdigit() and text[-1:] in SINCE_UNITS:
+        return now - int(text[:-1]) * SINCE_UNITS[text[-1]]
+    try:
+        return time.mktime(time.strptime(text, '%Y-%m-%d'))
+    except ValueError:
+        raise ValueError(f"invalid --since value '{text}' (e.g. 30d, 12h, 2w or 2026-09-01)") from None
+
+
+def encode(info, now=None):
+    """
+    Packs the recorded fields of a snapshot into one record.
+
+    Returns:
+        bytes: The record, or None if the snapshot has none of the recorded fields.
+    """
+    values = [0] * len(COLUMNS)
+    values[COLUMN_INDEX['kernel']] = b''
+    present = 0
+    for field, (first, _, encoder, _) in FIELDS.items():
+        encoded = encoder(info[field]) if field in info else None
+        if encoded is None:
+            continue
+        present |= FIELD_BITS[field]
+        start = COLUMN_INDEX[first]
+        values[start:start + len(encoded)] = encoded
+    if not present:
+        return None
+    values[COLUMN_INDEX['time']] = time.time() if now is None else now
+    values[COLUMN_INDEX['present']] = present
+    return RECORD.pack(*values)
+
+
+def _check_header(data):
+    if len(data) < HEADER.size:
+        return False
+    magic, version, size = HEADER.unpack_from(data)
+    return magic == MAGIC and version == FORMAT_VERSION and size == RECORD.size
+
+
+def _open_locked(path):
+    """
+    Opens the log for appending with an exclusive lock, following a concurrent
+    compaction (which replaces the file) if there was one.
+    """
+    while True:
+        fd = os.open(path, os.O_RDWR | os.O_CREAT | os.O_APPEND, 0o644)
+        fcntl.flock(fd, fcntl.LOCK_EX)
+        try:
+            if os.stat(path).st_ino == os.fstat(fd).st_ino:
+                return fd
+        except FileNotFoundError:
+            pass
+        os.close(fd)
+
+
+def record(info, now=None, max_bytes=None):
+    """
+    Appends a snapshot's recorded fields to the log, compacting it if it got too big.
+
+    Returns:
+        bool: True if a record was written.
+
+    Raises:
+        HistoryError: If the existing log has a different format.
+        OSError: If the log can't be written.
+    """
+    data = encode(info, now)
+    if data is None:
+        return False
+    max_bytes = default_config.DEFAULT_HISTORY_MAX_BYTES if max_bytes is None else max_bytes
+    path = history_file()
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    fd = _open_locked(path)
+    try:
+        size = os.fstat(fd).st_size
+        if size == 0:
+            os.write(fd, HEADER.pack(MAGIC, FORMAT_VERSION, RECORD.size))
+            size = HEADER.size
+        elif not _check_header(os.pread(fd, HEADER.size, 0)):
+            raise HistoryError(f"{path} has an unknown format; move it away to start a new history")
+        elif (size - HEADER.size) % RECORD.size:
+            # A run was interrupted in the middle of a write: drop the partial record.
+            size -= (size - HEADER.size) % RECORD.size
+            os.ftruncate(fd, size)
+        os.write(fd, data)
+        if size + RECORD.size > max_bytes:
+            _compact(fd, path, max_bytes, now)
+    finally:
+        os.close(fd)
+    return True
+
+
+def thin(records, now, full_days=None):
+    """
+    Keeps every record from the last 'full_days' days, and the last record of
+    each (UTC) day before that.
+
+    Args:
+        records (bytes): Consecutive records, oldest first.
+
+    Returns:
+        bytes: The remaining records.
+    """
+    full_days = default_config.DEFAULT_HISTORY_FULL_DAYS if full_days is None else full_days
+    cutoff = now - full_days * 86400
+    kept = []
+    count = len(records) // RECORD.size
+    for index in range(count):
+        offset = index * RECORD.size
+        when = TIME.unpack_from(records, offset)[0]
+        if when < cutoff and index + 1 < count:
+            next_when = TIME.unpack_from(records, offset + RECORD.size)[0]
+            if next_when // 86400 == when // 86400:
+                continue # Not the last record of its day
+        kept.append(records[offset:offset + RECORD.size])
+    return b''.join(kept)
+
+
+def _compact(fd, path, max_bytes, now=None):
+    """
+    Rewrites the (locked) log with old records thinned out and, if still too
+    big, the oldest ones dropped, then replaces it atomically.
+    """
+    now = time.time() if now is None else now
+    size = os.fstat(fd).st_size
+    records = os.pread(fd, size - HEADER.size, HEADER.size)
+    records = records[:len(records) - len(records) % RECORD.size]
+    records = thin(records, now)
+    limit = max(int(max_bytes * COMPACT_TARGET) - HEADER.size, 0) // RECORD.size * RECORD.size
+    if len(records) > limit:
+        records = records[len(records) - limit:]
+
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    with open(tmp_path, 'wb') as f:
+        f.write(HEADER.pack(MAGIC, FORMAT_VERSION, RECORD.size))
+        f.write(records)
+    os.replace(tmp_path, path)
+
+
+class _TimeColumn:
+    """
+    The time column of a mapped log as a read-only sequence, for bisect.
+    """
+
+    def __init__(self, log):
+        self.log = log
+
+    def __len__(self):
+        return len(self.log)
+
+    def __getitem__(self, index):
+        return TIME.unpack_from(self.log.data, HEADER.size + index * RECORD.size)[0]
+
+
+class HistoryLog:
+    """
+    A read-only, memory-mapped view of the history log. Use as a context manager.
+    """
+
+    def __init__(self, path=None):
+        self.path = path or history_file()
+        self.data = b''
+        self._mmap = None
+        try:
+            with open(self.path, 'rb') as f:
+                size = os.fstat(f.fileno()).st_size
+                if size:
+                    self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+                    self.data = self._mmap
+        except FileNotFoundError:
+            pass
+        if self.data and not _check_header(self.data):
+            self.close()
+            raise HistoryError(f"{self.path} is not a helfetch history log (or has a newer format)")
+        self.count = max(len(self.data) - HEADER.size, 0) // RECORD.size
+
+    def __len__(self):
+        return self.count
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def close(self):
+        if self._mmap is not None:
+            self._mmap.close()
+            self._mmap = None
+        self.data = b''
+        self.count = 0
+
+    def find(self, since):
+        """
+        Returns the index of the first record at or after Unix time 'since'.
+        """
+        return bisect.bisect_left(_TimeColumn(self), since)
+
+    def scan(self, field, since=None):
+        """
+        Yields (time, value) for each record (from 'since' on) that has 'field',
+        decoding only that field's columns.
+        """
+        first, _, _, decode = FIELDS[field]
+        unpack = _FIELD_STRUCTS[field].unpack_from
+        bit = FIELD_BITS[field]
+        data = self.data
+        offset = HEADER.size + (self.find(since) if since is not None else 0) * RECORD.size
+        end = HEADER.size + self.count * RECORD.size
+        field_offset = OFFSETS[first]
+        while offset < end:
+            if PRESENT.unpack_from(data, offset + OFFSETS['present'])[0] & bit:
+                yield TIME.unpack_from(data, offset)[0], decode(*unpack(data, offset + field_offset))
+            offset += RECORD.size
+
+    def rows(self, fields, since=None):
+        """
+        Yields (time, values) for each record from 'since' on, with the values
+        of 'fields' in order (None where a field wasn't recorded).
+        """
+        columns = [(FIELD_BITS[field], OFFSETS[FIELDS[field][0]], _FIELD_STRUCTS[field].unpack_from, FIELDS[field][3])
+                   for field in fields]
+        data = self.data
+        offset = HEADER.size + (self.find(since) if since is not None else 0) * RECORD.size
+        end = HEADER.size + self.count * RECORD.size
+        while offset < end:
+            present = PRESENT.unpack_from(data, offset + OFFSETS['present'])[0]
+            values = [decode(*unpack(data, offset + field_offset)) if present & bit else None
+                      for bit, field_offset, unpack, decode in columns]
+            yield TIME.unpack_from(data, offset)[0], values
+            offset += RECORD.size
+
+
+# For testing this module independently
+if __name__ == "__main__":
+    import tempfile
+    from core.metrics import PackageCounts
+
+    os.environ['XDG_STATE_HOME'] = tempfile.mkdtemp()
+    start = time.time() - 60 * 86400
+    for hour in range(60 * 24):
+        record({
+            'RAM': MemoryUsage(4e9 + hour * 1e6, 16e9),
+            'Disk': DiskUsage(100e9 + hour * 1e7, 500e9, 400e9 - hour * 1e7),
+            'Packages': PackageCounts([('pacman', 1800 + hour // 24)]),
+            'Kernel': '6.10.1-arch1-1' if hour < 700 else '6.11.2-arch1-1',
+            'Uptime': Duration(hour % 24 * 3600),
+        }, now=start + hour * 3600, max_bytes=64 * 1024)
+    print(f"Record size: {RECORD.size} bytes, log: {os.path.getsize(history_file())} bytes")
+    with HistoryLog() as log:
+        print(f"{len(log)} records")
+        for when, value in list(log.scan('Disk', time.time() - 2 * 86400))[-3:]:
+            print(f"  {time.strftime('%Y-%m-%d %H:%M', time.localtime(when))}  {value}")
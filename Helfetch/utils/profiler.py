@@ -0,0 +1,192 @@
+# utils/profiler.py
+
+# Per-probe instrumentation for --profile. When enabled, every field lookup is
+# timed, and the profiler records whether it spawned a child process, how many
+# bytes it read, whether it hit the cache and why it failed (the collectors
+# otherwise swallow errors and just show "N/A"). When disabled, call() simply
+# runs the probe.
+
+import collections
+import threading
+import time
+
+THREAD_IO_PATH = '/proc/thread-self/io'
+
+# The most recent probes kept for the report (a long-running process, e.g.
+# helfetchd or --watch, would otherwise accumulate them forever)
+MAX_RECORDS = 1000
+
+_enabled = False
+_lock = threading.Lock()
+_records = collections.deque(maxlen=MAX_RECORDS)
+_original_execute_child = None
+_local = threading.local()
+_io_overhead = 0
+
+
+def _read_rchar():
+    """
+    Returns the bytes read so far by the current thread (from the kernel's
+    per-thread I/O accounting), or None if unavailable.
+    """
+    try:
+        with open(THREAD_IO_PATH, 'rb') as f:
+            for line in f:
+                if line.startswith(b'rchar:'):
+                    return int(line.split()[1])
+    except (OSError, ValueError):
+        pass
+    return None
+
+
+def enable():
+    """
+    Turns profiling on (starting a new report) and hooks subprocess so spawned
+    commands are attributed to probes. disable() removes the hook.
+    """
+    global _enabled, _io_overhead, _original_execute_child
+    import subprocess
+
+    reset()
+    if _original_execute_child is None:
+        original = _original_execute_child = subprocess.Popen._execute_child
+
+        def recording_execute_child(popen, args, *rest, **kwargs):
+            record = getattr(_local, 'record', None)
+            if record is not None:
+                command = args if isinstance(args, (str, bytes)) else args[0]
+                record['spawned'].append(str(command))
+            return original(popen, args, *rest, **kwargs)
+
+        subprocess.Popen._execute_child = recording_execute_child
+
+    # Reading the accounting file counts as a read too; measure it once.
+    first = _read_rchar()
+    second = _read_rchar()
+    _io_overhead = second - first if first is not None and second is not None else 0
+    _enabled = True
+
+
+def disable():
+    """
+    Turns profiling off and restores subprocess. The records are kept for the report.
+    """
+    global _enabled, _original_execute_child
+    _enabled = False
+    if _original_execute_child is not None:
+        import subprocess
+        subprocess.Popen._execute_child = _original_execute_child
+        _original_execute_child = None
+
+
+def reset():
+    """
+    Drops the recorded probes.
+    """
+    with _lock:
+        _records.clear()
+
+
+def is_enabled():
+    return _enabled
+
+
+def _is_missing(result):
+    if isinstance(result, dict):
+        return bool(result) and all(value in (None, '', 'N/A') for value in result.values())
+    return result in (None, '', 'N/A')
+
+
+def call(name, func):
+    """
+    Runs a probe and, when profiling is enabled, records its cost.
+
+    Args:
+        name (str): The probe name shown in the report (e.g. "hardware:GPU").
+        func (callable): The probe.
+
+    Returns:
+        Whatever the probe returns.
+    """
+    if not _enabled:
+        return func()
+
+    record = {
+        'probe': name,
+        'wall_ms': None,
+        'spawned': [],
+        'bytes_read': None,
+        'cache': None,
+        'error': None,
+    }
+    with _lock:
+        _records.append(record)
+    _local.record = record
+    io_before = _read_rchar()
+    start = time.perf_counter()
+    try:
+        result = func()
+    except Exception as e:
+        record['error'] = f"{type(e).__name__}: {e}"
+        raise
+    finally:
+        record['wall_ms'] = (time.perf_counter() - start) * 1000
+        io_after = _read_rchar()
+        if io_before is not None and io_after is not None:
+            record['bytes_read'] = max(io_after - io_before - _io_overhead, 0)
+        _local.record = None
+    if record['error'] is None and _is_missing(result):
+        record['error'] = 'no data'
+    return result
+
+
+def note_failure(reason):
+    """
+    Records why the current probe couldn't get its value (no-op when not profiling).
+    The first reason recorded for a probe wins.
+    """
+    record = getattr(_local, 'record', None)
+    if record is not None and record['error'] is None:
+        record['error'] = str(reason)
+
+
+def note_cache(state):
+    """
+    Records whether the current probe was served from the cache ('hit' or 'miss').
+    """
+    record = getattr(_local, 'record', None)
+    if record is not None:
+        record['cache'] = state
+
+
+def records():
+    """
+    Returns the recorded probes, slowest first. Probes that are still running
+    (they missed their deadline) are reported as such.
+    """
+    with _lock:
+        snapshot = [dict(record) for record in _records]
+    for record in snapshot:
+        if record['wall_ms'] is None:
+            record['error'] = 'deadline exceeded (still running)'
+    return sorted(snapshot, key=lambda record: record['wall_ms'] or float('inf'), reverse=True)
+
+
+def format_report(output_format='table'):
+    """
+    Formats the recorded probes as a table or as JSON.
+    """
+    rows = records()
+    if output_format == 'json':
+        import json
+        return json.dumps(rows, indent=2)
+
+    lines = [f"{'probe':28} {'wall [ms]':>10} {'bytes read':>11} {'cache':>6}  {'spawned':16} error"]
+    for row in rows:
+        wall = f"{row['wall_ms']:.3f}" if row['wall_ms'] is not None else '-'
+        bytes_read = str(row['bytes_read']) if row['bytes_read'] is not None else '-'
+        spawned = ",".join(row['spawned']) or '-'
+        lines.append(
+            f"{row['probe']:28} {wall:>10} {bytes_read:>11} {row['cache'] or '-':>6}  {spawned:16} {row['error'] or ''}"
+        )
+    return "\n".join(lines)
@@ -0,0 +1,215 @@
+#!/usr/bin/env python3
+# benchmarks/collectors.py
+
+# Offline benchmark for the collectors and the formatter.
+#
+# Every collector runs against a recorded fixture tree (fake /proc, /sys, /etc,
+# pacman database and GTK settings, see fixtures/) through HELFETCH_ROOT, with a
+# local HTTP stand-in for ip-api.com. It reports per-collector p50/p99 latency
+# and how many child processes each call spawned. The collectors read everything
+# in-process, so any child process at all makes the benchmark fail.
+#
+# Usage: python benchmarks/collectors.py [--iterations 200] [--packages 1843]
+#                                        [--threads 16] [--warm-cache] [--json]
+
+import argparse
+import json
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+HELFETCH_DIR = os.path.join(BENCH_DIR, '..', 'Helfetch')
+FIXTURE_DIR = os.path.join(BENCH_DIR, 'fixtures', 'arch-desktop')
+
+# Recorded ip-api.com answer served by the local stand-in.
+GEO_RESPONSE = {
+    "status": "success", "country": "Egypt", "countryCode": "EG", "city": "Helwan",
+    "isp": "Telecom Egypt", "query": "197.32.10.20",
+}
+
+
+def build_root(root, packages, threads, flatpaks):
+    """
+    Copies the recorded fixture tree to 'root' and generates its bulky parts:
+    one /proc/cpuinfo block and sysfs topology per thread, the pacman local database
+    and Flatpak apps.
+    """
+    shutil.copytree(FIXTURE_DIR, root)
+
+    cpuinfo_path = os.path.join(root, 'proc', 'cpuinfo')
+    with open(cpuinfo_path) as f:
+        block = f.read()
+    with open(cpuinfo_path, 'w') as f:
+        for cpu in range(threads):
+            f.write(block.replace('processor\t: 0', f'processor\t: {cpu}', 1))
+
+    # CPU topology: 'threads' logical CPUs, two per core, on one socket.
+    cpu_dir = os.path.join(root, 'sys', 'devices', 'system', 'cpu')
+    with open(os.path.join(cpu_dir, 'online'), 'w') as f:
+        f.write(f'0-{threads - 1}\n')
+    cores = max(1, threads // 2)
+    for cpu in range(threads):
+        topology = os.path.join(cpu_dir, f'cpu{cpu}', 'topology')
+        os.makedirs(topology, exist_ok=True)
+        core = cpu % cores
+        siblings = f'{core},{core + cores}' if core + cores < threads else f'{core}'
+        for name, value in (('core_id', core), ('physical_package_id', 0),
+                            ('core_cpus_list', siblings), ('package_cpus_list', f'0-{threads - 1}')):
+            with open(os.path.join(topology, name), 'w') as f:
+                f.write(f'{value}\n')
+
+    local_db = os.path.join(root, 'var', 'lib', 'pacman', 'local')
+    os.makedirs(local_db)
+    with open(os.path.join(local_db, 'ALPM_DB_VERSION'), 'w') as f:
+        f.write('9\n')
+    # The shell and terminal of the recorded process tree, then filler packages.
+    names = [('bash', '5.2.026-2'), ('hel-terminal', '1.4.0-1')]
+    names += [(f'package-{i}', '1.0-1') for i in range(packages - len(names))]
+    for name, version in names:
+        package_dir = os.path.join(local_db, f'{name}-{version}')
+        os.mkdir(package_dir)
+        with open(os.path.join(package_dir, 'desc'), 'w') as f:
+            f.write(f'%NAME%\n{name}\n\n%VERSION%\n{version}\n')
+
+    for i in range(flatpaks):
+        os.makedirs(os.path.join(root, 'var', 'lib', 'flatpak', 'app', f'org.example.App{i}'))
+
+
+class GeoHandler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        body = json.dumps(GEO_RESPONSE).encode()
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+class SpawnCounter:
+    """
+    Counts child processes by wrapping subprocess.Popen._execute_child.
+    """
+
+    def __init__(self):
+        self.count = 0
+        self._lock = threading.Lock()
+        original = subprocess.Popen._execute_child
+
+        def counting_execute_child(popen, *args, **kwargs):
+            with self._lock:
+                self.count += 1
+            return original(popen, *args, **kwargs)
+
+        subprocess.Popen._execute_child = counting_execute_child
+
+
+def percentile(samples, fraction):
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(round(fraction * (len(ordered) - 1))))]
+
+
+def measure(func, iterations, spawns):
+    func() # Warm-up: imports, page cache
+    timings = []
+    start_spawns = spawns.count
+    for _ in range(iterations):
+        start = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - start)
+    return {
+        'p50_ms': percentile(timings, 0.50) * 1000,
+        'p99_ms': percentile(timings, 0.99) * 1000,
+        'forks_per_call': (spawns.count - start_spawns) / iterations,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark helfetch's collectors against recorded fixtures.")
+    parser.add_argument("--iterations", type=int, default=200, help="Measured calls per collector (default: 200).")
+    parser.add_argument("--packages", type=int, default=1843, help="Packages in the fake pacman database (default: 1843).")
+    parser.add_argument("--threads", type=int, default=16, help="CPU threads in the fake /proc/cpuinfo (default: 16).")
+    parser.add_argument("--flatpaks", type=int, default=12, help="Flatpak apps in the fake root (default: 12).")
+    parser.add_argument("--warm-cache", action="store_true", help="Measure with the result cache enabled and warm.")
+    parser.add_argument("--json", action="store_true", help="Print the results as JSON.")
+    args = parser.parse_args()
+
+    workdir = tempfile.mkdtemp(prefix='helfetch-bench-')
+    try:
+        root = os.path.join(workdir, 'root')
+        build_root(root, args.packages, args.threads, args.flatpaks)
+
+        # The environment must be in place before helfetch's modules are imported.
+        os.environ.update({
+            'HELFETCH_ROOT': root,
+            'HOME': os.path.join(root, 'home'),
+            'XDG_CACHE_HOME': os.path.join(workdir, 'cache'),
+            'DISPLAY': ':0',
+            'XDG_CURRENT_DESKTOP': 'X-Cinnamon',
+            'SHELL': '/usr/bin/bash',
+            'TERM': 'xterm-256color',
+        })
+        os.environ.pop('XDG_RUNTIME_DIR', None)
+        sys.path.insert(0, HELFETCH_DIR)
+
+        from core import system_info, hardware_info, sensors_info, desktop_info, network_info, geo
+        from display.ascii_art import get_ascii_logo
+        from display.formatter import format_info_output
+        from utils import cache
+
+        server = ThreadingHTTPServer(('127.0.0.1', 0), GeoHandler)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        geo.PROVIDERS = [dict(geo.PROVIDERS[0], url=f"http://127.0.0.1:{server.server_address[1]}/json/",
+                              per_minute=None)]
+
+        cache.configure(enabled=args.warm_cache)
+        spawns = SpawnCounter()
+
+        collectors = [
+            ('get_system_info', system_info.get_system_info),
+            ('get_hardware_info', hardware_info.get_hardware_info),
+            ('get_sensors_info', sensors_info.get_sensors_info),
+            ('get_desktop_info', desktop_info.get_desktop_info),
+            ('get_network_info', network_info.get_network_info),
+        ]
+        results = {}
+        all_info = {}
+        for name, collector in collectors:
+            all_info.update(collector())
+            results[name] = measure(collector, args.iterations, spawns)
+
+        logo = get_ascii_logo("Helwan Linux")
+        results['format_info_output'] = measure(
+            lambda: format_info_output(all_info, logo_lines=logo, inspirational_quote="Benchmark quote."),
+            args.iterations, spawns
+        )
+        server.shutdown()
+
+        if args.json:
+            print(json.dumps({'collected': {k: str(v) for k, v in all_info.items()}, 'results': results,
+                              'forks': spawns.count}, indent=2))
+        else:
+            print(f"{'collector':22} {'p50 [ms]':>10} {'p99 [ms]':>10} {'forks/call':>11}")
+            for name, result in results.items():
+                print(f"{name:22} {result['p50_ms']:10.3f} {result['p99_ms']:10.3f} {result['forks_per_call']:11.2f}")
+            print(f"\n{args.iterations} iterations, cache {'warm' if args.warm_cache else 'disabled'}, "
+                  f"{args.packages} packages, {args.threads} CPU threads")
+        if spawns.count:
+            # Warm-up calls included: a fork anywhere is a regression.
+            print(f"FAIL: the collectors spawned {spawns.count} child process(es)", file=sys.stderr)
+            return 1
+        return 0
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,87 @@
+#!/usr/bin/env python3
+# benchmarks/diff.py
+
+# Measures 'helfetch diff' on two synthetic fleet dumps (one NDJSON record per
+# host, as written by 'helfetch fleet --format ndjson'): the time to compare
+# every host, and the peak Python memory (tracemalloc). Only the baseline's
+# index is kept, so the peak grows by a few hundred bytes per baseline host,
+# whatever the size of the records.
+#
+# Usage: python benchmarks/diff.py [--hosts 5000] [--budget 512]
+
+import argparse
+import json
+import os
+import shutil
+import sys
+import tempfile
+import time
+import tracemalloc
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+HELFETCH_DIR = os.path.join(BENCH_DIR, '..', 'Helfetch')
+
+SNAPSHOT = {
+    'Host': 'node', 'OS': 'Helwan Linux', 'Kernel': '6.10.1-arch1-1', 'Uptime': {'seconds': 86400},
+    'Shell': {'name': 'bash', 'version': '5.2.26'}, 'Packages': {'pacman': 1843, 'flatpak': 12},
+    'CPU': {'model': 'AMD EPYC 7763', 'architecture': 'x86_64', 'sockets': 2, 'cores': 128, 'threads': 256,
+            'online': '0-255', 'max_mhz': 3529.0, 'caches': {'L1d': 32768, 'L2': 524288, 'L3': 268435456}},
+    'RAM': {'used_bytes': 4 * 2**30, 'total_bytes': 512 * 2**30, 'percent': 0.8},
+    'GPU': 'ASPEED Graphics Family', 'Local IP': '10.0.0.1',
+}
+
+
+def write_dump(path, hosts, changed):
+    with open(path, 'w') as f:
+        for i in range(hosts):
+            info = dict(SNAPSHOT, Host=f"node{i:05d}", RAM=dict(SNAPSHOT['RAM'], used_bytes=i * 2**20))
+            if changed and i % 3 == 0:
+                info['Kernel'] = '6.11.2-arch1-1'
+                info['Packages'] = {'pacman': 1843 + i % 60, 'flatpak': 12}
+            f.write(json.dumps({'host': info['Host'], 'ok': True, 'elapsed_ms': 40, 'info': info}) + "\n")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Measure helfetch's snapshot diff on fleet dumps.")
+    parser.add_argument("--hosts", type=int, default=5000, help="Hosts per dump (default: 5000).")
+    parser.add_argument("--budget", type=float, default=512,
+                        help="Allowed peak memory per baseline host, in bytes (default: 512).")
+    args = parser.parse_args()
+
+    sys.path.insert(0, HELFETCH_DIR)
+    from utils.diff import diff_snapshots
+
+    workdir = tempfile.mkdtemp(prefix='helfetch-diff-')
+    try:
+        baseline = os.path.join(workdir, 'before.ndjson')
+        target = os.path.join(workdir, 'after.ndjson')
+        write_dump(baseline, args.hosts, changed=False)
+        write_dump(target, args.hosts, changed=True)
+        size = os.path.getsize(target)
+
+        start = time.perf_counter()
+        changed = sum(1 for result in diff_snapshots(baseline, [target], ignore={'RAM'}) if result['changes'])
+        elapsed = time.perf_counter() - start
+
+        # Memory in a second pass: tracemalloc slows everything down.
+        tracemalloc.start()
+        for _ in diff_snapshots(baseline, [target], ignore={'RAM'}):
+            pass
+        peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+    print(f"{args.hosts} hosts ({size / 2**20:.1f} MiB per dump), {changed} changed")
+    print(f"Time: {elapsed * 1000:.0f} ms ({elapsed / args.hosts * 1e6:.0f} us per host)")
+    per_host = peak / args.hosts
+    print(f"Peak memory: {peak / 2**20:.2f} MiB ({per_host:.0f} bytes per host, budget {args.budget:g})")
+    if per_host > args.budget:
+        print("FAIL: over budget")
+        return 1
+    print("OK")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,83 @@
+#!/usr/bin/env python3
+# benchmarks/history.py
+
+# Measures the snapshot history log (utils/history.py) on a synthetic log of
+# one record per shell start over several months: the cost of one --record
+# append, of a 'helfetch history --since 30d' scan of one field, and of a
+# compaction at the size cap. Runs in a temporary $XDG_STATE_HOME.
+#
+# Usage: python benchmarks/history.py [--days 120] [--per-day 40] [--budget 2.0]
+
+import argparse
+import os
+import shutil
+import sys
+import tempfile
+import time
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+HELFETCH_DIR = os.path.join(BENCH_DIR, '..', 'Helfetch')
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Measure helfetch's snapshot history log.")
+    parser.add_argument("--days", type=int, default=120, help="Days of history to generate (default: 120).")
+    parser.add_argument("--per-day", type=int, default=40, help="Recorded runs per day (default: 40).")
+    parser.add_argument("--budget", type=float, default=2.0, help="Allowed time of one append, in ms (default: 2.0).")
+    args = parser.parse_args()
+
+    sys.path.insert(0, HELFETCH_DIR)
+    state_dir = tempfile.mkdtemp(prefix='helfetch-history-')
+    os.environ['XDG_STATE_HOME'] = state_dir
+    try:
+        from core.metrics import DiskUsage, Duration, MemoryUsage, PackageCounts
+        from utils import history
+
+        def snapshot(i):
+            return {
+                'RAM': MemoryUsage(4 * 2**30 + i % 997 * 2**20, 16 * 2**30),
+                'Disk': DiskUsage(100 * 2**30 + i * 2**22, 500 * 2**30, 400 * 2**30 - i * 2**22),
+                'Packages': PackageCounts([('pacman', 1800 + i // 500)]),
+                'Kernel': f"6.{10 + i // 2000}.1-arch1-1",
+                'Uptime': Duration(i % 40 * 1800),
+            }
+
+        # Write the log directly (one append per record would be as slow as the real thing).
+        count = args.days * args.per_day
+        now = time.time()
+        start_time = now - args.days * 86400
+        records = b''.join(history.encode(snapshot(i), start_time + i * 86400 / args.per_day) for i in range(count))
+        os.makedirs(history.state_dir(), exist_ok=True)
+        with open(history.history_file(), 'wb') as f:
+            f.write(history.HEADER.pack(history.MAGIC, history.FORMAT_VERSION, history.RECORD.size))
+            f.write(records)
+        size = os.path.getsize(history.history_file())
+        print(f"Log: {count} records of {history.RECORD.size} bytes ({size / 1024:.0f} KiB)")
+
+        start = time.perf_counter()
+        history.record(snapshot(count), max_bytes=size * 2)
+        append = (time.perf_counter() - start) * 1000
+        print(f"Append: {append:.3f} ms")
+
+        since = history.parse_since('30d')
+        start = time.perf_counter()
+        with history.HistoryLog() as log:
+            scanned = sum(1 for _ in log.scan('Disk', since))
+        print(f"Scan of Disk since 30d: {scanned} records in {(time.perf_counter() - start) * 1000:.2f} ms")
+
+        start = time.perf_counter()
+        history.record(snapshot(count + 1), max_bytes=size // 2)
+        print(f"Append with compaction to {size // 2 / 1024:.0f} KiB: {(time.perf_counter() - start) * 1000:.2f} ms, "
+              f"now {os.path.getsize(history.history_file()) / 1024:.0f} KiB")
+    finally:
+        shutil.rmtree(state_dir, ignore_errors=True)
+
+    if append > args.budget:
+        print(f"FAIL: an append takes over {args.budget:g} ms")
+        return 1
+    print("OK")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
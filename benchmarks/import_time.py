@@ -0,0 +1,87 @@
+#!/usr/bin/env python3
+# benchmarks/import_time.py
+
+# Startup import-cost regression check, based on 'python -X importtime'.
+#
+# Imports helfetch and all of its info/display modules (without running any
+# probe) in a fresh interpreter, sums the self-time of every module that a bare
+# interpreter doesn't already load, and fails if the median over several runs
+# exceeds the budget or if a module that must stay off the startup path
+# (requests, ssl, subprocess, ...) gets imported.
+#
+# Usage: python benchmarks/import_time.py [--budget-ms 40] [--runs 7]
+
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+
+HELFETCH_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'Helfetch')
+
+STARTUP_CODE = f"""
+import sys
+sys.path.insert(0, {HELFETCH_DIR!r})
+import helfetch
+import core.system_info, core.hardware_info, core.desktop_info, core.network_info
+import display.formatter, display.machine
+"""
+
+# Modules that are only allowed to be imported lazily, when a probe needs them.
+FORBIDDEN_MODULES = ['requests', 'urllib3', 'ssl', 'http.client', 'email', 'subprocess', 'platform', 'random']
+
+DEFAULT_BUDGET_MS = 40.0
+
+
+def import_times(code):
+    """
+    Runs 'code' under -X importtime and returns {module: self time in microseconds}.
+    """
+    result = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', code],
+        capture_output=True, text=True, check=True
+    )
+    times = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith('import time:') or 'self [us]' in line:
+            continue
+        self_us, _, name = line[len('import time:'):].split('|')
+        times[name.strip()] = max(int(self_us), 0)
+    return times
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Check helfetch's startup import cost.")
+    parser.add_argument("--budget-ms", type=float, default=DEFAULT_BUDGET_MS,
+                        help=f"Maximum median import cost in milliseconds (default: {DEFAULT_BUDGET_MS}).")
+    parser.add_argument("--runs", type=int, default=7, help="Number of measured runs (default: 7).")
+    args = parser.parse_args()
+
+    baseline = set(import_times("pass"))
+    totals = []
+    for _ in range(args.runs):
+        times = import_times(STARTUP_CODE)
+        added = {name: us for name, us in times.items() if name not in baseline}
+        totals.append(sum(added.values()))
+
+    median_ms = statistics.median(totals) / 1000
+    print(f"{'module':40} {'self [ms]':>10}")
+    for name, us in sorted(added.items(), key=lambda item: item[1], reverse=True)[:15]:
+        print(f"{name:40} {us / 1000:10.2f}")
+    print(f"\nmedian import cost over {args.runs} runs: {median_ms:.2f} ms (budget {args.budget_ms:.2f} ms)")
+
+    failed = False
+    loaded = [name for name in FORBIDDEN_MODULES if name in added]
+    if loaded:
+        print(f"FAIL: modules that must be imported lazily were loaded at startup: {', '.join(loaded)}")
+        failed = True
+    if median_ms > args.budget_ms:
+        print("FAIL: startup import cost is over budget")
+        failed = True
+    if not failed:
+        print("OK")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,106 @@
+#!/usr/bin/env python3
+# benchmarks/render.py
+
+# Microbenchmark for the text renderer (format_info_output and display/layout.py).
+# It measures the per-frame cost of:
+#   cold       - a first render: logo measured, layout compiled, every value formatted
+#   unchanged  - a redraw where nothing changed (watch mode between refreshes)
+#   volatile   - a redraw where only Uptime/RAM/Disk/Local IP changed (a watch refresh)
+#   reflow     - a redraw where a field appears/disappears (a different layout)
+#
+# Usage: python benchmarks/render.py [--iterations 20000] [--json]
+
+import argparse
+import json
+import os
+import sys
+import time
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+HELFETCH_DIR = os.path.join(BENCH_DIR, '..', 'Helfetch')
+
+
+def percentile(samples, fraction):
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(round(fraction * (len(ordered) - 1))))]
+
+
+def measure(func, iterations):
+    func() # Warm-up
+    timings = []
+    for i in range(iterations):
+        start = time.perf_counter()
+        func(i)
+        timings.append(time.perf_counter() - start)
+    return {
+        'p50_us': percentile(timings, 0.50) * 1e6,
+        'p99_us': percentile(timings, 0.99) * 1e6,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark helfetch's text renderer.")
+    parser.add_argument("--iterations", type=int, default=20000, help="Measured frames per case (default: 20000).")
+    parser.add_argument("--json", action="store_true", help="Print the results as JSON.")
+    args = parser.parse_args()
+
+    sys.path.insert(0, HELFETCH_DIR)
+    from core.metrics import MemoryUsage, DiskUsage, Duration, PackageCounts
+    from display import layout
+    from display.ascii_art import get_ascii_logo
+    from display.formatter import format_info_output
+
+    logo = get_ascii_logo("Helwan Linux")
+    info = {
+        'User': 'helwan', 'Host': 'workstation', 'OS': 'Helwan Linux', 'Kernel': '6.9.7-arch1-1',
+        'Uptime': Duration(187000), 'Shell': 'bash', 'Terminal': 'xterm-256color',
+        'Packages': PackageCounts([('pacman', 1843), ('flatpak', 12)]),
+        'CPU': 'AMD Ryzen 7 5800X 8-Core Processor', 'RAM': MemoryUsage(6 << 30, 31 << 30),
+        'Disk': DiskUsage(180 << 30, 468 << 30, 264 << 30), 'GPU': 'NVIDIA Corporation GA106 [GeForce RTX 3060]',
+        'Desktop Environment': 'X-Cinnamon', 'Window Manager': 'Mutter (Muffin)', 'GTK Theme': 'Mint-Y-Dark-Aqua',
+        'Icons': 'Papirus-Dark', 'Font': 'Noto Sans 10', 'Local IP': '192.168.1.23',
+        'Public IP': '197.32.10.20', 'ISP': 'Telecom Egypt', 'City': 'Helwan', 'Country': 'Egypt',
+    }
+    quote = "Code is like humor. When you have to explain it, it's bad."
+
+    def render(data):
+        return format_info_output(data, logo_lines=logo, inspirational_quote=quote)
+
+    def cold(i=0):
+        layout.get_logo_block.cache_clear()
+        layout.get_layout.cache_clear()
+        render(dict(info))
+
+    def unchanged(i=0):
+        render(info)
+
+    def volatile(i=0):
+        info['Uptime'] = Duration(187000 + i)
+        info['RAM'] = MemoryUsage((6 << 30) + i * 4096, 31 << 30)
+        info['Disk'] = DiskUsage((180 << 30) + i * 4096, 468 << 30, 264 << 30)
+        info['Local IP'] = f'192.168.1.{i % 250}'
+        render(info)
+
+    def reflow(i=0):
+        render(info if i % 2 else dict(info, ISP='N/A'))
+
+    results = {
+        'cold': measure(cold, max(1, args.iterations // 10)),
+        'unchanged': measure(unchanged, args.iterations),
+        'volatile': measure(volatile, args.iterations),
+        'reflow': measure(reflow, args.iterations),
+    }
+
+    if args.json:
+        print(json.dumps(results, indent=2))
+        return 0
+
+    print(f"{'frame':12} {'p50 [us]':>10} {'p99 [us]':>10}")
+    for name, result in results.items():
+        print(f"{name:12} {result['p50_us']:10.1f} {result['p99_us']:10.1f}")
+    print(f"\n{args.iterations} frames per case, {len(info)} fields")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
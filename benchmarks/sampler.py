@@ -0,0 +1,54 @@
+#!/usr/bin/env python3
+# benchmarks/sampler.py
+
+# Measures the CPU cost of one watch-mode sample of the live readings
+# (CPU usage, load, temperature, frequency and the ring buffer update) and
+# the resulting share of one core at a given sampling interval.
+# Runs against the live system, or the recorded fixture tree with --fixture.
+#
+# Usage: python benchmarks/sampler.py [--samples 2000] [--interval 1.0]
+#                                     [--budget 0.5] [--fixture]
+
+import argparse
+import os
+import sys
+import time
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+HELFETCH_DIR = os.path.join(BENCH_DIR, '..', 'Helfetch')
+FIXTURE_DIR = os.path.join(BENCH_DIR, 'fixtures', 'arch-desktop')
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Measure the overhead of helfetch's live sampler.")
+    parser.add_argument("--samples", type=int, default=2000, help="Measured samples (default: 2000).")
+    parser.add_argument("--interval", type=float, default=1.0, help="Sampling interval in seconds (default: 1.0).")
+    parser.add_argument("--budget", type=float, default=0.5, help="Allowed share of one core, in percent (default: 0.5).")
+    parser.add_argument("--fixture", action="store_true", help="Read the recorded fixture tree instead of the live system.")
+    args = parser.parse_args()
+
+    if args.fixture:
+        os.environ['HELFETCH_ROOT'] = FIXTURE_DIR
+    sys.path.insert(0, HELFETCH_DIR)
+    from core import sensors_info
+    from core.sampler import History
+
+    history = History()
+    history.record(sensors_info.get_sensors_info()) # First sample, sensor discovery
+    start = time.thread_time()
+    for _ in range(args.samples):
+        history.record(sensors_info.get_sensors_info())
+    per_sample = (time.thread_time() - start) / args.samples
+
+    share = per_sample / args.interval * 100
+    print(f"CPU time per sample: {per_sample * 1e6:.1f} us")
+    print(f"Share of one core at a {args.interval:g}s interval: {share:.4f}% (budget {args.budget:g}%)")
+    if share > args.budget:
+        print("FAIL: over budget")
+        return 1
+    print("OK")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())